@@ -14,7 +14,11 @@ import bpy
 _SUBMODULE_NAMES = (
     "constants",
     "i18n",
+    "profiling",
+    "caches",
+    "codec",
     "model",
+    "edge_chains",
     "evaluated_geometry",
     "loops",
     "overlay",
@@ -23,15 +27,23 @@ _SUBMODULE_NAMES = (
     "preferences",
     "ui",
 )
+# Loaded on first use, so sessions that never draw evaluated geometry or
+# derive loops (such as background workers) skip them.
+_DEFERRED_SUBMODULES = ("evaluated_geometry", "loops")
 
 
 def _load_submodules():
-    """Import once, then reload only after the prior runtime is unregistered."""
+    """Import once, then reload only after the prior runtime is unregistered.
+
+    Deferred modules are only reloaded if the previous runtime loaded them.
+    """
     loaded = {}
     for name in _SUBMODULE_NAMES:
         qualified_name = f"{__package__}.{name}"
         module = sys.modules.get(qualified_name)
         if module is None:
+            if name in _DEFERRED_SUBMODULES:
+                continue
             module = importlib.import_module(f".{name}", __package__)
         elif _needs_reload:
             module = importlib.reload(module)
@@ -39,6 +51,12 @@ def _load_submodules():
     return loaded
 
 
+def __getattr__(name):
+    if name in _DEFERRED_SUBMODULES:
+        return importlib.import_module(f".{name}", __package__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 _submodules = _load_submodules()
 globals().update(_submodules)
 
@@ -0,0 +1,235 @@
+"""Byte-budgeted LRU caches with running totals and hit statistics.
+
+The derived-data caches of the add-on are :class:`BudgetedCache` instances, so
+their limits, memory estimates, and hit rates are configured and reported in
+one place. Two kinds of tables stay outside it: the stack payload interning of
+the standalone codec, which reports through ``stack_memo_statistics()``, and
+per-mesh bookkeeping that only records signatures, timestamps, or generations
+(edit-mesh snapshots, dirty marks, modifier signatures), capped by its owner.
+The module only uses the standard library.
+"""
+
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+# Eviction considers this many of the least recently used entries and drops
+# the one that is cheapest to rebuild per byte it frees.
+_EVICTION_WINDOW = 8
+_CACHES = OrderedDict()
+
+
+class BudgetedCache(OrderedDict):
+    """An LRU mapping that keeps a running byte estimate of its values.
+
+    Entries stored with :meth:`store` carry an estimated size, the seconds it
+    took to build them, and the name of the owning object. Values that several
+    keys share, such as the batches of linked duplicates, name a common
+    ``identity`` and are counted once. A zero limit disables that limit, and
+    keys in ``pinned`` are never evicted.
+    """
+
+    def __init__(self, name, *, budget_bytes=0, entry_limit=0, distinct_limit=0):
+        super().__init__()
+        self.name = name
+        self.budget_bytes = budget_bytes
+        self.entry_limit = entry_limit
+        self.distinct_limit = distinct_limit
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.pinned = frozenset()
+        # key -> (identity, owner); identity -> [references, bytes, cost]
+        self._keys = {}
+        self._values = {}
+        _CACHES[name] = self
+
+    def __setitem__(self, key, value):
+        self.store(key, value, evict=False)
+
+    def __delitem__(self, key):
+        OrderedDict.__delitem__(self, key)
+        self._release(key)
+
+    def pop(self, key, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = OrderedDict.pop(self, key)
+        self._release(key)
+        return value
+
+    def popitem(self, last=True):
+        key, value = OrderedDict.popitem(self, last)
+        self._release(key)
+        return key, value
+
+    def clear(self):
+        OrderedDict.clear(self)
+        self._keys.clear()
+        self._values.clear()
+        self.total_bytes = 0
+
+    def store(
+        self, key, value, *, nbytes=None, cost=None, owner=None, identity=None,
+        evict=True,
+    ):
+        """Insert ``value`` as the most recent entry and enforce the limits.
+
+        ``None`` keeps the size, cost, and owner already known for the value.
+        """
+
+        identity = id(value) if identity is None else identity
+        previous = self._keys.get(key)
+        if previous is None or previous[0] != identity:
+            self._release(key)
+            record = self._values.setdefault(identity, [0, 0, 0.0])
+            record[0] += 1
+        if owner is None:
+            owner = previous[1] if previous is not None else ""
+        self._keys[key] = (identity, owner)
+        OrderedDict.__setitem__(self, key, value)
+        self.move_to_end(key)
+        self.resize(key, nbytes, cost)
+        if evict:
+            self.evict(protect=key)
+        return value
+
+    def resize(self, key, nbytes=None, cost=None):
+        """Update the size or rebuild cost of the value stored under ``key``."""
+
+        record = self._values[self._keys[key][0]]
+        if nbytes is not None:
+            self.total_bytes += int(nbytes) - record[1]
+            record[1] = int(nbytes)
+        if cost is not None:
+            record[2] = float(cost)
+
+    def lookup(self, key):
+        """Return the value for ``key`` as a recorded hit or miss."""
+
+        value = OrderedDict.get(self, key)
+        self.note(value is not None)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+
+    def note(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def over_budget(self):
+        distinct = len(self._values)
+        return bool(
+            self.entry_limit and len(self) > self.entry_limit
+            or self.distinct_limit and distinct > self.distinct_limit
+            or self.budget_bytes
+            and distinct > 1
+            and self.total_bytes > self.budget_bytes
+        )
+
+    @contextmanager
+    def pinning(self, keys):
+        """Keep ``keys`` resident inside the block, even above the limits."""
+
+        previous = self.pinned
+        self.pinned = previous | frozenset(keys)
+        try:
+            yield self
+        finally:
+            self.pinned = previous
+
+    def evict(self, protect=None):
+        """Drop entries until every limit holds, never the ``protect`` key."""
+
+        while self.over_budget():
+            victim = self._victim(protect)
+            if victim is None:
+                return
+            del self[victim]
+            self.evictions += 1
+
+    def _victim(self, protect):
+        best_key = None
+        best_score = None
+        considered = 0
+        for key in self:
+            if key == protect or key in self.pinned:
+                continue
+            identity = self._keys[key][0]
+            references, nbytes, cost = self._values[identity]
+            # Dropping one alias of a shared value frees nothing.
+            freed = nbytes if references == 1 else 0
+            score = cost / (freed + 1)
+            if best_score is None or score < best_score:
+                best_key, best_score = key, score
+            considered += 1
+            if considered >= _EVICTION_WINDOW:
+                break
+        return best_key
+
+    def _release(self, key):
+        previous = self._keys.pop(key, None)
+        if previous is None:
+            return
+        record = self._values[previous[0]]
+        record[0] -= 1
+        if record[0] <= 0:
+            del self._values[previous[0]]
+            self.total_bytes -= record[1]
+
+    def owner_bytes(self):
+        """Return estimated bytes per owner, counting shared values once each."""
+
+        totals = Counter()
+        seen = set()
+        for identity, owner in self._keys.values():
+            if (identity, owner) not in seen:
+                seen.add((identity, owner))
+                totals[owner] += self._values[identity][1]
+        return totals
+
+    def statistics(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "distinct": len(self._values),
+            "bytes": self.total_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+def set_cache_budget(name, budget_bytes):
+    """Apply a new byte budget to the named cache and evict down to it."""
+
+    cache = _CACHES[name]
+    cache.budget_bytes = max(0, int(budget_bytes))
+    cache.evict()
+
+
+def cache_statistics():
+    """Return ``{name: statistics}`` for every cache in creation order."""
+
+    return {name: cache.statistics() for name, cache in _CACHES.items()}
+
+
+def memory_by_owner(limit=None):
+    """Return ``[(owner, bytes)]`` summed over all caches, largest first."""
+
+    totals = Counter()
+    for cache in _CACHES.values():
+        totals.update(cache.owner_bytes())
+    totals.pop("", None)
+    return totals.most_common(limit)
+
+
+def reset_cache_statistics():
+    for cache in _CACHES.values():
+        cache.hits = cache.misses = cache.evictions = 0
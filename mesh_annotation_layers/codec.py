@@ -0,0 +1,310 @@
+"""Durable annotation encodings: per-element stack payloads and layer JSON.
+
+The module only uses the standard library so the codec can be exercised and
+benchmarked without Blender.
+"""
+
+import json
+import zlib
+from collections import Counter, OrderedDict
+
+# Meshes repeat a few hundred distinct stacks across every element, so stack
+# scans and writes intern payloads in both directions.
+_STACK_DECODE_MEMO = OrderedDict()
+_STACK_ENCODE_MEMO = OrderedDict()
+_STACK_MEMO_LIMIT = 4096
+_CODEC_COUNTS = Counter()
+
+_STACK_MAGIC = b"\x00MAL"
+_STACK_VERSION = 1
+STACK_MAX_BYTES = 255
+LAYER_ID_MAX = 0x7FFFFFFF
+
+
+class StackEncodingError(ValueError):
+    """Raised when annotation ownership cannot be stored losslessly."""
+
+
+class StackCapacityError(StackEncodingError):
+    """Raised before a BMesh string layer could truncate annotation data."""
+
+
+def normalize_layer_ids(layers, order_lookup=None):
+    unique = []
+    seen = set()
+    for lid in layers:
+        lid = int(lid)
+        if lid in seen:
+            continue
+        seen.add(lid)
+        unique.append(lid)
+    if order_lookup:
+        unique.sort(key=lambda value: order_lookup.get(value, float("inf")))
+    return unique
+
+
+def _stored_layer_id(raw_value) -> int:
+    if isinstance(raw_value, bool) or not isinstance(raw_value, (int, str)):
+        raise ValueError("Layer IDs must be integers")
+    layer_id = int(raw_value)
+    if not (0 < layer_id <= LAYER_ID_MAX):
+        raise ValueError("Layer ID is out of range")
+    return layer_id
+
+
+def validate_element_layers(raw):
+    """Return ``(mapping, valid)`` for a decoded JSON object.
+
+    Malformed entries are dropped individually; ``valid`` reports whether
+    anything was dropped.
+    """
+
+    mapping = {}
+    valid = True
+    for raw_index, raw_layers in raw.items():
+        try:
+            index = int(raw_index)
+        except (TypeError, ValueError):
+            valid = False
+            continue
+        if (
+            index < 0
+            or str(raw_index) != str(index)
+            or not isinstance(raw_layers, list)
+            or not raw_layers
+        ):
+            valid = False
+            continue
+        if len(raw_layers) == 1:
+            try:
+                layer_id = _stored_layer_id(raw_layers[0])
+            except (TypeError, ValueError):
+                valid = False
+                continue
+            mapping[str(index)] = [layer_id]
+            continue
+        layer_ids = []
+        seen_layer_ids = set()
+        for raw_layer_id in raw_layers:
+            try:
+                layer_id = _stored_layer_id(raw_layer_id)
+            except (TypeError, ValueError):
+                valid = False
+                continue
+            if layer_id in seen_layer_ids:
+                valid = False
+                continue
+            seen_layer_ids.add(layer_id)
+            layer_ids.append(layer_id)
+        if layer_ids:
+            mapping[str(index)] = layer_ids
+        else:
+            valid = False
+    return mapping, valid
+
+
+def prepare_element_layers(mapping):
+    """Validate and serialize a complete mapping without changing Blender data."""
+
+    cleaned = {}
+    for raw_index, values in mapping.items():
+        try:
+            index = int(raw_index)
+        except (TypeError, ValueError) as exc:
+            raise StackEncodingError("Invalid annotation element index") from exc
+        if index < 0:
+            raise StackEncodingError("Annotation element indices must be non-negative")
+        normalized = normalize_layer_ids(values)
+        if normalized:
+            encode_layers(normalized)
+            cleaned[str(index)] = normalized
+    data_str = json.dumps(cleaned, separators=(",", ":"))
+    _CODEC_COUNTS["json_bytes"] += len(data_str)
+    return cleaned, data_str
+
+
+def _encode_uvarint(value: int) -> bytes:
+    if not (0 <= value <= LAYER_ID_MAX):
+        raise StackEncodingError(f"Invalid annotation layer id: {value!r}")
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        encoded.append(byte | (0x80 if value else 0))
+        if not value:
+            return bytes(encoded)
+
+
+def _decode_uvarint(data: bytes, offset: int, limit: int):
+    value = 0
+    shift = 0
+    while offset < limit and shift <= 28:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            if value > LAYER_ID_MAX:
+                raise StackEncodingError("Annotation layer id is out of range")
+            return value, offset
+        shift += 7
+    raise StackEncodingError("Truncated annotation stack integer")
+
+
+def _memo_lookup(memo, kind: str, key):
+    value = memo.get(key)
+    if value is None:
+        _CODEC_COUNTS[f"{kind}_misses"] += 1
+        return None
+    memo.move_to_end(key)
+    _CODEC_COUNTS[f"{kind}_hits"] += 1
+    return value
+
+
+def _memo_store(memo, key, value):
+    memo[key] = value
+    if len(memo) > _STACK_MEMO_LIMIT:
+        memo.popitem(last=False)
+    return value
+
+
+def stack_memo_statistics() -> dict:
+    """Return payload interning sizes, hits, misses, and hit rates."""
+
+    statistics = {
+        "decode_entries": len(_STACK_DECODE_MEMO),
+        "encode_entries": len(_STACK_ENCODE_MEMO),
+    }
+    for kind in ("decode", "encode"):
+        hits = _CODEC_COUNTS[f"{kind}_hits"]
+        misses = _CODEC_COUNTS[f"{kind}_misses"]
+        statistics[f"{kind}_hits"] = hits
+        statistics[f"{kind}_misses"] = misses
+        lookups = hits + misses
+        statistics[f"{kind}_hit_rate"] = hits / lookups if lookups else 0.0
+    return statistics
+
+
+def codec_operation_counts() -> dict:
+    """Return running payload lookups and serialized JSON sizes."""
+
+    return {
+        "payload_encodes": _CODEC_COUNTS["encode_hits"]
+        + _CODEC_COUNTS["encode_misses"],
+        "payload_decodes": _CODEC_COUNTS["decode_hits"]
+        + _CODEC_COUNTS["decode_misses"],
+        "json_bytes": _CODEC_COUNTS["json_bytes"],
+    }
+
+
+def clear_stack_memo():
+    """Drop interned payloads and reset their counters."""
+
+    _STACK_DECODE_MEMO.clear()
+    _STACK_ENCODE_MEMO.clear()
+    _CODEC_COUNTS.clear()
+
+
+def encode_layers(layers):
+    """Encode every layer id or fail before Blender's 255-byte truncation."""
+
+    try:
+        key = tuple(layers)
+        payload = _memo_lookup(_STACK_ENCODE_MEMO, "encode", key)
+    except TypeError:
+        return _encode_stack_payload(layers)
+    if payload is None:
+        payload = _memo_store(_STACK_ENCODE_MEMO, key, _encode_stack_payload(key))
+    return payload
+
+
+def _encode_stack_payload(layers):
+    normalized = []
+    seen = set()
+    for raw_layer_id in layers:
+        layer_id = int(raw_layer_id)
+        if layer_id <= 0:
+            raise StackEncodingError("Annotation layer ids must be positive")
+        if layer_id not in seen:
+            seen.add(layer_id)
+            normalized.append(layer_id)
+    if not normalized:
+        return b""
+    payload = bytearray(_STACK_MAGIC)
+    payload.append(_STACK_VERSION)
+    payload.extend(_encode_uvarint(len(normalized)))
+    for layer_id in normalized:
+        payload.extend(_encode_uvarint(layer_id))
+    payload.extend(zlib.crc32(payload).to_bytes(4, "little"))
+    if len(payload) > STACK_MAX_BYTES:
+        raise StackCapacityError(
+            "Too many overlapping annotation layers for one mesh element"
+        )
+    return bytes(payload)
+
+
+def decode_stack_payload(data):
+    """Return ``(layer_ids, encoding)`` where encoding is EMPTY/LEGACY/BINARY."""
+
+    if not data:
+        return [], "EMPTY"
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    decoded = _memo_lookup(_STACK_DECODE_MEMO, "decode", data)
+    if decoded is None:
+        values, encoding = _parse_stack_payload(data)
+        decoded = _memo_store(_STACK_DECODE_MEMO, data, (tuple(values), encoding))
+    return list(decoded[0]), decoded[1]
+
+
+def _parse_stack_payload(data):
+    if not data.startswith(_STACK_MAGIC):
+        try:
+            text = data.decode("ascii")
+            values = [int(token.strip()) for token in text.split(",") if token.strip()]
+        except (UnicodeDecodeError, ValueError) as exc:
+            raise StackEncodingError("Invalid legacy annotation stack") from exc
+        if any(value <= 0 for value in values) or len(values) != len(set(values)):
+            raise StackEncodingError("Invalid legacy annotation layer ids")
+        return values, "LEGACY"
+    minimum_size = len(_STACK_MAGIC) + 1 + 1 + 4
+    if len(data) < minimum_size:
+        raise StackEncodingError("Truncated annotation stack header")
+    version_offset = len(_STACK_MAGIC)
+    if data[version_offset] != _STACK_VERSION:
+        raise StackEncodingError("Unsupported annotation stack version")
+    checksum_offset = len(data) - 4
+    expected_checksum = int.from_bytes(data[checksum_offset:], "little")
+    if zlib.crc32(data[:checksum_offset]) != expected_checksum:
+        raise StackEncodingError("Annotation stack checksum mismatch")
+    offset = version_offset + 1
+    count, offset = _decode_uvarint(data, offset, checksum_offset)
+    values = []
+    for _index in range(count):
+        value, offset = _decode_uvarint(data, offset, checksum_offset)
+        if value <= 0 or value in values:
+            raise StackEncodingError("Invalid annotation layer id sequence")
+        values.append(value)
+    if offset != checksum_offset:
+        raise StackEncodingError("Unexpected bytes in annotation stack")
+    return values, "BINARY"
+
+
+def decode_layer_bytes(data):
+    """Decode a complete stack; malformed or truncated data is never partial."""
+
+    return decode_stack_payload(data)[0]
+
+
+def legacy_prefix(layers):
+    """Return the layer ids a pre-binary comma list kept within 255 bytes."""
+
+    accepted = []
+    size = 0
+    for layer_id in layers:
+        token = ("," if accepted else "") + str(int(layer_id))
+        token_size = len(token.encode("ascii"))
+        if size + token_size > STACK_MAX_BYTES:
+            break
+        accepted.append(int(layer_id))
+        size += token_size
+    return accepted
@@ -20,6 +20,7 @@ class ElementSpec:
     active_index: str
     next_id: str
     data_property: str
+    hash_property: str
     state_property: str
     stack_layer: str
     default_name: str
@@ -36,6 +37,7 @@ ELEMENT_SPECS = {
         active_index="active_face_layer_index",
         next_id="next_face_layer_id",
         data_property="face_layers_data",
+        hash_property="face_layers_hash",
         state_property="face_annotation_state",
         stack_layer="_mesh_annotation_face_stack",
         default_name="Face Layer",
@@ -50,6 +52,7 @@ ELEMENT_SPECS = {
         active_index="active_edge_layer_index",
         next_id="next_edge_layer_id",
         data_property="edge_layers_data",
+        hash_property="edge_layers_hash",
         state_property="edge_annotation_state",
         stack_layer="_mesh_annotation_edge_stack",
         default_name="Edge Layer",
@@ -64,6 +67,7 @@ ELEMENT_SPECS = {
         active_index="active_vertex_layer_index",
         next_id="next_vertex_layer_id",
         data_property="vertex_layers_data",
+        hash_property="vertex_layers_hash",
         state_property="vertex_annotation_state",
         stack_layer="_mesh_annotation_vertex_stack",
         default_name="Vertex Layer",
@@ -0,0 +1,91 @@
+"""Ordering and trimming of evaluated edge segments into connected chains.
+
+Points only need subtraction, scaling, and ``length``; nothing here imports
+Blender, so the helpers also run on plain vector types outside it.
+"""
+
+from collections import defaultdict
+
+
+def coordinate_key(coordinate):
+    return tuple(round(value, 7) for value in coordinate)
+
+
+def ordered_edge_chains(records):
+    """Split evaluated descendants into connected, consistently oriented chains."""
+    if not records:
+        return []
+    if len(records) == 1:
+        return [records]
+    endpoint_keys = []
+    adjacency = defaultdict(list)
+    for index, (p0, p1, _normal0, _normal1) in enumerate(records):
+        keys = (coordinate_key(p0), coordinate_key(p1))
+        endpoint_keys.append(keys)
+        adjacency[keys[0]].append(index)
+        adjacency[keys[1]].append(index)
+
+    unused = set(range(len(records)))
+    chains = []
+    while unused:
+        start_key = None
+        for index in unused:
+            for key in endpoint_keys[index]:
+                if sum(1 for candidate in adjacency[key] if candidate in unused) == 1:
+                    start_key = key
+                    break
+            if start_key is not None:
+                break
+        if start_key is None:
+            first = next(iter(unused))
+            start_key = endpoint_keys[first][0]
+
+        chain = []
+        current_key = start_key
+        while True:
+            candidates = [index for index in adjacency[current_key] if index in unused]
+            if not candidates:
+                break
+            index = candidates[0]
+            unused.remove(index)
+            p0, p1, normal0, normal1 = records[index]
+            key0, key1 = endpoint_keys[index]
+            if key0 == current_key:
+                chain.append((p0, p1, normal0, normal1))
+                current_key = key1
+            else:
+                chain.append((p1, p0, normal1, normal0))
+                current_key = key0
+        if chain:
+            chains.append(chain)
+    return chains
+
+
+def _consume_chain_start(segments, distance):
+    remaining = max(0.0, distance)
+    trimmed = []
+    for p0, p1 in segments:
+        direction = p1 - p0
+        length = direction.length
+        if length <= 1e-9:
+            continue
+        if remaining >= length:
+            remaining -= length
+            continue
+        if remaining > 0.0:
+            p0 = p0 + direction * (remaining / length)
+            remaining = 0.0
+        trimmed.append((p0, p1))
+    return trimmed
+
+
+def trim_edge_chain(segments, trim_fraction):
+    """Trim the two ends of a complete evaluated edge chain without internal gaps."""
+    total_length = sum((p1 - p0).length for p0, p1 in segments)
+    if total_length <= 1e-9 or trim_fraction <= 0.0:
+        return segments
+    trim_distance = min(total_length * trim_fraction, total_length * 0.499)
+    trimmed = _consume_chain_start(segments, trim_distance)
+    reversed_segments = [(p1, p0) for p0, p1 in reversed(trimmed)]
+    reversed_segments = _consume_chain_start(reversed_segments, trim_distance)
+    return [(p1, p0) for p0, p1 in reversed(reversed_segments)]
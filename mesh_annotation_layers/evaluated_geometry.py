@@ -1,5 +1,6 @@
 """Map source annotations onto Blender's evaluated mesh."""
 
+import time
 from collections import Counter, defaultdict
 
 import bmesh
@@ -9,7 +10,9 @@ from mathutils.bvhtree import BVHTree
 from mathutils.kdtree import KDTree
 
 from .constants import EDGE, FACE, VERTEX
+from .edge_chains import coordinate_key
 from .model import debug_log
+from .profiling import count_operation, record_stage
 
 
 def _modifier_visible_for_overlay(obj: bpy.types.Object, modifier) -> bool:
@@ -569,17 +572,50 @@ def _cage_overlay_geometry(bm: bmesh.types.BMesh, source_filters=None):
     return {FACE: faces, EDGE: edges, VERTEX: vertices}, "CAGE"
 
 
+def _evaluated_mesh(obj: bpy.types.Object) -> bpy.types.Mesh:
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    mesh = obj.evaluated_get(depsgraph).data
+    if not isinstance(mesh, bpy.types.Mesh) or not mesh.vertices:
+        raise RuntimeError("evaluated mesh is empty")
+    return mesh
+
+
+def _evaluated_element_count(mesh: bpy.types.Mesh, element_type: str) -> int:
+    if element_type == FACE:
+        return len(mesh.polygons)
+    if element_type == EDGE:
+        return len(mesh.edges)
+    return len(mesh.vertices)
+
+
+def _planned_records(mesh, element_type, sources, source_filter, start, stop):
+    """Return records for evaluated elements ``start:stop`` that map into the filter."""
+    records = []
+    for index in range(start, stop):
+        source_index = sources[index]
+        if source_index is None or (
+            source_filter is not None and source_index not in source_filter
+        ):
+            continue
+        if element_type == FACE:
+            polygon = mesh.polygons[index]
+            triangles = _polygon_triangles(mesh, polygon)
+            if triangles:
+                records.append((source_index, triangles, polygon.normal.copy()))
+        elif element_type == EDGE:
+            records.append(_evaluated_edge_geometry(mesh, index, source_index))
+        else:
+            vertex = mesh.vertices[index]
+            records.append((source_index, vertex.co.copy(), vertex.normal.copy()))
+    return records
+
+
 def evaluated_overlay_geometry(
     obj: bpy.types.Object, bm: bmesh.types.BMesh, settings, source_filters=None
 ):
     """Copy drawable geometry from the modifier-evaluated surface into stable records."""
     try:
-        depsgraph = bpy.context.evaluated_depsgraph_get()
-        evaluated_object = obj.evaluated_get(depsgraph)
-        mesh = evaluated_object.data
-        if not isinstance(mesh, bpy.types.Mesh) or not mesh.vertices:
-            raise RuntimeError("evaluated mesh is empty")
-
+        mesh = _evaluated_mesh(obj)
         if source_filters is None:
             required_types = {FACE, EDGE, VERTEX}
         else:
@@ -592,9 +628,20 @@ def evaluated_overlay_geometry(
             return {FACE: [], EDGE: [], VERTEX: []}
 
         if source_filters is not None:
+            started = time.perf_counter()
             sparse_result = _sparse_exact_overlay_geometry(obj, bm, mesh, source_filters)
             if sparse_result is not None:
                 geometry, mapping_mode = sparse_result
+                # Sparse reads map and extract in one pass.
+                record_count = sum(len(records) for records in geometry.values())
+                record_stage(
+                    "source_mapping",
+                    time.perf_counter() - started,
+                    record_count,
+                    obj.name,
+                    mapping_mode,
+                )
+                count_operation("evaluated_elements", record_count)
                 debug_log(
                     settings,
                     f"Overlay uses evaluated mesh ({mapping_mode} mapping): "
@@ -603,6 +650,7 @@ def evaluated_overlay_geometry(
                 )
                 return geometry
 
+        started = time.perf_counter()
         face_sources, edge_sources, vertex_sources, mapping_mode = (
             _evaluated_source_maps(
                 obj,
@@ -612,45 +660,41 @@ def evaluated_overlay_geometry(
                 source_filters=source_filters,
             )
         )
-        if source_filters is None:
-            face_filter = edge_filter = vertex_filter = None
-        else:
-            face_filter = source_filters.get(FACE, set())
-            edge_filter = source_filters.get(EDGE, set())
-            vertex_filter = source_filters.get(VERTEX, set())
-
-        faces = []
-        if FACE in required_types:
-            for polygon in mesh.polygons:
-                source_index = face_sources[polygon.index]
-                if (
-                    source_index is not None
-                    and (face_filter is None or source_index in face_filter)
-                ):
-                    triangles = _polygon_triangles(mesh, polygon)
-                    if triangles:
-                        faces.append((source_index, triangles, polygon.normal.copy()))
-
-        edges = []
-        if EDGE in required_types:
-            for edge in mesh.edges:
-                source_index = edge_sources[edge.index]
-                if source_index is None or (
-                    edge_filter is not None and source_index not in edge_filter
-                ):
-                    continue
-                edges.append(
-                    _evaluated_edge_geometry(mesh, edge.index, source_index)
-                )
-
-        vertices = []
-        if VERTEX in required_types:
-            for vertex in mesh.vertices:
-                source_index = vertex_sources[vertex.index]
-                if source_index is not None and (
-                    vertex_filter is None or source_index in vertex_filter
-                ):
-                    vertices.append((source_index, vertex.co.copy(), vertex.normal.copy()))
+        evaluated_count = len(mesh.vertices) + len(mesh.edges) + len(mesh.polygons)
+        record_stage(
+            "source_mapping",
+            time.perf_counter() - started,
+            evaluated_count,
+            obj.name,
+            mapping_mode,
+        )
+        count_operation("evaluated_elements", evaluated_count)
+        started = time.perf_counter()
+        sources = {FACE: face_sources, EDGE: edge_sources, VERTEX: vertex_sources}
+        extracted = {FACE: [], EDGE: [], VERTEX: []}
+        for element_type in required_types:
+            extracted[element_type] = _planned_records(
+                mesh,
+                element_type,
+                sources[element_type],
+                None if source_filters is None else source_filters.get(element_type, set()),
+                0,
+                _evaluated_element_count(mesh, element_type),
+            )
+        faces, edges, vertices = extracted[FACE], extracted[EDGE], extracted[VERTEX]
+        record_stage(
+            "extract",
+            time.perf_counter() - started,
+            len(faces) + len(edges) + len(vertices),
+            obj.name,
+            mapping_mode,
+        )
+        count_operation(
+            "evaluated_elements",
+            (len(mesh.polygons) if FACE in required_types else 0)
+            + (len(mesh.edges) if EDGE in required_types else 0)
+            + (len(mesh.vertices) if VERTEX in required_types else 0),
+        )
 
         debug_log(
             settings,
@@ -663,85 +707,193 @@ def evaluated_overlay_geometry(
         return _cage_overlay_geometry(bm, source_filters=source_filters)[0]
 
 
-def _coordinate_key(coordinate):
-    return tuple(round(value, 7) for value in coordinate)
-
+def evaluated_source_plan(
+    obj: bpy.types.Object, bm: bmesh.types.BMesh, source_filters
+):
+    """Map the evaluated surface back to ``source_filters`` once for chunked reads.
 
-def ordered_edge_chains(records):
-    """Split evaluated descendants into connected, consistently oriented chains."""
-    if not records:
-        return []
-    if len(records) == 1:
-        return [records]
-    endpoint_keys = []
-    adjacency = defaultdict(list)
-    for index, (p0, p1, _normal0, _normal1) in enumerate(records):
-        keys = (_coordinate_key(p0), _coordinate_key(p1))
-        endpoint_keys.append(keys)
-        adjacency[keys[0]].append(index)
-        adjacency[keys[1]].append(index)
-
-    unused = set(range(len(records)))
-    chains = []
-    while unused:
-        start_key = None
-        for index in unused:
-            for key in endpoint_keys[index]:
-                if sum(1 for candidate in adjacency[key] if candidate in unused) == 1:
-                    start_key = key
-                    break
-            if start_key is not None:
-                break
-        if start_key is None:
-            first = next(iter(unused))
-            start_key = endpoint_keys[first][0]
+    The plan keeps only index lists; :func:`extract_planned_geometry` looks the
+    evaluated mesh up again for every chunk. Returns ``None`` when the evaluated
+    mesh is unavailable.
+    """
+    try:
+        mesh = _evaluated_mesh(obj)
+    except Exception:
+        return None
+    required_types = {
+        element_type
+        for element_type in (FACE, EDGE, VERTEX)
+        if source_filters.get(element_type)
+    }
+    started = time.perf_counter()
+    face_sources, edge_sources, vertex_sources, mapping_mode = _evaluated_source_maps(
+        obj,
+        bm,
+        mesh,
+        required_types=required_types,
+        source_filters=source_filters,
+    )
+    evaluated_count = len(mesh.vertices) + len(mesh.edges) + len(mesh.polygons)
+    record_stage(
+        "source_mapping",
+        time.perf_counter() - started,
+        evaluated_count,
+        obj.name,
+        mapping_mode,
+    )
+    count_operation("evaluated_elements", evaluated_count)
+    sources = {FACE: face_sources, EDGE: edge_sources, VERTEX: vertex_sources}
+    return {
+        "mode": mapping_mode,
+        "counts": {
+            element_type: _evaluated_element_count(mesh, element_type)
+            for element_type in required_types
+        },
+        "sources": {element_type: sources[element_type] for element_type in required_types},
+        "filters": {
+            element_type: source_filters[element_type] for element_type in required_types
+        },
+    }
+
+
+def extract_planned_geometry(
+    obj: bpy.types.Object, plan, element_type: str, start: int, stop: int
+):
+    """Return records of evaluated ``element_type`` elements ``start:stop``.
 
-        chain = []
-        current_key = start_key
+    Returns ``None`` when the evaluated mesh no longer has the planned element
+    counts, so the caller can map it again.
+    """
+    try:
+        mesh = _evaluated_mesh(obj)
+    except Exception:
+        return None
+    if any(
+        _evaluated_element_count(mesh, planned_type) != count
+        for planned_type, count in plan["counts"].items()
+    ):
+        return None
+    started = time.perf_counter()
+    records = _planned_records(
+        mesh,
+        element_type,
+        plan["sources"][element_type],
+        plan["filters"][element_type],
+        start,
+        stop,
+    )
+    record_stage(
+        "extract",
+        time.perf_counter() - started,
+        len(records),
+        obj.name,
+        plan["mode"],
+    )
+    count_operation("evaluated_elements", stop - start)
+    return records
+
+
+def coarse_patch_triangles(triangles, max_ring=6, normal=None):
+    """Approximate a connected triangle patch by fans over its sampled borders.
+
+    Each open boundary loop is resampled to at most ``max_ring`` corners and
+    fanned from the patch position nearest their centroid, so one subdivided
+    source face costs a handful of triangles instead of all of its
+    descendants. With a ``normal``, the fans are lifted until no patch
+    position rises above them, so a curved surface cannot occlude its own
+    coarse tier. Returns ``None`` when the patch has no usable boundary.
+    """
+    coordinates = {}
+    edge_counts = Counter()
+    for triangle in triangles:
+        keys = []
+        for coordinate in triangle:
+            key = coordinate_key(coordinate)
+            coordinates.setdefault(key, coordinate)
+            keys.append(key)
+        for key0, key1 in ((keys[0], keys[1]), (keys[1], keys[2]), (keys[2], keys[0])):
+            edge_counts[(key0, key1) if key0 < key1 else (key1, key0)] += 1
+    boundary = defaultdict(list)
+    for (key0, key1), count in edge_counts.items():
+        if count == 1:
+            boundary[key0].append(key1)
+            boundary[key1].append(key0)
+
+    coarse = []
+    visited = set()
+    for start in boundary:
+        if start in visited:
+            continue
+        loop = [start]
+        visited.add(start)
+        previous_key, current_key = None, start
         while True:
-            candidates = [index for index in adjacency[current_key] if index in unused]
-            if not candidates:
+            following = [
+                key
+                for key in boundary[current_key]
+                if key != previous_key and key not in visited
+            ]
+            if not following:
                 break
-            index = candidates[0]
-            unused.remove(index)
-            p0, p1, normal0, normal1 = records[index]
-            key0, key1 = endpoint_keys[index]
-            if key0 == current_key:
-                chain.append((p0, p1, normal0, normal1))
-                current_key = key1
-            else:
-                chain.append((p1, p0, normal1, normal0))
-                current_key = key0
-        if chain:
-            chains.append(chain)
-    return chains
-
-
-def _consume_chain_start(segments, distance):
-    remaining = max(0.0, distance)
-    trimmed = []
-    for p0, p1 in segments:
-        direction = p1 - p0
-        length = direction.length
-        if length <= 1e-9:
-            continue
-        if remaining >= length:
-            remaining -= length
+            previous_key, current_key = current_key, following[0]
+            visited.add(current_key)
+            loop.append(current_key)
+        if len(loop) < 3:
             continue
-        if remaining > 0.0:
-            p0 = p0 + direction * (remaining / length)
-            remaining = 0.0
-        trimmed.append((p0, p1))
-    return trimmed
-
-
-def trim_edge_chain(segments, trim_fraction):
-    """Trim the two ends of a complete evaluated edge chain without internal gaps."""
-    total_length = sum((p1 - p0).length for p0, p1 in segments)
-    if total_length <= 1e-9 or trim_fraction <= 0.0:
-        return segments
-    trim_distance = min(total_length * trim_fraction, total_length * 0.499)
-    trimmed = _consume_chain_start(segments, trim_distance)
-    reversed_segments = [(p1, p0) for p0, p1 in reversed(trimmed)]
-    reversed_segments = _consume_chain_start(reversed_segments, trim_distance)
-    return [(p1, p0) for p0, p1 in reversed(reversed_segments)]
+        stride = -(-len(loop) // max(3, max_ring))
+        ring = [coordinates[key] for key in loop[::stride]]
+        if len(ring) < 3:
+            ring = [coordinates[key] for key in loop[:3]]
+        centroid = sum(ring, Vector((0.0, 0.0, 0.0))) / len(ring)
+        center = min(
+            coordinates.values(),
+            key=lambda coordinate: (coordinate - centroid).length_squared,
+        )
+        for index, corner in enumerate(ring):
+            coarse.append((center, corner, ring[(index + 1) % len(ring)]))
+    if not coarse:
+        return None
+    if normal is not None and normal.length:
+        normal = normal.normalized()
+        lift = coarse_patch_lift(coordinates.values(), coarse, normal)
+        if lift > 0.0:
+            shift = normal * lift
+            coarse = [
+                tuple(coordinate + shift for coordinate in triangle)
+                for triangle in coarse
+            ]
+    return coarse
+
+
+def coarse_patch_lift(coordinates, coarse, normal):
+    """Return the greatest height of ``coordinates`` above the fans beneath them.
+
+    Heights are measured along the unit ``normal``; positions outside every
+    fan in that projection are ignored.
+    """
+    tangent = normal.orthogonal().normalized()
+    bitangent = normal.cross(tangent)
+    fans = [
+        tuple(
+            (corner.dot(tangent), corner.dot(bitangent), corner.dot(normal))
+            for corner in triangle
+        )
+        for triangle in coarse
+    ]
+    lift = 0.0
+    for coordinate in coordinates:
+        x = coordinate.dot(tangent)
+        y = coordinate.dot(bitangent)
+        for (x0, y0, h0), (x1, y1, h1), (x2, y2, h2) in fans:
+            determinant = (y1 - y2) * (x0 - x2) + (x2 - x1) * (y0 - y2)
+            if abs(determinant) < 1e-12:
+                continue
+            w0 = ((y1 - y2) * (x - x2) + (x2 - x1) * (y - y2)) / determinant
+            w1 = ((y2 - y0) * (x - x2) + (x0 - x2) * (y - y2)) / determinant
+            w2 = 1.0 - w0 - w1
+            if min(w0, w1, w2) < -1e-6:
+                continue
+            height = coordinate.dot(normal) - (w0 * h0 + w1 * h1 + w2 * h2)
+            lift = max(lift, height)
+            break
+    return lift
@@ -30,6 +30,49 @@ ZH_CN = {
     "Always display the add-on in English.": "始终使用英语显示插件。",
     "Always display the add-on in Chinese.": "始终使用中文显示插件。",
     "Automatic language: {language}": "自动语言：{language}",
+    "Draw All Annotated Objects": "绘制所有已标注物体",
+    "Build Budget (ms)": "构建预算（毫秒）",
+    "Full-Detail Vertex Budget": "完整细节顶点预算",
+    "Overlay Batches (MB)": "叠加批次（MB）",
+    "Overlay Geometry (MB)": "叠加几何（MB）",
+    "Annotations (MB)": "标注数据（MB）",
+    "Slow Stage Log": "慢阶段日志",
+    "Threshold (ms)": "阈值（毫秒）",
+    "Performance": "性能",
+    "Mapping Load": "映射加载",
+    "Stack Reconciliation": "栈同步",
+    "Source Mapping": "源元素映射",
+    "Extraction": "几何提取",
+    "Bucketing": "分桶",
+    "GPU Upload": "GPU 上传",
+    "Total Build": "总构建",
+    "Draw": "绘制",
+    "No timings recorded yet": "尚无计时记录",
+    "Stage": "阶段",
+    "Last / Max (ms)": "最近 / 最大（毫秒）",
+    "Elements": "元素数",
+    "Clear Timings": "清除计时",
+    "Annotations": "标注数据",
+    "Decoded Mappings": "已解码映射",
+    "Stack Sync States": "栈同步状态",
+    "State Chunks": "状态分块",
+    "Shared Mesh Proofs": "共享网格校验",
+    "Overlay Batches": "叠加批次",
+    "Overlay Geometry": "叠加几何",
+    "Cache": "缓存",
+    "Hit Rate": "命中率",
+    "Memory (MB)": "内存（MB）",
+    "Cached Memory by Object": "各物体缓存内存",
+    "Capture Profile": "捕获性能分析",
+    "Stop and Save Profile": "停止并保存性能分析",
+    "Capturing profile: {captured} / {requested} calls": (
+        "正在捕获性能分析：{captured} / {requested} 次调用"
+    ),
+    "Last profile: {name}": "上次性能分析：{name}",
+    "Profile failed: {error}": "性能分析失败：{error}",
+    "Profiling the next {count} annotation calls": "将分析接下来的 {count} 次标注调用",
+    "Profile saved to {path}": "性能分析已保存到 {path}",
+    "Could not write the profile: {error}": "无法写入性能分析：{error}",
     "No layers": "暂无图层",
     "Choose Target Layer": "选择目标标签",
     "No Active Layer": "无活动标签",
@@ -145,6 +188,7 @@ ZH_CN = {
     "Opacity": "整体透明度",
     "Show Through Mesh": "穿透显示",
     "Surface Offset": "表面偏移",
+    "Display Mode": "显示模式",
     "Thickness": "线条粗细",
     "Shortening": "线条截断",
     "Point Size": "点大小",
@@ -194,6 +238,13 @@ ZH_CN = {
     "Switch the annotation workspace and mesh selection mode.": (
         "切换标注工作区和网格选择模式。"
     ),
+    "Discard the recorded overlay stage timings.": "丢弃已记录的叠加层阶段计时。",
+    "Profile the next overlay draws, depsgraph updates, topology syncs, "
+    "and annotation operators, then save the profile next to the .blend file. "
+    "Run again to stop early.": (
+        "分析接下来的叠加层绘制、依赖图更新、拓扑同步与标注操作，并将结果保存在 .blend "
+        "文件旁。再次运行可提前停止。"
+    ),
     "Show or hide annotation overlays in the viewport.": (
         "在视图中显示或隐藏标注覆盖层。"
     ),
@@ -2,32 +2,105 @@
 
 import colorsys
 import hashlib
+import itertools
 import json
 import random
 import struct
+import sys
 import time
-import zlib
+from array import array
 from collections import Counter, OrderedDict
 from typing import NamedTuple
 
 import bmesh
 import bpy
 
+from .caches import BudgetedCache
+from .codec import (
+    LAYER_ID_MAX,
+    STACK_MAX_BYTES,
+    StackCapacityError,
+    StackEncodingError,
+    codec_operation_counts,
+    decode_stack_payload,
+    encode_layers,
+    legacy_prefix,
+    normalize_layer_ids,
+    prepare_element_layers,
+    validate_element_layers,
+)
 from .constants import EDGE, ELEMENT_TYPES, FACE, VERTEX, element_spec
+from .profiling import count_operation, register_operation_source
 
 
-_ELEMENT_LAYERS_CACHE = OrderedDict()
 _ELEMENT_LAYERS_CACHE_LIMIT = 96
-_ELEMENT_LAYERS_VALUE_LIMIT = 300_000
-_BMESH_SYNC_STATES = OrderedDict()
+# Rough resident size of one decoded index key or layer id, list slot included.
+_ANNOTATION_VALUE_BYTES = 64
+_ANNOTATION_CACHE_BUDGET = 20 * 1024 * 1024
+_BMESH_SYNC_STATE_BYTES = 256
 _BMESH_SYNC_CACHE_LIMIT = 96
-_BMESH_SYNC_DIRTY_AT = {}
+_ELEMENT_LAYERS_CACHE = BudgetedCache(
+    "annotations",
+    budget_bytes=_ANNOTATION_CACHE_BUDGET,
+    entry_limit=_ELEMENT_LAYERS_CACHE_LIMIT,
+)
+_DECODED_ELEMENT_LAYERS = BudgetedCache(
+    "decoded_annotations",
+    budget_bytes=_ANNOTATION_CACHE_BUDGET,
+    entry_limit=_ELEMENT_LAYERS_CACHE_LIMIT,
+)
+_BMESH_SYNC_STATES = BudgetedCache(
+    "bmesh_sync_states", entry_limit=_BMESH_SYNC_CACHE_LIMIT
+)
+_BMESH_SYNC_DIRTY_AT = OrderedDict()
 _BMESH_SYNC_QUIET_SECONDS = 0.15
-
-_STACK_MAGIC = b"\x00MAL"
-_STACK_VERSION = 1
-_STACK_MAX_BYTES = 255
-_LAYER_ID_MAX = 0x7FFFFFFF
+_BMESH_SYNC_IN_PROGRESS = set()
+_STATE_CHUNKS = BudgetedCache("state_chunks", entry_limit=_BMESH_SYNC_CACHE_LIMIT)
+_STATE_CHUNK_SIZE = 1024
+_STATE_CHUNK_BYTES = 96
+_TOPOLOGY_SIGNATURE_INDEX = {VERTEX: 0, EDGE: 1, FACE: 2}
+_EDIT_MESH_SNAPSHOTS = OrderedDict()
+# Shared-mesh proofs keyed by Mesh, then by (type, topology, geometry
+# generation, JSON digest, state token).  Native geometry edits discard a
+# Mesh's proofs as a whole and advance its generation, so a renumbering that
+# keeps element counts never matches an older key.
+_SHARED_PROOF_MESH_LIMIT = 96
+_SHARED_PROOFS = BudgetedCache("shared_proofs", entry_limit=_SHARED_PROOF_MESH_LIMIT)
+_SHARED_PROOF_BYTES = 160
+_MESH_GEOMETRY_GENERATIONS = OrderedDict()
+_mesh_geometry_counter = itertools.count(1)
+# Registered operators that can move or select elements but never create,
+# delete, or reorder them, so stack ownership stays index-stable.
+_SELECTION_OPERATOR_PREFIXES = (
+    "MESH_OT_edgering_select",
+    "MESH_OT_loop_select",
+    "MESH_OT_select",
+    "MESH_OT_shortest_path_",
+    "VIEW3D_OT_select",
+)
+_COORDINATE_OPERATOR_PREFIXES = (
+    "MESH_OT_flip_normals",
+    "MESH_OT_normals_make_consistent",
+    "MESH_OT_vertices_smooth",
+    "TRANSFORM_OT_",
+    "VIEW3D_OT_snap_selected",
+)
+# Object session_uid -> name of every mesh Object that has annotation layers.
+# The census is the Object count at the last full scan; a different count
+# means IDs were added or removed behind the registry's back.
+_ANNOTATED_OBJECTS = {}
+_annotated_object_census = None
+_ANNOTATION_GENERATIONS = {}
+_ANNOTATION_CHANGES = OrderedDict()
+_ANNOTATION_CHANGE_LIMIT = 96
+_ANNOTATION_CHANGE_DEPTH = 16
+# Mesh session_uid -> geometry signature right after an annotation flush; the
+# flush's own depsgraph update is recognized by the signature still matching.
+_ANNOTATION_SELF_UPDATES = {}
+_annotation_generation_counter = itertools.count(1)
+
+
+register_operation_source("codec", codec_operation_counts)
 
 
 class SharedMeshAnnotationError(RuntimeError):
@@ -38,20 +111,21 @@ class StaleSharedAnnotationError(RuntimeError):
     """Raised when a shared Mesh no longer matches an Object-local mapping."""
 
 
-class StackEncodingError(ValueError):
-    """Raised when annotation ownership cannot be stored losslessly."""
-
-
-class StackCapacityError(StackEncodingError):
-    """Raised before a BMesh string layer could truncate annotation data."""
-
-
 class StackMergeResult(NamedTuple):
     changed: bool
     complete: bool
     inspected: bool
 
 
+class AnnotationChange(NamedTuple):
+    """One committed mapping step; ``None`` stacks mean any element may differ."""
+
+    previous_generation: int
+    generation: int
+    previous: dict | None
+    current: dict | None
+
+
 def _settings_cache_pointer(settings) -> int:
     try:
         return int(settings.as_pointer())
@@ -63,36 +137,85 @@ def _element_layers_cache_key(settings, element_type: str):
     return _settings_cache_pointer(settings), element_type
 
 
-def _cache_element_layers(
-    settings, element_type: str, data_str: str, mapping, *, valid=True
-):
+def _element_layers_digest(data_str: str) -> str:
+    return hashlib.blake2b(data_str.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _settings_owner_name(settings) -> str:
+    try:
+        return settings.id_data.name
+    except (AttributeError, ReferenceError):
+        return ""
+
+
+def _decoded_element_layers(digest: str, mapping=None, *, valid=True, cost=0.0):
+    """Return the content-addressed decode for ``digest`` or store ``mapping``."""
+
+    if mapping is None:
+        return _DECODED_ELEMENT_LAYERS.lookup(digest)
+    decoded = _DECODED_ELEMENT_LAYERS.get(digest)
+    if decoded is None:
+        decoded = {
+            "mapping": mapping,
+            "valid": bool(valid),
+            "counts": None,
+            "value_count": len(mapping)
+            + sum(len(layers) for layers in mapping.values()),
+            "decode_seconds": cost,
+        }
+    _DECODED_ELEMENT_LAYERS.store(
+        digest,
+        decoded,
+        nbytes=decoded["value_count"] * _ANNOTATION_VALUE_BYTES,
+        cost=decoded["decode_seconds"],
+    )
+    return decoded
+
+
+def _cache_element_layers(settings, element_type: str, digest: str, decoded):
     key = _element_layers_cache_key(settings, element_type)
-    _ELEMENT_LAYERS_CACHE[key] = {
-        "data": data_str,
-        "mapping": mapping,
-        "valid": bool(valid),
-        "counts": None,
-        "value_count": len(mapping) + sum(len(layers) for layers in mapping.values()),
-    }
-    _ELEMENT_LAYERS_CACHE.move_to_end(key)
-    while (
-        len(_ELEMENT_LAYERS_CACHE) > _ELEMENT_LAYERS_CACHE_LIMIT
-        or len(_ELEMENT_LAYERS_CACHE) > 1
-        and sum(
-            entry["value_count"] for entry in _ELEMENT_LAYERS_CACHE.values()
-        )
-        > _ELEMENT_LAYERS_VALUE_LIMIT
-    ):
-        _ELEMENT_LAYERS_CACHE.popitem(last=False)
-    return mapping
+    stored_hash = getattr(settings, element_spec(element_type).hash_property, "")
+    # The hash property is only trusted once it has been seen to describe the
+    # data it sits next to. Legacy files and direct writes keep the slow path.
+    # Entries are sized by the decode they keep alive; settings that share
+    # one decode are counted once.
+    _ELEMENT_LAYERS_CACHE.store(
+        key,
+        {
+            "hash": stored_hash if stored_hash == digest else "",
+            "digest": digest,
+            "decoded": decoded,
+            "value_count": decoded["value_count"],
+        },
+        nbytes=decoded["value_count"] * _ANNOTATION_VALUE_BYTES,
+        cost=decoded["decode_seconds"],
+        owner=_settings_owner_name(settings),
+        identity=id(decoded),
+    )
+    return decoded
+
+
+def discard_element_layers_entry(settings, element_type: str):
+    """Forget which content ``settings`` holds after a direct data write."""
+
+    _ELEMENT_LAYERS_CACHE.pop(_element_layers_cache_key(settings, element_type), None)
 
 
 def invalidate_element_layers_cache(settings=None, element_type=None):
     """Discard decoded annotation data without touching Blender-owned properties."""
     if settings is None:
         _ELEMENT_LAYERS_CACHE.clear()
+        _DECODED_ELEMENT_LAYERS.clear()
         _BMESH_SYNC_STATES.clear()
+        _STATE_CHUNKS.clear()
+        _SHARED_PROOFS.clear()
+        _MESH_GEOMETRY_GENERATIONS.clear()
+        _EDIT_MESH_SNAPSHOTS.clear()
         _BMESH_SYNC_DIRTY_AT.clear()
+        _BMESH_SYNC_IN_PROGRESS.clear()
+        _ANNOTATION_GENERATIONS.clear()
+        _ANNOTATION_CHANGES.clear()
+        _ANNOTATION_SELF_UPDATES.clear()
         return
     settings_pointer = _settings_cache_pointer(settings)
     for key in list(_ELEMENT_LAYERS_CACHE):
@@ -100,6 +223,136 @@ def invalidate_element_layers_cache(settings=None, element_type=None):
             continue
         if element_type is None or key[1] == element_type:
             _ELEMENT_LAYERS_CACHE.pop(key, None)
+    for invalidated_type in (
+        ELEMENT_TYPES if element_type is None else (element_type,)
+    ):
+        _publish_annotation_change(settings, invalidated_type)
+
+
+def reset_annotation_history_state():
+    """Forget identity-bound proofs after undo/redo, keeping content decodes.
+
+    Decoded mappings are validated by content hash and survive; every
+    generation advances with an empty journal so no delta spans the step.
+    """
+
+    _BMESH_SYNC_STATES.clear()
+    _BMESH_SYNC_DIRTY_AT.clear()
+    _BMESH_SYNC_IN_PROGRESS.clear()
+    _ANNOTATION_CHANGES.clear()
+    _ANNOTATION_SELF_UPDATES.clear()
+    _STATE_CHUNKS.clear()
+    _SHARED_PROOFS.clear()
+    _EDIT_MESH_SNAPSHOTS.clear()
+    for key in _ANNOTATION_GENERATIONS:
+        _ANNOTATION_GENERATIONS[key] = next(_annotation_generation_counter)
+
+
+def annotation_generation(settings, element_type: str) -> int:
+    """Return a session-unique token for the last committed mapping."""
+
+    if settings is None:
+        return 0
+    return _ANNOTATION_GENERATIONS.get(
+        _element_layers_cache_key(settings, element_type), 0
+    )
+
+
+def _publish_annotation_change(
+    settings, element_type: str, previous=None, current=None
+):
+    key = _element_layers_cache_key(settings, element_type)
+    previous_generation = _ANNOTATION_GENERATIONS.get(key, 0)
+    generation = next(_annotation_generation_counter)
+    _ANNOTATION_GENERATIONS[key] = generation
+    changes = _ANNOTATION_CHANGES.setdefault(key, [])
+    changes.append(
+        AnnotationChange(previous_generation, generation, previous, current)
+    )
+    del changes[:-_ANNOTATION_CHANGE_DEPTH]
+    _ANNOTATION_CHANGES.move_to_end(key)
+    while len(_ANNOTATION_CHANGES) > _ANNOTATION_CHANGE_LIMIT:
+        _ANNOTATION_CHANGES.popitem(last=False)
+    return generation
+
+
+def annotation_changes_since(settings, element_type: str, generation: int):
+    """Merge committed deltas after ``generation`` or return ``None``.
+
+    The result maps element indices to ``(previous, current)`` layer stacks.
+    ``None`` means the journal cannot prove a delta and callers must rebuild.
+    """
+
+    key = _element_layers_cache_key(settings, element_type)
+    current_generation = _ANNOTATION_GENERATIONS.get(key, 0)
+    if generation == current_generation:
+        return {}
+    merged = {}
+    expected_generation = generation
+    for change in _ANNOTATION_CHANGES.get(key, ()):
+        if change.generation <= generation:
+            continue
+        if (
+            change.previous_generation != expected_generation
+            or change.previous is None
+            or change.current is None
+        ):
+            return None
+        for index, layers in change.current.items():
+            previous = merged.get(index, (change.previous.get(index, ()),))[0]
+            merged[index] = (previous, layers)
+        expected_generation = change.generation
+    if expected_generation != current_generation:
+        return None
+    return merged
+
+
+def mesh_content_digest(mesh) -> bytes:
+    """Hash vertex positions and element order of Object Mode mesh data."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    for collection, attribute, typecode, width in (
+        (mesh.vertices, "co", "f", 3),
+        (mesh.edges, "vertices", "i", 2),
+        (mesh.polygons, "loop_total", "i", 1),
+        (mesh.loops, "vertex_index", "i", 1),
+    ):
+        values = array(typecode, bytes(4 * width * len(collection)))
+        collection.foreach_get(attribute, values)
+        digest.update(values)
+    return digest.digest()
+
+
+def mesh_geometry_signature(mesh, bm=None):
+    """Identify the current geometry of ``mesh`` for self-update matching.
+
+    Edit Mode geometry lives in the edit BMesh, where only element counts are
+    cheap to read; Object Mode data is hashed in full.
+    """
+
+    if mesh.is_editmode:
+        return _bmesh_topology_signature(bm or bmesh.from_edit_mesh(mesh))
+    return mesh_content_digest(mesh)
+
+
+def _record_annotation_self_update(mesh, bm):
+    _ANNOTATION_SELF_UPDATES[int(mesh.session_uid)] = mesh_geometry_signature(
+        mesh, bm if mesh.is_editmode else None
+    )
+
+
+def consume_annotation_self_updates() -> dict:
+    """Return and forget ``{mesh_uid: signature}`` of pending annotation flushes.
+
+    A flush's depsgraph update only rewrote annotation storage when
+    :func:`mesh_geometry_signature` still returns the recorded signature.
+    """
+
+    if not _ANNOTATION_SELF_UPDATES:
+        return {}
+    self_updates = dict(_ANNOTATION_SELF_UPDATES)
+    _ANNOTATION_SELF_UPDATES.clear()
+    return self_updates
 
 
 def debug_log(settings, *message):
@@ -118,20 +371,6 @@ def layer_order_map(settings, element_type: str):
     return {layer.layer_id: index for index, layer in enumerate(collection)}
 
 
-def normalize_layer_ids(layers, order_lookup=None):
-    unique = []
-    seen = set()
-    for lid in layers:
-        lid = int(lid)
-        if lid in seen:
-            continue
-        seen.add(lid)
-        unique.append(lid)
-    if order_lookup:
-        unique.sort(key=lambda value: order_lookup.get(value, float("inf")))
-    return unique
-
-
 def _object_bmesh(obj):
     mesh = obj.data
     if obj.mode == "EDIT":
@@ -146,7 +385,8 @@ def apply_layer_order_to_mapping(obj: bpy.types.Object, element_type: str) -> bo
     settings = getattr(obj, "mesh_annotations", None)
     if settings is None:
         return False
-    mapping = copy_element_layers(load_element_layers(settings, element_type))
+    stored_mapping = load_element_layers(settings, element_type)
+    mapping = copy_element_layers(stored_mapping)
     mesh, bm, source_is_edit = _object_bmesh(obj)
     try:
         ensure_lookup_tables(bm, element_type)
@@ -187,6 +427,7 @@ def apply_layer_order_to_mapping(obj: bpy.types.Object, element_type: str) -> bo
                 changed_indices,
                 source_is_edit=source_is_edit,
                 complete_state=stack_created or merge_result.complete,
+                previous_mapping=None if storage_changed else stored_mapping,
             )
         else:
             _finalize_reconciled_mapping(
@@ -242,83 +483,70 @@ def element_container(bm: bmesh.types.BMesh, element_type: str):
     raise ValueError(f"Unsupported mesh element type: {element_type!r}")
 
 
-def _stored_layer_id(raw_value) -> int:
-    if isinstance(raw_value, bool) or not isinstance(raw_value, (int, str)):
-        raise ValueError("Layer IDs must be integers")
-    layer_id = int(raw_value)
-    if not (0 < layer_id <= _LAYER_ID_MAX):
-        raise ValueError("Layer ID is out of range")
-    return layer_id
+def _element_layers_entry(settings, element_type: str):
+    """Return the cache entry for ``settings`` without reading unchanged data.
 
+    A matching hash property proves the decoded mapping is current, so the
+    multi-megabyte JSON string is only fetched from RNA after it changed.
+    """
 
-def load_element_layers(settings, element_type: str):
-    if settings is None:
-        return {}
-    data_str = getattr(settings, _data_property_name(element_type), "")
-    if not data_str:
-        return _cache_element_layers(settings, element_type, data_str, {})
+    spec = element_spec(element_type)
     cache_key = _element_layers_cache_key(settings, element_type)
     cached = _ELEMENT_LAYERS_CACHE.get(cache_key)
-    if cached is not None and cached["data"] == data_str:
+    if cached is not None and cached["hash"]:
+        if getattr(settings, spec.hash_property, "") == cached["hash"]:
+            _ELEMENT_LAYERS_CACHE.move_to_end(cache_key)
+            _ELEMENT_LAYERS_CACHE.note(True)
+            return cached
+    data_str = getattr(settings, spec.data_property, "")
+    digest = _element_layers_digest(data_str)
+    if cached is not None and cached["digest"] == digest:
         _ELEMENT_LAYERS_CACHE.move_to_end(cache_key)
-        return cached["mapping"]
+        _ELEMENT_LAYERS_CACHE.note(True)
+        return cached
+    _ELEMENT_LAYERS_CACHE.note(False)
+    decoded = _decoded_element_layers(digest)
+    if decoded is None:
+        started = time.perf_counter()
+        mapping, valid = _decode_element_layers(settings, element_type, data_str)
+        decoded = _decoded_element_layers(
+            digest, mapping, valid=valid, cost=time.perf_counter() - started
+        )
+    _cache_element_layers(settings, element_type, digest, decoded)
+    return _ELEMENT_LAYERS_CACHE[cache_key]
+
+
+def _decode_element_layers(settings, element_type: str, data_str: str):
+    if not data_str:
+        return {}, True
     try:
         raw = json.loads(data_str)
     except (json.JSONDecodeError, TypeError):
         debug_log(settings, f"Ignored invalid {element_type} annotation JSON")
-        return _cache_element_layers(
-            settings, element_type, data_str, {}, valid=False
-        )
+        return {}, False
     if not isinstance(raw, dict):
         debug_log(settings, f"Ignored non-object {element_type} annotation data")
-        return _cache_element_layers(
-            settings, element_type, data_str, {}, valid=False
-        )
+        return {}, False
+    return validate_element_layers(raw)
 
-    mapping = {}
-    valid = True
-    for raw_index, raw_layers in raw.items():
-        try:
-            index = int(raw_index)
-        except (TypeError, ValueError):
-            valid = False
-            continue
-        if (
-            index < 0
-            or str(raw_index) != str(index)
-            or not isinstance(raw_layers, list)
-            or not raw_layers
-        ):
-            valid = False
-            continue
-        if len(raw_layers) == 1:
-            try:
-                layer_id = _stored_layer_id(raw_layers[0])
-            except (TypeError, ValueError):
-                valid = False
-                continue
-            mapping[str(index)] = [layer_id]
-            continue
-        layer_ids = []
-        seen_layer_ids = set()
-        for raw_layer_id in raw_layers:
-            try:
-                layer_id = _stored_layer_id(raw_layer_id)
-            except (TypeError, ValueError):
-                valid = False
-                continue
-            if layer_id in seen_layer_ids:
-                valid = False
-                continue
-            seen_layer_ids.add(layer_id)
-            layer_ids.append(layer_id)
-        if layer_ids:
-            mapping[str(index)] = layer_ids
-        else:
-            valid = False
-    return _cache_element_layers(
-        settings, element_type, data_str, mapping, valid=valid
-    )
+
+def load_element_layers(settings, element_type: str):
+    """Return the decoded mapping shared by every holder of identical data.
+
+    The result is read-only; use :func:`copy_element_layers` before editing.
+    """
+
+    if settings is None:
+        return {}
+    return _element_layers_entry(settings, element_type)["decoded"]["mapping"]
+
+
+def element_layers_digest(settings, element_type: str) -> str:
+    """Return a content digest of the stored mapping without re-hashing it."""
+
+    if settings is None:
+        return ""
+    return _element_layers_entry(settings, element_type)["digest"]
 
 
 def element_layers_data_is_valid(settings, element_type: str) -> bool:
@@ -326,13 +554,7 @@ def element_layers_data_is_valid(settings, element_type: str) -> bool:
 
     if settings is None:
         return True
-    data_str = getattr(settings, _data_property_name(element_type), "")
-    cache_key = _element_layers_cache_key(settings, element_type)
-    cached = _ELEMENT_LAYERS_CACHE.get(cache_key)
-    if cached is None or cached["data"] != data_str:
-        load_element_layers(settings, element_type)
-        cached = _ELEMENT_LAYERS_CACHE.get(cache_key)
-    return bool(cached is not None and cached["valid"])
+    return _element_layers_entry(settings, element_type)["decoded"]["valid"]
 
 
 def copy_element_layers(mapping):
@@ -341,56 +563,40 @@ def copy_element_layers(mapping):
     return {str(key): list(layers) for key, layers in mapping.items()}
 
 
-def prepare_element_layers(mapping):
-    """Validate and serialize a complete mapping without changing Blender data."""
-
-    cleaned = {}
-    for raw_index, values in mapping.items():
-        try:
-            index = int(raw_index)
-        except (TypeError, ValueError) as exc:
-            raise StackEncodingError("Invalid annotation element index") from exc
-        if index < 0:
-            raise StackEncodingError("Annotation element indices must be non-negative")
-        normalized = normalize_layer_ids(values)
-        if normalized:
-            encode_layers(normalized)
-            cleaned[str(index)] = normalized
-    data_str = json.dumps(cleaned, separators=(",", ":"))
-    return cleaned, data_str
-
-
 def commit_prepared_element_layers(
-    settings, element_type: str, cleaned, data_str: str
+    settings, element_type: str, cleaned, data_str: str, *, change=None
 ):
-    """Commit data returned by :func:`prepare_element_layers`."""
+    """Commit data returned by :func:`prepare_element_layers`.
+
+    ``change`` is an optional ``(previous, current)`` pair of per-index layer
+    stacks. Without it, consumers treat the commit as a complete replacement.
+    """
 
     owner = getattr(settings, "id_data", None)
     if isinstance(owner, bpy.types.Object) and owner.type == "MESH":
         ensure_annotation_mesh_editable(owner)
-    setattr(settings, _data_property_name(element_type), data_str)
-    _cache_element_layers(settings, element_type, data_str, cleaned)
+    spec = element_spec(element_type)
+    digest = _element_layers_digest(data_str)
+    setattr(settings, spec.data_property, data_str)
+    setattr(settings, spec.hash_property, digest)
+    _cache_element_layers(
+        settings, element_type, digest, _decoded_element_layers(digest, cleaned)
+    )
+    previous, current = change if change is not None else (None, None)
+    _publish_annotation_change(settings, element_type, previous, current)
 
 
 def element_layer_counts(settings, element_type: str):
     """Return cached per-layer usage counts for one annotation element kind."""
     if settings is None:
         return Counter()
-    data_str = getattr(settings, _data_property_name(element_type), "")
-    cache_key = _element_layers_cache_key(settings, element_type)
-    cached = _ELEMENT_LAYERS_CACHE.get(cache_key)
-    if cached is None or cached["data"] != data_str:
-        load_element_layers(settings, element_type)
-        cached = _ELEMENT_LAYERS_CACHE.get(cache_key)
-    if cached is None:
-        return Counter()
-    _ELEMENT_LAYERS_CACHE.move_to_end(cache_key)
-    if cached["counts"] is None:
+    decoded = _element_layers_entry(settings, element_type)["decoded"]
+    if decoded["counts"] is None:
         counts = Counter()
-        for layers in cached["mapping"].values():
+        for layers in decoded["mapping"].values():
             counts.update(layers)
-        cached["counts"] = counts
-    return cached["counts"]
+        decoded["counts"] = counts
+    return decoded["counts"]
 
 
 def get_layers_for_index(mapping, element_index: int):
@@ -419,116 +625,6 @@ def prune_mapping_to_index_count(mapping, element_count: int):
     return removed
 
 
-def _encode_uvarint(value: int) -> bytes:
-    if not (0 <= value <= _LAYER_ID_MAX):
-        raise StackEncodingError(f"Invalid annotation layer id: {value!r}")
-    encoded = bytearray()
-    while True:
-        byte = value & 0x7F
-        value >>= 7
-        encoded.append(byte | (0x80 if value else 0))
-        if not value:
-            return bytes(encoded)
-
-
-def _decode_uvarint(data: bytes, offset: int, limit: int):
-    value = 0
-    shift = 0
-    while offset < limit and shift <= 28:
-        byte = data[offset]
-        offset += 1
-        value |= (byte & 0x7F) << shift
-        if not byte & 0x80:
-            if value > _LAYER_ID_MAX:
-                raise StackEncodingError("Annotation layer id is out of range")
-            return value, offset
-        shift += 7
-    raise StackEncodingError("Truncated annotation stack integer")
-
-
-def encode_layers(layers):
-    """Encode every layer id or fail before Blender's 255-byte truncation."""
-
-    normalized = []
-    seen = set()
-    for raw_layer_id in layers:
-        layer_id = int(raw_layer_id)
-        if layer_id <= 0:
-            raise StackEncodingError("Annotation layer ids must be positive")
-        if layer_id not in seen:
-            seen.add(layer_id)
-            normalized.append(layer_id)
-    if not normalized:
-        return b""
-    payload = bytearray(_STACK_MAGIC)
-    payload.append(_STACK_VERSION)
-    payload.extend(_encode_uvarint(len(normalized)))
-    for layer_id in normalized:
-        payload.extend(_encode_uvarint(layer_id))
-    payload.extend(zlib.crc32(payload).to_bytes(4, "little"))
-    if len(payload) > _STACK_MAX_BYTES:
-        raise StackCapacityError(
-            "Too many overlapping annotation layers for one mesh element"
-        )
-    return bytes(payload)
-
-
-def _decode_stack_payload(data):
-    if not data:
-        return [], "EMPTY"
-    if not isinstance(data, bytes):
-        data = bytes(data)
-    if not data.startswith(_STACK_MAGIC):
-        try:
-            text = data.decode("ascii")
-            values = [int(token.strip()) for token in text.split(",") if token.strip()]
-        except (UnicodeDecodeError, ValueError) as exc:
-            raise StackEncodingError("Invalid legacy annotation stack") from exc
-        if any(value <= 0 for value in values) or len(values) != len(set(values)):
-            raise StackEncodingError("Invalid legacy annotation layer ids")
-        return values, "LEGACY"
-    minimum_size = len(_STACK_MAGIC) + 1 + 1 + 4
-    if len(data) < minimum_size:
-        raise StackEncodingError("Truncated annotation stack header")
-    version_offset = len(_STACK_MAGIC)
-    if data[version_offset] != _STACK_VERSION:
-        raise StackEncodingError("Unsupported annotation stack version")
-    checksum_offset = len(data) - 4
-    expected_checksum = int.from_bytes(data[checksum_offset:], "little")
-    if zlib.crc32(data[:checksum_offset]) != expected_checksum:
-        raise StackEncodingError("Annotation stack checksum mismatch")
-    offset = version_offset + 1
-    count, offset = _decode_uvarint(data, offset, checksum_offset)
-    values = []
-    for _index in range(count):
-        value, offset = _decode_uvarint(data, offset, checksum_offset)
-        if value <= 0 or value in values:
-            raise StackEncodingError("Invalid annotation layer id sequence")
-        values.append(value)
-    if offset != checksum_offset:
-        raise StackEncodingError("Unexpected bytes in annotation stack")
-    return values, "BINARY"
-
-
-def decode_layer_bytes(data):
-    """Decode a complete stack; malformed or truncated data is never partial."""
-
-    return _decode_stack_payload(data)[0]
-
-
-def _legacy_prefix(layers):
-    accepted = []
-    size = 0
-    for layer_id in layers:
-        token = ("," if accepted else "") + str(int(layer_id))
-        token_size = len(token.encode("ascii"))
-        if size + token_size > _STACK_MAX_BYTES:
-            break
-        accepted.append(int(layer_id))
-        size += token_size
-    return accepted
-
-
 def ensure_annotation_stack(
     bm: bmesh.types.BMesh,
     element_type: str,
@@ -552,6 +648,7 @@ def ensure_annotation_stack(
         for elem in container:
             layers = list(initial_mapping.get(str(elem.index), ()))
             stack_values.append((elem.index, encode_layers(layers)))
+        count_operation("bmesh_elements", len(container))
     elif stack_created and initial_mapping:
         for raw_index, layers in initial_mapping.items():
             index = int(raw_index)
@@ -581,10 +678,16 @@ def merge_stack_layer_into_mapping(mapping, bm, stack_layer, element_type: str):
     """Reconcile a complete valid BMesh stack, preserving damaged legacy data."""
 
     container = element_container(bm, element_type)
-    mapped_keys = {int(key): key for key in mapping}
+    return _merge_stack_elements(
+        mapping, {int(key): key for key in mapping}, container, stack_layer
+    )
+
+
+def _merge_stack_elements(mapping, mapped_keys, elements, stack_layer):
     changed = False
     complete = True
-    for elem in container:
+    visited = 0
+    for visited, elem in enumerate(elements, 1):
         data = elem[stack_layer]
         key = mapped_keys.get(elem.index)
         if not data:
@@ -595,7 +698,7 @@ def merge_stack_layer_into_mapping(mapping, bm, stack_layer, element_type: str):
         if key is None:
             key = str(elem.index)
         try:
-            layers, encoding = _decode_stack_payload(data)
+            layers, encoding = decode_stack_payload(data)
         except StackEncodingError:
             complete = False
             continue
@@ -604,11 +707,11 @@ def merge_stack_layer_into_mapping(mapping, bm, stack_layer, element_type: str):
         if encoding == "LEGACY":
             legacy_was_truncated = (
                 len(current) > len(layers)
-                and layers == _legacy_prefix(current)
+                and layers == legacy_prefix(current)
             )
             if legacy_was_truncated:
                 layers = current
-            elif len(data) >= _STACK_MAX_BYTES and current != layers:
+            elif len(data) >= STACK_MAX_BYTES and current != layers:
                 # A legacy value at Blender's hard limit may end in a valid but
                 # partial token. Without a checksum it cannot outrank JSON.
                 complete = False
@@ -626,6 +729,7 @@ def merge_stack_layer_into_mapping(mapping, bm, stack_layer, element_type: str):
         elif key in mapping:
             del mapping[key]
             changed = True
+    count_operation("bmesh_elements", visited)
     return changed, complete
 
 
@@ -660,10 +764,91 @@ def _mapped_topology_identity(bm, element_type: str, elem):
     return _canonical_face_vertices(elem)
 
 
+def _state_chunk_digest(bm, element_type: str, container, stack_layer, indices):
+    """Hash one Merkle leaf as an integer buffer plus its raw stack payloads."""
+
+    values = array("q")
+    payloads = bytearray()
+    element_count = len(container)
+    count_operation("bmesh_elements", len(indices))
+    for element_index in indices:
+        values.append(element_index)
+        if not (0 <= element_index < element_count):
+            values.append(-1)
+            continue
+        elem = container[element_index]
+        identity = _mapped_topology_identity(bm, element_type, elem)
+        values.append(len(identity))
+        values.extend(identity)
+        payload = elem[stack_layer] if stack_layer is not None else b""
+        values.append(len(payload))
+        payloads += payload
+    if sys.byteorder != "little":
+        values.byteswap()
+    digest = hashlib.blake2b(digest_size=20, person=b"MAL-chunk-v3")
+    digest.update(values)
+    digest.update(payloads)
+    return digest.digest()
+
+
+def _state_chunk_signature(bm, stack_layer):
+    return _bmesh_topology_signature(bm), stack_layer is not None
+
+
+def _reusable_state_chunks(mesh, element_type, signature, previous_hash):
+    key = _bmesh_sync_key(mesh, element_type)
+    entry = _STATE_CHUNKS.lookup(key)
+    if (
+        entry is None
+        or not previous_hash
+        or entry["data_hash"] != previous_hash
+        or entry["signature"] != signature
+        or key in _BMESH_SYNC_DIRTY_AT
+    ):
+        return None
+    return entry["chunks"]
+
+
+def note_mesh_geometry_update(mesh):
+    """Advance the geometry generation that keys the shared proofs of ``mesh``."""
+
+    mesh_uid = int(mesh.session_uid)
+    _MESH_GEOMETRY_GENERATIONS[mesh_uid] = next(_mesh_geometry_counter)
+    _MESH_GEOMETRY_GENERATIONS.move_to_end(mesh_uid)
+    while len(_MESH_GEOMETRY_GENERATIONS) > _BMESH_SYNC_CACHE_LIMIT:
+        # A forgotten generation reads as 0 again, so proofs keyed on the
+        # Mesh's older generations must go with it.
+        forgotten_uid, _generation = _MESH_GEOMETRY_GENERATIONS.popitem(last=False)
+        _SHARED_PROOFS.pop(forgotten_uid, None)
+
+
+def discard_annotation_state_chunks(mesh):
+    """Forget Merkle leaves and shared proofs after Blender rewrote ``mesh``."""
+
+    mesh_uid = int(mesh.session_uid)
+    _SHARED_PROOFS.pop(mesh_uid, None)
+    note_mesh_geometry_update(mesh)
+    for element_type in ELEMENT_TYPES:
+        _STATE_CHUNKS.pop((mesh_uid, element_type), None)
+
+
 def annotation_state_fingerprint(
-    bm, element_type: str, mapping, data_str: str | None = None
+    bm,
+    element_type: str,
+    mapping,
+    data_str: str | None = None,
+    *,
+    mesh=None,
+    previous_hash: str = "",
+    changed_indices=None,
 ) -> str:
-    """Bind sparse Object assignments to their current local Mesh identities."""
+    """Bind sparse Object assignments to their current local Mesh identities.
+
+    Mapped elements are hashed in fixed index chunks whose digests form the
+    leaves of the root hash. With ``mesh``, leaves are remembered; a later call
+    naming the ``changed_indices`` since ``previous_hash`` rehashes only their
+    chunks.
+    """
 
     if data_str is None:
         cleaned, data_str = prepare_element_layers(mapping)
@@ -672,6 +857,83 @@ def annotation_state_fingerprint(
     ensure_lookup_tables(bm, element_type)
     container = element_container(bm, element_type)
     stack_layer = container.layers.string.get(element_spec(element_type).stack_layer)
+    signature = _state_chunk_signature(bm, stack_layer)
+    previous_chunks = (
+        None
+        if mesh is None or changed_indices is None
+        else _reusable_state_chunks(mesh, element_type, signature, previous_hash)
+    )
+    if previous_chunks is None:
+        members = {}
+        for raw_index in cleaned:
+            element_index = int(raw_index)
+            members.setdefault(element_index // _STATE_CHUNK_SIZE, []).append(
+                element_index
+            )
+        chunks = {
+            chunk_id: (
+                tuple(sorted(indices)),
+                _state_chunk_digest(
+                    bm, element_type, container, stack_layer, sorted(indices)
+                ),
+            )
+            for chunk_id, indices in members.items()
+        }
+    else:
+        chunks = dict(previous_chunks)
+        touched = {}
+        for element_index in changed_indices:
+            touched.setdefault(int(element_index) // _STATE_CHUNK_SIZE, set()).add(
+                int(element_index)
+            )
+        for chunk_id, indices in touched.items():
+            indices.update(chunks.get(chunk_id, ((), b""))[0])
+            mapped = tuple(
+                sorted(index for index in indices if str(index) in cleaned)
+            )
+            if mapped:
+                chunks[chunk_id] = (
+                    mapped,
+                    _state_chunk_digest(
+                        bm, element_type, container, stack_layer, mapped
+                    ),
+                )
+            else:
+                chunks.pop(chunk_id, None)
+
+    header = array(
+        "q", (len(bm.verts), len(bm.edges), len(bm.faces), int(signature[1]))
+    )
+    if sys.byteorder != "little":
+        header.byteswap()
+    digest = hashlib.blake2b(digest_size=20, person=b"MAL-state-v3")
+    digest.update(element_type.encode("ascii"))
+    digest.update(header)
+    for chunk_id in sorted(chunks):
+        _digest_integer(digest, chunk_id)
+        digest.update(chunks[chunk_id][1])
+    digest.update(data_str.encode("utf-8"))
+    if mesh is not None:
+        key = _bmesh_sync_key(mesh, element_type)
+        _STATE_CHUNKS.store(
+            key,
+            {
+                "signature": signature,
+                "data_hash": _element_layers_digest(data_str),
+                "chunks": chunks,
+            },
+            nbytes=len(chunks) * _STATE_CHUNK_BYTES,
+        )
+    return digest.hexdigest()
+
+
+def _legacy_state_fingerprint(bm, element_type: str, mapping) -> str:
+    """Reproduce tokens written before chunked fingerprints for old files."""
+
+    cleaned, data_str = prepare_element_layers(mapping)
+    ensure_lookup_tables(bm, element_type)
+    container = element_container(bm, element_type)
+    stack_layer = container.layers.string.get(element_spec(element_type).stack_layer)
     digest = hashlib.blake2b(digest_size=20, person=b"MAL-state-v2")
     digest.update(element_type.encode("ascii"))
     for count in (len(bm.verts), len(bm.edges), len(bm.faces)):
@@ -714,13 +976,27 @@ def _complete_stack_matches_mapping(bm, element_type: str, mapping) -> bool:
 
 
 def record_annotation_state(
-    settings, element_type: str, bm, mapping, data_str: str | None = None
+    settings,
+    element_type: str,
+    bm,
+    mapping,
+    data_str: str | None = None,
+    *,
+    mesh=None,
+    previous_hash: str = "",
+    changed_indices=None,
 ):
     """Persist proof that JSON, topology, and BMesh ownership agree."""
 
     property_name = element_spec(element_type).state_property
     value = annotation_state_fingerprint(
-        bm, element_type, mapping, data_str=data_str
+        bm,
+        element_type,
+        mapping,
+        data_str=data_str,
+        mesh=mesh,
+        previous_hash=previous_hash,
+        changed_indices=changed_indices,
     )
     if getattr(settings, property_name, "") != value:
         setattr(settings, property_name, value)
@@ -738,7 +1014,9 @@ def _finish_stack_inspection(
     if not merge_result.inspected:
         return
     if merge_result.complete:
-        record_annotation_state(settings, element_type, bm, mapping, data_str)
+        record_annotation_state(
+            settings, element_type, bm, mapping, data_str, mesh=mesh
+        )
         mark_bmesh_mapping_synchronized(mesh, bm, element_type)
     else:
         clear_annotation_state(settings, element_type)
@@ -763,14 +1041,45 @@ def shared_annotation_mapping_is_current(
         return False
     if not mapping:
         return True
+    stored = getattr(settings, element_spec(element_type).state_property, "")
+    if not stored:
+        return False
+    proof_key = None
+    if mapping is load_element_layers(settings, element_type):
+        mesh_uid = int(obj.data.session_uid)
+        proof_key = (
+            element_type,
+            _bmesh_topology_signature(bm),
+            _MESH_GEOMETRY_GENERATIONS.get(mesh_uid, 0),
+            element_layers_digest(settings, element_type),
+            stored,
+        )
+        proofs = _SHARED_PROOFS.get(mesh_uid)
+        _SHARED_PROOFS.note(proofs is not None and proof_key in proofs)
+        if proofs is not None and proof_key in proofs:
+            _SHARED_PROOFS.move_to_end(mesh_uid)
+            return proofs[proof_key]
     try:
         if not _complete_stack_matches_mapping(bm, element_type, mapping):
-            return False
-        current = annotation_state_fingerprint(bm, element_type, mapping)
+            current = False
+        elif stored == annotation_state_fingerprint(bm, element_type, mapping):
+            current = True
+        else:
+            current = stored == _legacy_state_fingerprint(bm, element_type, mapping)
     except (StackEncodingError, TypeError, ValueError):
-        return False
-    stored = getattr(settings, element_spec(element_type).state_property, "")
-    return bool(stored and stored == current)
+        current = False
+    if proof_key is not None:
+        _store_shared_proof(obj.data, proof_key, current)
+    return current
+
+
+def _store_shared_proof(mesh, proof_key, current: bool):
+    mesh_uid = int(mesh.session_uid)
+    proofs = _SHARED_PROOFS.get(mesh_uid)
+    if proofs is None or len(proofs) >= _SHARED_PROOF_MESH_LIMIT:
+        proofs = {}
+    proofs[proof_key] = current
+    _SHARED_PROOFS.store(mesh_uid, proofs, nbytes=len(proofs) * _SHARED_PROOF_BYTES)
 
 
 def ensure_shared_annotation_current(obj, element_type: str, bm, mapping=None):
@@ -837,29 +1146,113 @@ def mark_bmesh_mapping_quarantined(mesh, bm, element_type: str):
 
 def _remember_bmesh_sync_state(mesh, bm, element_type: str, *, complete: bool):
     key = _bmesh_sync_key(mesh, element_type)
-    _BMESH_SYNC_STATES[key] = (_bmesh_topology_signature(bm), complete)
-    _BMESH_SYNC_STATES.move_to_end(key)
+    _BMESH_SYNC_STATES.store(
+        key,
+        (_bmesh_topology_signature(bm), complete),
+        nbytes=_BMESH_SYNC_STATE_BYTES,
+    )
     _BMESH_SYNC_DIRTY_AT.pop(key, None)
-    while len(_BMESH_SYNC_STATES) > _BMESH_SYNC_CACHE_LIMIT:
-        _BMESH_SYNC_STATES.popitem(last=False)
 
 
-def mark_bmesh_mapping_dirty(mesh):
-    """Coalesce indistinguishable selection, deformation, and topology updates."""
+def _dirty_element_types(mesh):
+    """Return stacked types whose counts moved since their last reconciliation.
+
+    Equal counts cannot rule out a renumbering edit, so every stacked type is
+    dirty when no count changed at all.
+    """
+
+    if not mesh.is_editmode:
+        return ELEMENT_TYPES
+    bm = bmesh.from_edit_mesh(mesh)
+    stacked_types = []
+    counted_types = []
+    for element_type in ELEMENT_TYPES:
+        container = element_container(bm, element_type)
+        if container.layers.string.get(element_spec(element_type).stack_layer) is None:
+            continue
+        stacked_types.append(element_type)
+        state = _BMESH_SYNC_STATES.get(_bmesh_sync_key(mesh, element_type))
+        count_index = _TOPOLOGY_SIGNATURE_INDEX[element_type]
+        if state is None or state[0][count_index] != len(container):
+            counted_types.append(element_type)
+    return tuple(counted_types or stacked_types)
+
+
+def mark_bmesh_mapping_dirty(mesh, element_types=None):
+    """Coalesce indistinguishable selection, deformation, and topology updates.
+
+    ``element_types`` defaults to the stacked types an edit may have
+    renumbered; see :func:`_dirty_element_types`.
+    """
 
     mesh_uid = int(mesh.session_uid)
     dirty_at = time.perf_counter()
-    for element_type in ELEMENT_TYPES:
-        _BMESH_SYNC_DIRTY_AT[(mesh_uid, element_type)] = dirty_at
+    if element_types is None:
+        element_types = _dirty_element_types(mesh)
+    for element_type in element_types:
+        key = (mesh_uid, element_type)
+        _BMESH_SYNC_DIRTY_AT[key] = dirty_at
+        _BMESH_SYNC_DIRTY_AT.move_to_end(key)
+        _STATE_CHUNKS.pop(key, None)
     while len(_BMESH_SYNC_DIRTY_AT) > _BMESH_SYNC_CACHE_LIMIT * len(ELEMENT_TYPES):
-        oldest_key = min(_BMESH_SYNC_DIRTY_AT, key=_BMESH_SYNC_DIRTY_AT.get)
-        _BMESH_SYNC_DIRTY_AT.pop(oldest_key, None)
+        _BMESH_SYNC_DIRTY_AT.popitem(last=False)
+
+
+def bmesh_mapping_is_dirty(mesh) -> bool:
+    mesh_uid = int(mesh.session_uid)
+    return any(
+        (mesh_uid, element_type) in _BMESH_SYNC_DIRTY_AT
+        for element_type in ELEMENT_TYPES
+    )
+
+
+def classify_edit_mesh_update(
+    mesh, last_operator: str = "", operator_marker=None, modal_operators=()
+) -> str:
+    """Return ``TOPOLOGY``, ``COORDINATES``, or ``SELECTION`` for an edit update.
+
+    Only matching element counts together with an operator that cannot
+    renumber elements avoid a full stack reconciliation. A registered
+    operator is trusted only while its history entry is new: ``operator_marker``
+    must differ from the one seen at the previous update of ``mesh``, since a
+    script or unregistered edit leaves the newest entry unchanged. A running
+    modal transform in ``modal_operators`` has not registered yet and is
+    trusted on every update it reports.
+    """
+
+    bm = bmesh.from_edit_mesh(mesh)
+    counts = _bmesh_topology_signature(bm)
+    selection = (
+        int(mesh.total_vert_sel),
+        int(mesh.total_edge_sel),
+        int(mesh.total_face_sel),
+    )
+    key = int(mesh.session_uid)
+    previous = _EDIT_MESH_SNAPSHOTS.get(key)
+    _EDIT_MESH_SNAPSHOTS[key] = (counts, selection, operator_marker)
+    _EDIT_MESH_SNAPSHOTS.move_to_end(key)
+    while len(_EDIT_MESH_SNAPSHOTS) > _BMESH_SYNC_CACHE_LIMIT:
+        _EDIT_MESH_SNAPSHOTS.popitem(last=False)
+    if previous is None or previous[0] != counts:
+        return "TOPOLOGY"
+    if any(
+        operator_id.startswith(_COORDINATE_OPERATOR_PREFIXES)
+        for operator_id in modal_operators
+    ):
+        return "COORDINATES"
+    if operator_marker is None or operator_marker == previous[2]:
+        return "TOPOLOGY"
+    if last_operator.startswith(_COORDINATE_OPERATOR_PREFIXES):
+        return "COORDINATES"
+    if last_operator.startswith(_SELECTION_OPERATOR_PREFIXES):
+        return "SELECTION" if previous[1] != selection else "COORDINATES"
+    return "TOPOLOGY"
 
 
 def pending_bmesh_sync_delay() -> float:
     if not _BMESH_SYNC_DIRTY_AT:
         return 0.0
-    newest_update = max(_BMESH_SYNC_DIRTY_AT.values())
+    newest_update = _BMESH_SYNC_DIRTY_AT[next(reversed(_BMESH_SYNC_DIRTY_AT))]
     return max(0.0, _BMESH_SYNC_QUIET_SECONDS - (time.perf_counter() - newest_update))
 
 
@@ -884,14 +1277,19 @@ def merge_stack_layer_if_needed(
         not force
         and defer
         and dirty_at is not None
-        and time.perf_counter() - dirty_at < _BMESH_SYNC_QUIET_SECONDS
+        and (
+            key in _BMESH_SYNC_IN_PROGRESS
+            or time.perf_counter() - dirty_at < _BMESH_SYNC_QUIET_SECONDS
+        )
     ):
         return mapping, StackMergeResult(False, False, False)
     if not force and dirty_at is None:
         cached_state = _BMESH_SYNC_STATES.get(key)
         if cached_state is not None and cached_state[0] == signature:
             _BMESH_SYNC_STATES.move_to_end(key)
+            _BMESH_SYNC_STATES.note(True)
             return mapping, StackMergeResult(False, cached_state[1], False)
+        _BMESH_SYNC_STATES.note(False)
     working_mapping = copy_element_layers(mapping)
     changed, complete = merge_stack_layer_into_mapping(
         working_mapping, bm, stack_layer, element_type
@@ -931,6 +1329,7 @@ def sync_mapping_to_bmesh(
     for index, payload in prepared:
         elem = container[index]
         elem[stack_layer] = payload
+    count_operation("bmesh_elements", len(prepared))
 
 
 def _flush_bmesh(mesh, bm, source_is_edit: bool):
@@ -939,6 +1338,9 @@ def _flush_bmesh(mesh, bm, source_is_edit: bool):
     else:
         bm.to_mesh(mesh)
         mesh.update()
+    # Stack payloads are string custom data; the resulting depsgraph update
+    # cannot move or renumber the evaluated surface.
+    _record_annotation_self_update(mesh, bm)
 
 
 def commit_mapping_transaction(
@@ -954,8 +1356,13 @@ def commit_mapping_transaction(
     *,
     source_is_edit: bool,
     complete_state: bool,
+    previous_mapping=None,
 ):
-    """Commit BMesh + JSON + proof token, restoring all of them on failure."""
+    """Commit BMesh + JSON + proof token, restoring all of them on failure.
+
+    Pass the durable ``previous_mapping`` only when every index outside
+    ``element_indices`` is unchanged; the commit then publishes a delta.
+    """
 
     container = element_container(bm, element_type)
     if element_indices is None:
@@ -973,10 +1380,22 @@ def commit_mapping_transaction(
         if stack_created
         else {index: bytes(container[index][stack_layer]) for index in target_indices}
     )
+    count_operation("bmesh_elements", len(previous_payloads))
     data_property = _data_property_name(element_type)
+    hash_property = element_spec(element_type).hash_property
     state_property = element_spec(element_type).state_property
     previous_data = getattr(settings, data_property)
+    previous_hash = getattr(settings, hash_property, "")
     previous_state = getattr(settings, state_property, "")
+    change = None
+    if previous_mapping is not None:
+        change = (
+            {
+                index: tuple(previous_mapping.get(str(index), ()))
+                for index in target_indices
+            },
+            {index: tuple(mapping.get(str(index), ())) for index in target_indices},
+        )
     mesh_flush_attempted = False
     try:
         sync_mapping_to_bmesh(
@@ -987,10 +1406,19 @@ def commit_mapping_transaction(
         if source_is_edit:
             mesh_flush_attempted = True
             _flush_bmesh(mesh, bm, True)
-        commit_prepared_element_layers(settings, element_type, mapping, data_str)
+        commit_prepared_element_layers(
+            settings, element_type, mapping, data_str, change=change
+        )
         if complete_state:
             record_annotation_state(
-                settings, element_type, bm, mapping, data_str
+                settings,
+                element_type,
+                bm,
+                mapping,
+                data_str,
+                mesh=mesh,
+                previous_hash=previous_hash,
+                changed_indices=None if change is None else target_indices,
             )
         else:
             clear_annotation_state(settings, element_type)
@@ -1015,11 +1443,12 @@ def commit_mapping_transaction(
         finally:
             try:
                 setattr(settings, data_property, previous_data)
+                setattr(settings, hash_property, previous_hash)
                 setattr(settings, state_property, previous_state)
             finally:
                 invalidate_element_layers_cache(settings, element_type)
                 if bmesh_restored:
-                    mark_bmesh_mapping_dirty(mesh)
+                    mark_bmesh_mapping_dirty(mesh, (element_type,))
                 else:
                     mark_bmesh_mapping_quarantined(mesh, bm, element_type)
         raise
@@ -1044,8 +1473,10 @@ def _finalize_reconciled_mapping(
         return
 
     data_property = _data_property_name(element_type)
+    hash_property = element_spec(element_type).hash_property
     state_property = element_spec(element_type).state_property
     previous_data = getattr(settings, data_property)
+    previous_hash = getattr(settings, hash_property, "")
     previous_state = getattr(settings, state_property, "")
     try:
         commit_prepared_element_layers(settings, element_type, mapping, data_str)
@@ -1054,9 +1485,10 @@ def _finalize_reconciled_mapping(
         )
     except Exception:
         setattr(settings, data_property, previous_data)
+        setattr(settings, hash_property, previous_hash)
         setattr(settings, state_property, previous_state)
         invalidate_element_layers_cache(settings, element_type)
-        mark_bmesh_mapping_dirty(mesh)
+        mark_bmesh_mapping_dirty(mesh, (element_type,))
         raise
 
 
@@ -1154,7 +1586,8 @@ def assign_elements_to_layer(
     settings = getattr(obj, "mesh_annotations", None)
     if settings is None or get_layer_by_id(settings, element_type, layer_id) is None:
         return False
-    mapping = copy_element_layers(load_element_layers(settings, element_type))
+    stored_mapping = load_element_layers(settings, element_type)
+    mapping = copy_element_layers(stored_mapping)
     debug_log(
         settings,
         f"Assign elements start: type={element_type}, "
@@ -1172,12 +1605,11 @@ def assign_elements_to_layer(
             mapping, mesh, bm, stack_layer, element_type
         )
         storage_changed |= merge_result.changed
-        if element_indices is None:
-            target_indices = (
-                [elem.index for elem in container if elem.select]
-                if source_is_edit
-                else list(range(len(container)))
-            )
+        if element_indices is None and source_is_edit:
+            target_indices = [elem.index for elem in container if elem.select]
+            count_operation("bmesh_elements", len(container))
+        elif element_indices is None:
+            target_indices = list(range(len(container)))
         else:
             target_indices = [
                 index
@@ -1230,6 +1662,7 @@ def assign_elements_to_layer(
             target_indices,
             source_is_edit=source_is_edit,
             complete_state=stack_created or merge_result.complete,
+            previous_mapping=None if storage_changed else stored_mapping,
         )
         debug_log(settings, f"Assign success: {len(target_indices)} elements")
         return True
@@ -1249,7 +1682,8 @@ def clear_elements_from_layer(
         raise ValueError(f"Unsupported annotation clear mode: {mode!r}")
     ensure_annotation_mesh_editable(obj)
     settings = getattr(obj, "mesh_annotations", None)
-    mapping = copy_element_layers(load_element_layers(settings, element_type))
+    stored_mapping = load_element_layers(settings, element_type)
+    mapping = copy_element_layers(stored_mapping)
     order_lookup = layer_order_map(settings, element_type)
     debug_log(
         settings,
@@ -1273,6 +1707,7 @@ def clear_elements_from_layer(
             for elem in container
             if not only_selected or elem.select
         ]
+        count_operation("bmesh_elements", len(container))
         changed_indices = set()
         for elem in targets:
             layers = normalize_layer_ids(
@@ -1305,6 +1740,7 @@ def clear_elements_from_layer(
                 changed_indices,
                 source_is_edit=source_is_edit,
                 complete_state=stack_created or merge_result.complete,
+                previous_mapping=None if mapping_changed else stored_mapping,
             )
         else:
             _finalize_reconciled_mapping(
@@ -1373,42 +1809,141 @@ def reconciled_mapping_for_explicit_read(obj, element_type: str, bm):
     mapping, merge_result = _reconcile_existing_stack(
         mapping, mesh, bm, stack_layer, element_type
     )
+    return _commit_reconciled_stack(
+        settings, element_type, mesh, bm, mapping, merge_result
+    )
+
+
+def _commit_reconciled_stack(settings, element_type, mesh, bm, mapping, merge_result):
+    container = element_container(bm, element_type)
     mapping_changed = merge_result.changed
     mapping_changed |= prune_mapping_to_index_count(mapping, len(container))
     prepared_mapping, data_str = prepare_element_layers(mapping)
-    mapping = prepared_mapping
     _finalize_reconciled_mapping(
         settings,
         element_type,
         mesh,
         bm,
-        mapping,
+        prepared_mapping,
         data_str,
         merge_result,
         mapping_changed,
     )
-    return mapping
+    return prepared_mapping
+
 
+def synchronize_edit_mesh_annotations(obj):
+    """Begin committing topology-following ownership outside the draw callback.
 
-def synchronize_edit_mesh_annotations(obj, *, dirty_only=False):
-    """Commit topology-following ownership outside the viewport draw callback."""
+    Returns resumable stack inspections for the dirty types of ``obj``; see
+    :func:`continue_edit_mesh_reconciliation`. Types without a stack are
+    reconciled immediately because that only touches the sparse JSON mapping.
+    """
 
     if not obj or obj.type != "MESH" or obj.mode != "EDIT":
-        return
+        return []
+    mesh = obj.data
     if annotation_mesh_is_shared(obj):
-        mesh_uid = int(obj.data.session_uid)
+        mesh_uid = int(mesh.session_uid)
         for element_type in ELEMENT_TYPES:
             _BMESH_SYNC_DIRTY_AT.pop((mesh_uid, element_type), None)
-        return
-    bm = bmesh.from_edit_mesh(obj.data)
+        return []
+    bm = bmesh.from_edit_mesh(mesh)
+    jobs = []
     for element_type in ELEMENT_TYPES:
-        if (
-            dirty_only
-            and _bmesh_sync_key(obj.data, element_type) not in _BMESH_SYNC_DIRTY_AT
-        ):
+        key = _bmesh_sync_key(mesh, element_type)
+        if key not in _BMESH_SYNC_DIRTY_AT:
             continue
         ensure_lookup_tables(bm, element_type)
-        reconciled_mapping_for_explicit_read(obj, element_type, bm)
+        container = element_container(bm, element_type)
+        if container.layers.string.get(element_spec(element_type).stack_layer) is None:
+            reconciled_mapping_for_explicit_read(obj, element_type, bm)
+            continue
+        job = {
+            "object": obj,
+            "element_type": element_type,
+            "key": key,
+            "committed": False,
+        }
+        _restart_reconciliation(job, bm)
+        _BMESH_SYNC_IN_PROGRESS.add(key)
+        jobs.append(job)
+    return jobs
+
+
+def _restart_reconciliation(job, bm):
+    settings = job["object"].mesh_annotations
+    element_type = job["element_type"]
+    mapping = copy_element_layers(load_element_layers(settings, element_type))
+    job.update(
+        signature=_bmesh_topology_signature(bm),
+        generation=annotation_generation(settings, element_type),
+        dirty_at=_BMESH_SYNC_DIRTY_AT.get(job["key"]),
+        mapping=mapping,
+        mapped_keys={int(key): key for key in mapping},
+        position=0,
+        changed=False,
+        complete=True,
+    )
+
+
+def continue_edit_mesh_reconciliation(job, element_limit: int) -> int:
+    """Inspect up to ``element_limit`` elements of ``job``.
+
+    Returns how many elements were inspected, or ``-1`` once the job has
+    committed through :func:`_finalize_reconciled_mapping` or was abandoned.
+    Edits made between slices restart the inspection from the first element.
+    """
+
+    key = job["key"]
+    try:
+        obj = job["object"]
+        if obj.mode != "EDIT" or key not in _BMESH_SYNC_DIRTY_AT:
+            _BMESH_SYNC_IN_PROGRESS.discard(key)
+            return -1
+        mesh = obj.data
+        settings = obj.mesh_annotations
+    except ReferenceError:
+        _BMESH_SYNC_IN_PROGRESS.discard(key)
+        return -1
+    element_type = job["element_type"]
+    bm = bmesh.from_edit_mesh(mesh)
+    ensure_lookup_tables(bm, element_type)
+    container = element_container(bm, element_type)
+    stack_layer = container.layers.string.get(element_spec(element_type).stack_layer)
+    if (
+        stack_layer is None
+        or job["signature"] != _bmesh_topology_signature(bm)
+        or job["generation"] != annotation_generation(settings, element_type)
+        or job["dirty_at"] != _BMESH_SYNC_DIRTY_AT.get(key)
+    ):
+        if stack_layer is None:
+            _BMESH_SYNC_IN_PROGRESS.discard(key)
+            return -1
+        _restart_reconciliation(job, bm)
+    start = job["position"]
+    stop = min(len(container), start + max(1, int(element_limit)))
+    changed, complete = _merge_stack_elements(
+        job["mapping"],
+        job["mapped_keys"],
+        (container[index] for index in range(start, stop)),
+        stack_layer,
+    )
+    job["changed"] |= changed
+    job["complete"] &= complete
+    job["position"] = stop
+    if stop < len(container):
+        return stop - start
+    _BMESH_SYNC_IN_PROGRESS.discard(key)
+    merge_result = StackMergeResult(job["changed"], job["complete"], True)
+    if not merge_result.complete:
+        mark_bmesh_mapping_quarantined(mesh, bm, element_type)
+    _commit_reconciled_stack(
+        settings, element_type, mesh, bm, job["mapping"], merge_result
+    )
+    generation = annotation_generation(settings, element_type)
+    job["committed"] = generation != job["generation"]
+    return -1
 
 
 def select_elements_for_layer(obj: bpy.types.Object, element_type: str, layer_id: int) -> int:
@@ -1493,6 +2028,87 @@ def active_layer(settings, element_type: str):
     return None
 
 
+def _has_layers(settings) -> bool:
+    return any(
+        len(get_layer_collection(settings, element_type))
+        for element_type in ELEMENT_TYPES
+    )
+
+
+def refresh_annotated_objects():
+    """Rebuild the annotated-object registry from every Object in the file."""
+    global _annotated_object_census
+    _ANNOTATED_OBJECTS.clear()
+    objects = bpy.data.objects
+    for obj in objects:
+        if obj.type == "MESH" and _has_layers(obj.mesh_annotations):
+            _ANNOTATED_OBJECTS[int(obj.session_uid)] = obj.name_full
+    _annotated_object_census = len(objects)
+
+
+def forget_annotated_objects():
+    """Drop the registry; the next query rescans the file."""
+    global _annotated_object_census
+    _ANNOTATED_OBJECTS.clear()
+    _annotated_object_census = None
+
+
+def _annotated_object_census_changed() -> bool:
+    try:
+        return _annotated_object_census != len(bpy.data.objects)
+    except AttributeError:
+        # Restricted data access while the add-on registers.
+        return False
+
+
+def note_annotation_layers_changed(settings):
+    """Add or remove the owner of ``settings`` after its layers changed."""
+    owner = getattr(settings, "id_data", None)
+    if not isinstance(owner, bpy.types.Object):
+        return
+    if owner.type == "MESH" and _has_layers(settings):
+        _ANNOTATED_OBJECTS[int(owner.session_uid)] = owner.name_full
+    else:
+        _ANNOTATED_OBJECTS.pop(int(owner.session_uid), None)
+
+
+def has_annotated_objects() -> bool:
+    """Return whether any Object has layers; near free when none do."""
+    if _annotated_object_census_changed():
+        refresh_annotated_objects()
+    return bool(_ANNOTATED_OBJECTS)
+
+
+def is_annotated_object(obj) -> bool:
+    """Return whether ``obj`` has layers, registering layers found directly."""
+    if obj is None or obj.type != "MESH":
+        return False
+    if int(obj.session_uid) in _ANNOTATED_OBJECTS:
+        return True
+    if _has_layers(obj.mesh_annotations):
+        _ANNOTATED_OBJECTS[int(obj.session_uid)] = obj.name_full
+        return True
+    return False
+
+
+def annotated_objects() -> list:
+    """Return every registered Object, rescanning once if one was renamed."""
+    if _annotated_object_census_changed():
+        refresh_annotated_objects()
+    for attempt in range(2):
+        objects = []
+        for object_uid, name in _ANNOTATED_OBJECTS.items():
+            obj = bpy.data.objects.get(name)
+            if obj is None or int(obj.session_uid) != object_uid:
+                break
+            objects.append(obj)
+        else:
+            return objects
+        if attempt == 0:
+            refresh_annotated_objects()
+    return objects
+
+
 def create_layer(settings, element_type: str, name=None, color=None):
     owner = getattr(settings, "id_data", None)
     if isinstance(owner, bpy.types.Object) and owner.type == "MESH":
@@ -1503,7 +2119,7 @@ def create_layer(settings, element_type: str, name=None, color=None):
     layer_id = max(1, get_next_layer_id(settings, element_type))
     while layer_id in used_ids:
         layer_id += 1
-    if layer_id > _LAYER_ID_MAX:
+    if layer_id > LAYER_ID_MAX:
         raise StackEncodingError("Annotation layer id space is exhausted")
     existing_colors = [tuple(layer.color[:3]) for layer in collection]
     generated_color = color or auto_generate_color(
@@ -1513,10 +2129,11 @@ def create_layer(settings, element_type: str, name=None, color=None):
     layer.element_type = element_type
     next_id_attr = element_spec(element_type).next_id
     layer.layer_id = layer_id
-    setattr(settings, next_id_attr, min(_LAYER_ID_MAX, layer_id + 1))
+    setattr(settings, next_id_attr, min(LAYER_ID_MAX, layer_id + 1))
     layer.name = name or f"{meta.default_name} {layer.layer_id}"
     layer.color = generated_color
     set_active_index(settings, element_type, len(collection) - 1)
+    note_annotation_layers_changed(settings)
     return layer
 
 
@@ -1530,6 +2147,7 @@ def remove_layer(settings, obj, element_type: str, index: int):
     collection.remove(index)
     new_index = min(index, len(collection) - 1)
     set_active_index(settings, element_type, new_index)
+    note_annotation_layers_changed(settings)
 
 
 def collect_layer_usage_from_selection(obj, element_type: str):
@@ -1,19 +1,20 @@
 """User actions for creating, assigning, selecting, and clearing layers."""
 
+import os
+import time
+import tomllib
 from functools import wraps
+from pathlib import Path
 
 import bmesh
 import bpy
 
+from .codec import StackCapacityError, StackEncodingError, prepare_element_layers
 from .constants import EDGE, ELEMENT_TYPES, FACE, VERTEX, element_spec
 from .i18n import LocalizedDescription, tr
-from .loops import (
-    collect_edge_loop_edges,
-    collect_face_loop_faces,
-    collect_vertex_loop_vertices,
-)
 from .model import (
     active_layer,
+    annotated_objects,
     annotation_mesh_is_shared,
     apply_layer_order_to_mapping,
     assign_elements_to_layer,
@@ -29,7 +30,7 @@ from .model import (
     invalidate_element_layers_cache,
     load_element_layers,
     mark_face_layer_edges_as_seam,
-    prepare_element_layers,
+    note_annotation_layers_changed,
     rebuild_annotation_stacks,
     remove_layer,
     select_elements_for_layer,
@@ -38,10 +39,16 @@ from .model import (
     set_active_index,
     SharedMeshAnnotationError,
     StaleSharedAnnotationError,
-    StackCapacityError,
-    StackEncodingError,
 )
 from .overlay import tag_view3d_redraw
+from .profiling import (
+    clear_trace,
+    finish_profile_capture,
+    profile_capture_status,
+    profiled,
+    start_profile_capture,
+    trace_events,
+)
 
 
 _ELEMENT_TYPE_ITEMS = (
@@ -109,6 +116,13 @@ def annotation_write(method):
 
 
 def _collect_loop_indices(context, obj, element_type: str):
+    # Loop derivation loads on first use; see _DEFERRED_SUBMODULES.
+    from .loops import (
+        collect_edge_loop_edges,
+        collect_face_loop_faces,
+        collect_vertex_loop_vertices,
+    )
+
     settings = obj.mesh_annotations
     bm = bmesh.from_edit_mesh(obj.data)
     collector = {
@@ -144,6 +158,7 @@ def _create_assigned_layer(obj, element_type: str, element_indices):
             collection.remove(len(collection) - 1)
             setattr(settings, meta.next_id, previous_next_id)
             set_active_index(settings, element_type, previous_active_index)
+            note_annotation_layers_changed(settings)
 
 
 class MESH_OT_annotation_make_single_user(
@@ -258,6 +273,9 @@ class MESH_OT_annotation_make_single_user(
             previous_properties[meta.data_property] = getattr(
                 settings, meta.data_property
             )
+            previous_properties[meta.hash_property] = getattr(
+                settings, meta.hash_property
+            )
             previous_properties[meta.state_property] = getattr(
                 settings, meta.state_property
             )
@@ -318,6 +336,120 @@ class MESH_OT_annotation_toggle_overlay(
         return {"FINISHED"}
 
 
+class MESH_OT_annotation_clear_timings(
+    LocalizedDescription, _MeshPoll, bpy.types.Operator
+):
+    bl_idname = "mesh.annotation_clear_timings"
+    bl_label = "Clear Annotation Timings"
+    bl_options = {"INTERNAL"}
+    tooltip_key = "Discard the recorded overlay stage timings."
+
+    def execute(self, context):
+        clear_trace()
+        for area in context.screen.areas if context.screen else ():
+            if area.type == "VIEW_3D":
+                area.tag_redraw()
+        return {"FINISHED"}
+
+
+def _addon_version() -> str:
+    package_dir = Path(__file__).resolve().parent
+    # Built extensions ship the manifest in the package; checkouts keep it above.
+    for manifest in (
+        package_dir / "blender_manifest.toml",
+        package_dir.parent / "blender_manifest.toml",
+    ):
+        try:
+            with manifest.open("rb") as manifest_file:
+                return str(tomllib.load(manifest_file).get("version", ""))
+        except (OSError, tomllib.TOMLDecodeError):
+            continue
+    return ""
+
+
+def _profile_description():
+    """Describe the scene so captures can be compared across releases."""
+    lines = [
+        f"Blender {bpy.app.version_string}",
+        f"Mesh Annotation Layers {_addon_version() or 'unknown'}",
+        f"File {bpy.data.filepath or '(unsaved)'}",
+    ]
+    mappings = {
+        event["object"]: event for event in trace_events("source_mapping")
+    }
+    for obj in annotated_objects():
+        mesh = obj.data
+        lines.append(
+            f"Object {obj.name} ({obj.mode}): {len(mesh.vertices)} vertices, "
+            f"{len(mesh.edges)} edges, {len(mesh.polygons)} faces"
+        )
+        modifiers = [
+            f"{modifier.type} {modifier.name!r}"
+            + ("" if modifier.show_viewport else " (viewport off)")
+            for modifier in obj.modifiers
+        ]
+        lines.append(f"  Modifiers: {', '.join(modifiers) or 'none'}")
+        mapping = mappings.get(obj.name)
+        lines.append(
+            f"  Mapping: {mapping['detail']} ({mapping['count']} evaluated elements)"
+            if mapping
+            else "  Mapping: not built during this session"
+        )
+    return lines
+
+
+class MESH_OT_annotation_capture_profile(
+    LocalizedDescription, _MeshPoll, bpy.types.Operator
+):
+    bl_idname = "mesh.annotation_capture_profile"
+    bl_label = "Capture Annotation Profile"
+    bl_options = {"INTERNAL"}
+    tooltip_key = (
+        "Profile the next overlay draws, depsgraph updates, topology syncs, "
+        "and annotation operators, then save the profile next to the .blend file. "
+        "Run again to stop early."
+    )
+
+    calls: bpy.props.IntProperty(
+        name="Calls",
+        description="Number of hooked calls to profile",
+        min=1,
+        max=100_000,
+        default=200,
+    )
+
+    def execute(self, context):
+        if profile_capture_status() is not None:
+            result = finish_profile_capture()
+            if "error" in result:
+                self.report(
+                    {"ERROR"},
+                    tr("Could not write the profile: {error}", error=result["error"]),
+                )
+                return {"CANCELLED"}
+            self.report(
+                {"INFO"}, tr("Profile saved to {path}", path=result["paths"][1])
+            )
+            return {"FINISHED"}
+        if bpy.data.filepath:
+            directory = os.path.dirname(bpy.data.filepath)
+            stem = Path(bpy.data.filepath).stem
+        else:
+            directory = bpy.app.tempdir
+            stem = "untitled"
+        path = os.path.join(
+            directory,
+            f"{stem}_annotation_profile_{time.strftime('%Y%m%d-%H%M%S')}",
+        )
+        start_profile_capture(path, self.calls, _profile_description)
+        self.report(
+            {"INFO"},
+            tr("Profiling the next {count} annotation calls", count=self.calls),
+        )
+        tag_view3d_redraw(context, invalidate_cache=False)
+        return {"FINISHED"}
+
+
 class MESH_OT_annotation_toggle_solo(
     LocalizedDescription, _MeshPoll, bpy.types.Operator
 ):
@@ -470,7 +602,7 @@ class MESH_OT_annotation_assign_active(
         if not assign_elements_to_layer(obj, self.element_type, layer.layer_id):
             self.report({"WARNING"}, tr('Select at least one element'))
             return {"CANCELLED"}
-        tag_view3d_redraw(context)
+        tag_view3d_redraw(context, invalidate_cache=False)
         return {"FINISHED"}
 
 
@@ -581,7 +713,7 @@ class MESH_OT_annotation_assign_loop(
             obj, self.element_type, layer.layer_id, element_indices=indices
         ):
             return {"CANCELLED"}
-        tag_view3d_redraw(context)
+        tag_view3d_redraw(context, invalidate_cache=False)
         return {"FINISHED"}
 
 
@@ -615,7 +747,7 @@ class MESH_OT_annotation_assign_valence(
             self.report({"WARNING"}, tr('Failed to assign vertices'))
             return {"CANCELLED"}
         self.report({"INFO"}, tr("Annotated {count} vertices", count=len(target_indices)))
-        tag_view3d_redraw(context)
+        tag_view3d_redraw(context, invalidate_cache=False)
         return {"FINISHED"}
 
 
@@ -717,7 +849,7 @@ class MESH_OT_annotation_assign_layer(
                 if candidate.layer_id == layer.layer_id:
                     set_active_index(settings, self.element_type, index)
                     break
-        tag_view3d_redraw(context)
+        tag_view3d_redraw(context, invalidate_cache=False)
         return {"FINISHED"}
 
 
@@ -832,7 +964,7 @@ class MESH_OT_annotation_clear_selected(
             only_selected=True,
             mode=self.mode,
         )
-        tag_view3d_redraw(context)
+        tag_view3d_redraw(context, invalidate_cache=False)
         return {"FINISHED"}
 
 
@@ -889,6 +1021,8 @@ class MESH_OT_annotation_enter_edit_mode(
 CLASSES = (
     MESH_OT_annotation_make_single_user,
     MESH_OT_annotation_toggle_overlay,
+    MESH_OT_annotation_clear_timings,
+    MESH_OT_annotation_capture_profile,
     MESH_OT_annotation_toggle_solo,
     MESH_OT_annotation_toggle_layer_visibility,
     MESH_OT_annotation_layer_add,
@@ -908,3 +1042,41 @@ CLASSES = (
     MESH_OT_annotation_set_element_type,
     MESH_OT_annotation_enter_edit_mode,
 )
+
+
+def _profiled_execute(name, execute):
+    hooked = profiled(name)(execute)
+
+    @wraps(execute)
+    def profiled_execute(self, context):
+        return hooked(self, context)
+
+    return profiled_execute
+
+
+def _profiled_invoke(name, invoke):
+    hooked = profiled(name)(invoke)
+
+    @wraps(invoke)
+    def profiled_invoke(self, context, event):
+        return hooked(self, context, event)
+
+    return profiled_invoke
+
+
+def _hook_profile_captures(classes):
+    """Let profile captures see every annotation operator but the capture one.
+
+    Blender checks the argument count of operator methods, so the wrappers
+    spell out each signature.
+    """
+    for cls in classes:
+        if cls is MESH_OT_annotation_capture_profile:
+            continue
+        if "execute" in vars(cls):
+            cls.execute = _profiled_execute(cls.bl_idname, vars(cls)["execute"])
+        if "invoke" in vars(cls):
+            cls.invoke = _profiled_invoke(cls.bl_idname, vars(cls)["invoke"])
+
+
+_hook_profile_captures(CLASSES)
@@ -1,7 +1,8 @@
 """GPU overlay batching, caching, drawing, and lifecycle."""
 
+import hashlib
 import time
-from collections import OrderedDict, defaultdict
+from collections import Counter, OrderedDict, defaultdict
 
 import bmesh
 import bpy
@@ -10,40 +11,115 @@ from bpy.app.handlers import persistent
 from gpu_extras.batch import batch_for_shader
 from mathutils import Vector
 
+from .caches import BudgetedCache, set_cache_budget
 from .constants import EDGE, ELEMENT_TYPES, FACE, VERTEX, element_spec
-from .evaluated_geometry import (
-    evaluated_overlay_geometry,
-    ordered_edge_chains,
-    trim_edge_chain,
-)
+from .edge_chains import ordered_edge_chains, trim_edge_chain
+from .i18n import addon_preferences
 from .model import (
     active_layer,
+    annotated_objects,
+    annotation_changes_since,
+    annotation_generation,
     annotation_mesh_is_shared,
+    bmesh_mapping_is_dirty,
+    classify_edit_mesh_update,
+    consume_annotation_self_updates,
+    continue_edit_mesh_reconciliation,
     debug_log,
+    discard_annotation_state_chunks,
     element_container,
+    element_layers_digest,
     ensure_lookup_tables,
+    forget_annotated_objects,
     get_layer_collection,
+    has_annotated_objects,
     invalidate_element_layers_cache,
+    is_annotated_object,
     layer_order_map,
     load_element_layers,
     mark_bmesh_mapping_dirty,
     merge_stack_layer_if_needed,
+    mesh_content_digest,
+    mesh_geometry_signature,
     pending_bmesh_sync_delay,
+    refresh_annotated_objects,
+    reset_annotation_history_state,
     shared_annotation_mapping_is_current,
     synchronize_edit_mesh_annotations,
 )
+from .profiling import (
+    configure_slow_log,
+    count_operation,
+    profiled,
+    record_stage,
+    trace_stage,
+)
 
 
+_OVERLAY_CACHE_LIMIT = 8
+_OVERLAY_INSTANCE_LIMIT = 64
+# Estimated resident bytes per batch vertex (GPU buffers plus bookkeeping)
+# and per geometry record vector (a mathutils.Vector inside a tuple).
+_OVERLAY_BATCH_VERTEX_BYTES = 32
+_OVERLAY_GEOMETRY_VECTOR_BYTES = 80
+_MEGABYTE = 1024 * 1024
 _draw_handle = None
-_overlay_batch_cache = OrderedDict()
-_overlay_geometry_cache = OrderedDict()
+_overlay_batch_cache = BudgetedCache(
+    "overlay_batches",
+    budget_bytes=16 * _MEGABYTE,
+    entry_limit=_OVERLAY_INSTANCE_LIMIT,
+    distinct_limit=_OVERLAY_CACHE_LIMIT,
+)
+_overlay_geometry_cache = BudgetedCache(
+    "overlay_geometry",
+    budget_bytes=40 * _MEGABYTE,
+    entry_limit=_OVERLAY_INSTANCE_LIMIT,
+    distinct_limit=_OVERLAY_CACHE_LIMIT,
+)
+_overlay_recency = OrderedDict()
+_overlay_view_states = OrderedDict()
 _overlay_refresh_timer_pending = False
 _topology_sync_timer_pending = False
+_topology_sync_jobs = []
+_history_signatures = {}
+_modifier_states = OrderedDict()
+_overlay_dependents = defaultdict(set)
+_modifier_property_plans = {}
+# Running seconds and count of GPU batch uploads; builds report the difference.
+_upload_totals = [0.0, 0]
 _surface_shader = None
 _surface_shader_failed = False
-_OVERLAY_CACHE_LIMIT = 8
-_OVERLAY_GEOMETRY_VECTOR_LIMIT = 500_000
-_OVERLAY_BATCH_VERTEX_LIMIT = 500_000
+_SHADER_PRECOMPILE_DELAY = 0.5
+_OVERLAY_DEPENDENT_LIMIT = 1024
+_DIGEST_MASK = (1 << 64) - 1
+_LOD_MIN_VERTICES = 30_000
+_LOD_DENSITY = 2.0
+_LOD_IDLE_SECONDS = 0.3
+# Coarse point tiers keep about one point per this many pixels of the smallest
+# footprint at which _use_lod_tier still draws the full tier.
+_LOD_POINT_PIXELS = 4.0
+_TOPOLOGY_SYNC_SLICE_ELEMENTS = 65_536
+_prewarm_queue = OrderedDict()
+_prewarm_timer_pending = False
+_prewarm_recent_active = OrderedDict()
+_prewarm_selection_signature = None
+_last_input_at = 0.0
+_last_operator_marker = 0
+_PREWARM_IDLE_SECONDS = 0.5
+_PREWARM_SLICE_SECONDS = 0.005
+_PREWARM_CHUNK_ELEMENTS = 4096
+_PREWARM_CPU_SHARE = 0.25
+_PREWARM_RECENT_LIMIT = 4
+
+
+class _OverlayBatches(dict):
+    """Per-type batch entries plus the ownership state needed to patch them."""
+
+    __slots__ = ("ownership",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ownership = None
 
 
 def _id_key(value: bpy.types.ID) -> int:
@@ -54,6 +130,16 @@ def _id_key(value: bpy.types.ID) -> int:
     return int(value.as_pointer())
 
 
+def _precompile_surface_shader():
+    """Compile the surface shader on a timer instead of the first overlay frame."""
+    global _surface_shader_failed
+    if _surface_shader is None and not _surface_shader_failed:
+        _get_surface_shader()
+        # A timer may run without a drawing context; let the first draw retry.
+        _surface_shader_failed = False
+    return None
+
+
 def _get_surface_shader():
     """Return a local-space surface shader, falling back on unsupported GPUs."""
     global _surface_shader, _surface_shader_failed
@@ -96,6 +182,8 @@ def _get_surface_shader():
 def invalidate_overlay_cache(obj=None, invalidate_geometry=True):
     if obj is None:
         _overlay_batch_cache.clear()
+        _overlay_dependents.clear()
+        _overlay_recency.clear()
         if invalidate_geometry:
             _overlay_geometry_cache.clear()
         return
@@ -107,6 +195,9 @@ def invalidate_overlay_cache(obj=None, invalidate_geometry=True):
 
 def invalidate_overlay_state():
     """Discard every derived value that may outlive Blender mesh history."""
+    _history_signatures.clear()
+    _topology_sync_jobs.clear()
+    _modifier_states.clear()
     invalidate_overlay_cache()
     invalidate_element_layers_cache()
 
@@ -143,23 +234,50 @@ def _edit_mesh_objects():
     return objects
 
 
+@profiled("topology_sync_timer")
 def _topology_sync_timer():
     global _topology_sync_timer_pending
     delay = pending_bmesh_sync_delay()
     if delay > 0.0:
         return max(0.01, delay)
-    _topology_sync_timer_pending = False
-    for obj in _edit_mesh_objects():
+    if not _topology_sync_jobs:
+        for obj in _edit_mesh_objects():
+            try:
+                _topology_sync_jobs.extend(synchronize_edit_mesh_annotations(obj))
+            except Exception as exc:
+                debug_log(
+                    getattr(obj, "mesh_annotations", None),
+                    f"Topology synchronization deferred after error: {exc}",
+                )
+    # Large meshes are inspected in bounded slices; the overlay keeps drawing
+    # the last committed mapping until each job finishes.
+    remaining = _TOPOLOGY_SYNC_SLICE_ELEMENTS
+    committed = False
+    while _topology_sync_jobs and remaining > 0:
+        job = _topology_sync_jobs[0]
         try:
-            synchronize_edit_mesh_annotations(obj, dirty_only=True)
+            with trace_stage("reconcile", job["object"].name, "SLICE") as stage:
+                inspected = continue_edit_mesh_reconciliation(job, remaining)
+                stage.count = max(0, inspected)
         except Exception as exc:
             debug_log(
-                getattr(obj, "mesh_annotations", None),
+                getattr(job["object"], "mesh_annotations", None),
                 f"Topology synchronization deferred after error: {exc}",
             )
+            inspected = -1
+        if inspected >= 0:
+            remaining -= inspected
+            continue
+        committed |= job["committed"]
+        _topology_sync_jobs.pop(0)
     # Geometry invalidation is handled by the dependency update itself. Only
-    # rebuild ownership-dependent GPU batches once editing has gone quiet.
-    invalidate_overlay_cache(invalidate_geometry=False)
+    # rebuild ownership-dependent GPU batches once reconciliation actually
+    # moved ownership.
+    if committed:
+        invalidate_overlay_cache(invalidate_geometry=False)
+    if _topology_sync_jobs:
+        return 0.01
+    _topology_sync_timer_pending = False
     tag_view3d_redraw(invalidate_cache=False)
     return None
 
@@ -175,6 +293,261 @@ def _schedule_topology_sync():
     )
 
 
+def _note_user_input():
+    """Hold idle prewarming back until the user has been quiet for a moment."""
+    global _last_input_at
+    _last_input_at = time.perf_counter()
+
+
+def _queue_prewarm(obj, stage, urgent=False):
+    """Queue ``obj`` for idle work; GEOMETRY also decodes its annotations."""
+    cache_key = _id_key(obj)
+    job = _prewarm_queue.get(cache_key)
+    if job is None:
+        job = _prewarm_queue[cache_key] = {
+            "name": obj.name_full,
+            "stage": stage,
+            "decode": list(ELEMENT_TYPES),
+            "bm": None,
+        }
+        _reset_prewarm_job(job)
+    elif stage == "GEOMETRY":
+        job["stage"] = stage
+    _prewarm_queue.move_to_end(cache_key, last=not urgent)
+    _schedule_prewarm()
+
+
+def _schedule_prewarm():
+    global _prewarm_timer_pending
+    if _prewarm_timer_pending or not _prewarm_queue:
+        return
+    _prewarm_timer_pending = True
+    bpy.app.timers.register(_prewarm_timer, first_interval=_PREWARM_IDLE_SECONDS)
+
+
+def _queue_selection_prewarm(context):
+    """Prebuild geometry for newly selected and recently active objects."""
+    global _prewarm_selection_signature
+    view_layer = getattr(context, "view_layer", None)
+    if view_layer is None:
+        return
+    active = view_layer.objects.active
+    selected = view_layer.objects.selected
+    signature = (_id_key(active) if active else 0, len(selected))
+    if signature == _prewarm_selection_signature:
+        return
+    _prewarm_selection_signature = signature
+    if active is not None and active.type == "MESH":
+        _prewarm_recent_active[_id_key(active)] = active.name_full
+        _prewarm_recent_active.move_to_end(_id_key(active))
+        while len(_prewarm_recent_active) > _PREWARM_RECENT_LIMIT:
+            _prewarm_recent_active.popitem(last=False)
+    candidates = list(selected[:_OVERLAY_CACHE_LIMIT])
+    for name in reversed(_prewarm_recent_active.values()):
+        obj = bpy.data.objects.get(name)
+        if obj is not None:
+            candidates.append(obj)
+    for obj in candidates:
+        if (
+            is_annotated_object(obj)
+            and obj.mode != "EDIT"
+            and _id_key(obj) not in _overlay_geometry_cache
+        ):
+            _queue_prewarm(obj, "GEOMETRY", urgent=True)
+
+
+def _reset_prewarm_job(job):
+    """Drop the partial geometry of ``job``; decoded annotations stay cached."""
+    if job["bm"] is not None:
+        job["bm"].free()
+    job.update(
+        bm=None,
+        started_at=0.0,
+        signature=None,
+        source_filters=None,
+        missing=None,
+        plan=None,
+        positions={},
+        records={},
+        extract_seconds=0.0,
+    )
+
+
+def _continue_prewarm(obj, job, element_limit):
+    """Run one bounded step of ``job``; return -1 once the job is finished.
+
+    Each step decodes one element type, maps the surface, or extracts at most
+    ``element_limit`` evaluated elements; the cursor lives in ``job``.
+    """
+    settings = obj.mesh_annotations
+    if job["decode"]:
+        element_type = job["decode"].pop(0)
+        if get_layer_collection(settings, element_type):
+            load_element_layers(settings, element_type)
+        return 1
+    if job["stage"] != "GEOMETRY" or obj.mode == "EDIT" or not settings.enable_overlay:
+        return -1
+    if job["bm"] is None:
+        return _start_prewarm_geometry(obj, job)
+    if job["plan"] is None:
+        return _plan_prewarm_geometry(obj, job)
+    if _evaluated_surface_signature(obj) != job["signature"]:
+        _reset_prewarm_job(job)
+        return 0
+    # Geometry mapping loads on first use; see _DEFERRED_SUBMODULES.
+    from .evaluated_geometry import extract_planned_geometry
+
+    plan = job["plan"]
+    for element_type, count in plan["counts"].items():
+        position = job["positions"].get(element_type, 0)
+        if position >= count:
+            continue
+        stop = min(count, position + element_limit)
+        started = time.perf_counter()
+        records = extract_planned_geometry(obj, plan, element_type, position, stop)
+        job["extract_seconds"] += time.perf_counter() - started
+        if records is None:
+            _reset_prewarm_job(job)
+            return 0
+        job["records"].setdefault(element_type, []).extend(records)
+        job["positions"][element_type] = stop
+        return stop - position
+    _finish_prewarm_geometry(obj, job)
+    return -1
+
+
+def _start_prewarm_geometry(obj, job):
+    settings = obj.mesh_annotations
+    # Only CPU-side geometry is prepared here; GPU batches are still uploaded
+    # by the first draw, which then finds the evaluated records cached.
+    job["bm"] = bm = bmesh.new()
+    job["started_at"] = time.perf_counter()
+    bm.from_mesh(obj.data)
+    for element_type in ELEMENT_TYPES:
+        ensure_lookup_tables(bm, element_type)
+    bm.normal_update()
+    ownership, source_filters = _overlay_ownership(obj, settings, bm)
+    if not source_filters:
+        _reset_prewarm_job(job)
+        return -1
+    params = _batch_parameters(obj, settings)
+    filter_digests, _outlines = _overlay_geometry_filters(
+        obj, bm, params, ownership, source_filters
+    )
+    cached = _overlay_geometry_entry(obj)
+    job["signature"] = cached["signature"]
+    job["source_filters"] = source_filters
+    job["missing"] = _missing_overlay_sources(cached, source_filters, filter_digests)
+    if not job["missing"]:
+        _store_overlay_geometry(obj, cached, source_filters)
+        _reset_prewarm_job(job)
+        return -1
+    return len(bm.verts) + len(bm.edges) + len(bm.faces)
+
+
+def _plan_prewarm_geometry(obj, job):
+    # Geometry mapping loads on first use; see _DEFERRED_SUBMODULES.
+    from .evaluated_geometry import evaluated_source_plan
+
+    started = time.perf_counter()
+    plan = evaluated_source_plan(obj, job["bm"], job["missing"])
+    job["extract_seconds"] += time.perf_counter() - started
+    if plan is None:
+        # Without an evaluated mesh the edit cage is read in one pass.
+        _local_overlay_geometry(
+            obj, job["bm"], obj.mesh_annotations, job["source_filters"]
+        )
+        _reset_prewarm_job(job)
+        return -1
+    job["plan"] = plan
+    return sum(plan["counts"].values())
+
+
+def _finish_prewarm_geometry(obj, job):
+    cached = _overlay_geometry_entry(obj)
+    if cached["signature"] == job["signature"]:
+        # A draw may have extended the entry meanwhile; only uncovered
+        # sources are merged, and a vertex filter it already built is kept.
+        current = _missing_overlay_sources(cached, job["source_filters"])
+        for element_type, indices in job["missing"].items():
+            if element_type in current:
+                _merge_overlay_records(
+                    cached,
+                    element_type,
+                    indices,
+                    job["records"].get(element_type, ()),
+                )
+        cached["extract_seconds"] += job["extract_seconds"]
+        _store_overlay_geometry(obj, cached, job["source_filters"])
+    _reset_prewarm_job(job)
+
+
+def _poll_operator_input():
+    """Count a newly registered operator as input.
+
+    The operator history is capped, so its length stops changing once it is
+    full; the identity of the newest entry changes with every registration.
+    """
+    global _last_operator_marker
+    _operator_id, marker = _last_operator_id()
+    if marker != _last_operator_marker:
+        _last_operator_marker = marker
+        _note_user_input()
+
+
+def _prewarm_timer():
+    """Work through the prewarm queue in short slices while the user is idle."""
+    global _prewarm_timer_pending
+    if not _prewarm_queue:
+        _prewarm_timer_pending = False
+        return None
+    _poll_operator_input()
+    idle_for = time.perf_counter() - _last_input_at
+    if idle_for < _PREWARM_IDLE_SECONDS:
+        return _PREWARM_IDLE_SECONDS - idle_for
+    started = time.perf_counter()
+    while (
+        _prewarm_queue
+        and _last_input_at < started
+        and time.perf_counter() - started < _PREWARM_SLICE_SECONDS
+    ):
+        cache_key, job = next(iter(_prewarm_queue.items()))
+        obj = bpy.data.objects.get(job["name"])
+        if obj is None or obj.type != "MESH" or _id_key(obj) != cache_key:
+            _reset_prewarm_job(_prewarm_queue.pop(cache_key))
+            continue
+        if job["bm"] is not None and _last_input_at > job["started_at"]:
+            # The mesh may have changed since this job copied and mapped it.
+            _reset_prewarm_job(job)
+        try:
+            inspected = _continue_prewarm(obj, job, _PREWARM_CHUNK_ELEMENTS)
+        except Exception as exc:
+            debug_log(
+                getattr(obj, "mesh_annotations", None),
+                f"Overlay prewarm skipped after error: {exc}",
+            )
+            inspected = -1
+        if inspected < 0:
+            _reset_prewarm_job(_prewarm_queue.pop(cache_key))
+    if not _prewarm_queue:
+        _prewarm_timer_pending = False
+        return None
+    # Sleep long enough that prewarming stays within its share of one core.
+    elapsed = time.perf_counter() - started
+    return max(0.01, elapsed * (1.0 - _PREWARM_CPU_SHARE) / _PREWARM_CPU_SHARE)
+
+
+def _cancel_prewarm():
+    global _prewarm_timer_pending, _prewarm_selection_signature
+    _cancel_timer(_prewarm_timer)
+    _prewarm_timer_pending = False
+    for job in _prewarm_queue.values():
+        _reset_prewarm_job(job)
+    _prewarm_queue.clear()
+    _prewarm_recent_active.clear()
+    _prewarm_selection_signature = None
+
+
 def tag_view3d_redraw(
     context=None,
     invalidate_cache=True,
@@ -208,19 +581,104 @@ def tag_surface_offset_redraw(context=None):
     )
 
 
+def _history_signature(obj: bpy.types.Object):
+    """Describe every input of a self-contained Object Mode overlay entry."""
+    return (
+        _id_key(obj.data),
+        _annotation_content_key(obj.mesh_annotations),
+        _modifier_state_signature(obj),
+        mesh_content_digest(obj.data),
+        tuple(round(float(value), 9) for row in obj.matrix_world for value in row),
+    )
+
+
+def _history_candidates():
+    objects = {}
+    for cache_key, cached in _overlay_batch_cache.items():
+        if cached["dirty"] or len(cached["dependency_keys"]) > 2:
+            continue
+        objects[cache_key] = None
+    if not objects:
+        return {}
+    for obj in bpy.data.objects:
+        cache_key = _id_key(obj)
+        if (
+            cache_key in objects
+            and obj.type == "MESH"
+            and obj.mode == "OBJECT"
+            # Weights and attributes are not part of the signature.
+            and not _weight_paint_can_deform_overlay(obj)
+            and not any(modifier.type == "NODES" for modifier in obj.modifiers)
+        ):
+            objects[cache_key] = obj
+    return {key: obj for key, obj in objects.items() if obj is not None}
+
+
 @persistent
 def annotation_history_pre(*_args):
     """Never let a batch from the abandoned history state reach the viewport."""
-    invalidate_overlay_state()
+    global _history_signatures
+    _topology_sync_jobs.clear()
+    if not _overlay_batch_cache:
+        _history_signatures = {}
+        return
+    try:
+        _history_signatures = {
+            cache_key: _history_signature(obj)
+            for cache_key, obj in _history_candidates().items()
+        }
+    except (AttributeError, ReferenceError, RuntimeError):
+        _history_signatures = {}
+
+
+def _retain_history_entries():
+    """Keep overlay entries whose Object the history step left untouched."""
+    global _history_signatures
+    signatures, _history_signatures = _history_signatures, {}
+    retained = set()
+    if signatures:
+        try:
+            for cache_key, obj in _history_candidates().items():
+                if signatures.get(cache_key) == _history_signature(obj):
+                    retained.add(cache_key)
+                    cached = _overlay_batch_cache[cache_key]
+                    cached["generations"] = {
+                        element_type: annotation_generation(
+                            obj.mesh_annotations, element_type
+                        )
+                        for element_type in ELEMENT_TYPES
+                    }
+                    ownership = getattr(cached["batches"], "ownership", None) or {}
+                    for element_type, state in ownership.items():
+                        state["generation"] = cached["generations"][element_type]
+        except (AttributeError, ReferenceError, RuntimeError):
+            retained.clear()
+    for cache_key in tuple(_overlay_batch_cache):
+        if cache_key not in retained:
+            _overlay_batch_cache.pop(cache_key, None)
+            _overlay_recency.pop(cache_key, None)
+    for cache_key in tuple(_overlay_geometry_cache):
+        if cache_key not in retained:
+            _overlay_geometry_cache.pop(cache_key, None)
+    return retained
 
 
 @persistent
 def annotation_history_post(*_args):
     """Force annotation ownership to be read from the restored BMesh layers."""
-    invalidate_overlay_state()
+    _topology_sync_jobs.clear()
+    _modifier_states.clear()
+    # History can restore or drop layers on any Object.
+    refresh_annotated_objects()
+    if not has_annotated_objects():
+        invalidate_overlay_cache()
+        return
+    reset_annotation_history_state()
+    _retain_history_entries()
     edit_objects = _edit_mesh_objects()
     for obj in edit_objects:
-        mark_bmesh_mapping_dirty(obj.data)
+        # History restores every custom-data layer, whatever the counts say.
+        mark_bmesh_mapping_dirty(obj.data, ELEMENT_TYPES)
     if edit_objects:
         _schedule_topology_sync()
     tag_view3d_redraw(invalidate_cache=False)
@@ -234,61 +692,219 @@ def annotation_load_pre(*_args):
     _cancel_timer(_topology_sync_timer)
     _overlay_refresh_timer_pending = False
     _topology_sync_timer_pending = False
+    _cancel_prewarm()
+    forget_annotated_objects()
     invalidate_overlay_state()
 
 
-def _modifier_state_signature(obj: bpy.types.Object):
-    signature = []
-    supported_types = {"BOOLEAN", "INT", "FLOAT", "ENUM", "STRING", "POINTER"}
-    for modifier in obj.modifiers:
-        values = []
-        for prop in modifier.bl_rna.properties:
-            if (
-                prop.identifier == "rna_type"
-                or prop.is_readonly
-                or prop.type not in supported_types
-            ):
-                continue
-            try:
-                value = getattr(modifier, prop.identifier)
-                if prop.is_array:
-                    value = tuple(round(float(item), 9) for item in value)
-                elif prop.type == "POINTER":
-                    value = _id_key(value) if value is not None else 0
-                elif prop.type == "FLOAT":
-                    value = round(float(value), 9)
-                elif prop.type in {"BOOLEAN", "INT"}:
-                    value = int(value)
-                else:
-                    value = str(value)
-                values.append((prop.identifier, value))
-            except (AttributeError, TypeError, ValueError, RuntimeError):
-                continue
-        signature.append((modifier.type, tuple(values)))
-    return tuple(signature)
+def configure_trace_log(preferences=None):
+    """Apply the slow-stage log preferences; relative paths follow the file."""
+    if preferences is None:
+        preferences = addon_preferences()
+    path = getattr(preferences, "trace_log_path", "")
+    configure_slow_log(
+        bpy.path.abspath(path) if path else "",
+        getattr(preferences, "trace_slow_threshold", 0.0),
+    )
 
 
-def _dependency_keys(obj: bpy.types.Object):
-    """Collect Blender IDs whose updates may change this object's evaluated surface."""
-    keys = {_id_key(obj), _id_key(obj.data)}
-    for modifier in obj.modifiers:
-        for prop in modifier.bl_rna.properties:
-            if prop.identifier == "rna_type" or prop.type != "POINTER":
-                continue
-            try:
-                value = getattr(modifier, prop.identifier)
-            except (AttributeError, ReferenceError, RuntimeError):
-                continue
-            if value is None or not isinstance(value, bpy.types.ID):
-                continue
-            try:
-                keys.add(_id_key(value))
+def configure_cache_budgets(preferences=None):
+    """Apply the cache memory budgets (in MB) from the add-on preferences."""
+    if preferences is None:
+        preferences = addon_preferences()
+    set_cache_budget(
+        "overlay_batches",
+        getattr(preferences, "overlay_batch_budget", 16) * _MEGABYTE,
+    )
+    set_cache_budget(
+        "overlay_geometry",
+        getattr(preferences, "overlay_geometry_budget", 40) * _MEGABYTE,
+    )
+    annotation_budget = getattr(preferences, "annotation_cache_budget", 20) * _MEGABYTE
+    set_cache_budget("annotations", annotation_budget)
+    set_cache_budget("decoded_annotations", annotation_budget)
+
+
+@persistent
+def annotation_load_post(*_args):
+    """Queue every annotated mesh for decoding once the file settles."""
+    context = bpy.context
+    configure_trace_log()
+    configure_cache_budgets()
+    _note_user_input()
+    refresh_annotated_objects()
+    for obj in annotated_objects():
+        _queue_prewarm(obj, "DECODE")
+    _queue_selection_prewarm(context)
+
+
+def _modifier_property_plan(modifier):
+    """Return ``(identifier, type, is_array, signed)`` for each relevant property.
+
+    Plans are built once per modifier RNA type so signatures read values
+    without walking ``bl_rna.properties`` again. Unsigned entries are
+    read-only pointers that only contribute dependency keys.
+    """
+    rna = modifier.bl_rna
+    plan = _modifier_property_plans.get(rna.identifier)
+    if plan is None:
+        supported_types = {"BOOLEAN", "INT", "FLOAT", "ENUM", "STRING", "POINTER"}
+        plan = tuple(
+            (
+                prop.identifier,
+                prop.type,
+                bool(prop.is_array),
+                not prop.is_readonly and prop.type in supported_types,
+            )
+            for prop in rna.properties
+            if prop.identifier != "rna_type"
+            and (
+                prop.type == "POINTER"
+                or not prop.is_readonly and prop.type in supported_types
+            )
+        )
+        _modifier_property_plans[rna.identifier] = plan
+    return plan
+
+
+def _modifier_values(modifier, dependency_keys):
+    values = []
+    for identifier, prop_type, is_array, signed in _modifier_property_plan(modifier):
+        try:
+            value = getattr(modifier, identifier)
+            if prop_type == "POINTER" and isinstance(value, bpy.types.ID):
+                dependency_keys.add(_id_key(value))
                 value_data = getattr(value, "data", None)
                 if isinstance(value_data, bpy.types.ID):
-                    keys.add(_id_key(value_data))
-            except (ReferenceError, RuntimeError):
+                    dependency_keys.add(_id_key(value_data))
+            if not signed:
                 continue
-    return frozenset(keys)
+            if is_array:
+                value = tuple(round(float(item), 9) for item in value)
+            elif prop_type == "POINTER":
+                value = _id_key(value) if value is not None else 0
+            elif prop_type == "FLOAT":
+                value = round(float(value), 9)
+            elif prop_type in {"BOOLEAN", "INT"}:
+                value = int(value)
+            else:
+                value = str(value)
+            values.append((identifier, value))
+        except (AttributeError, ReferenceError, TypeError, ValueError, RuntimeError):
+            continue
+    return modifier.type, tuple(values)
+
+
+def _modifier_state(obj: bpy.types.Object):
+    """Return the cached ``(signature, dependency keys)`` of the modifier stack.
+
+    Entries are dropped by the depsgraph handler when the object itself is
+    reported updated; adding, removing, or reordering modifiers is caught by
+    the stack layout kept with each entry.
+    """
+    cache_key = _id_key(obj)
+    layout = tuple(modifier.name for modifier in obj.modifiers)
+    state = _modifier_states.get(cache_key)
+    if state is not None and state["layout"] == layout:
+        _modifier_states.move_to_end(cache_key)
+        return state["signature"], state["dependency_keys"]
+    dependency_keys = {cache_key, _id_key(obj.data)}
+    modifiers = tuple(
+        _modifier_values(modifier, dependency_keys) for modifier in obj.modifiers
+    )
+    state = {
+        "layout": layout,
+        "modifiers": modifiers,
+        # A session-local hash keeps cache comparisons O(1).
+        "signature": hash(modifiers),
+        "dependency_keys": frozenset(dependency_keys),
+    }
+    _modifier_states[cache_key] = state
+    _modifier_states.move_to_end(cache_key)
+    while len(_modifier_states) > _OVERLAY_INSTANCE_LIMIT:
+        _modifier_states.popitem(last=False)
+    return state["signature"], state["dependency_keys"]
+
+
+def _discard_stale_modifier_states(depsgraph):
+    """Forget the signatures of objects whose evaluated geometry was updated.
+
+    Driven or keyed modifier values and geometry-nodes inputs can change in
+    the same step as a mesh edit, so every geometry update of the object
+    recomputes its signature, whatever else the step updated.
+    """
+    if not _modifier_states:
+        return
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        update_id, update_key = _updated_id_key(update)
+        if isinstance(update_id, bpy.types.Object):
+            _modifier_states.pop(update_key, None)
+
+
+def _modifier_state_signature(obj: bpy.types.Object):
+    return _modifier_state(obj)[0]
+
+
+def _evaluated_surface_signature(obj: bpy.types.Object, modifier_signature=None):
+    """Identify the evaluated surface independently of the interaction mode.
+
+    Modifier settings do not change with the mode, but which modifiers run
+    does. Evaluated element counts additionally separate modifiers that skip
+    Edit Mode or use a different Multires level while sculpting.
+    """
+    if modifier_signature is None:
+        modifier_signature = _modifier_state_signature(obj)
+    edit_mode = obj.mode == "EDIT"
+    mode_visibility = tuple(
+        bool(modifier.show_viewport)
+        and (not edit_mode or bool(modifier.show_in_editmode))
+        for modifier in obj.modifiers
+    )
+    try:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        evaluated_mesh = obj.evaluated_get(depsgraph).data
+        evaluated_counts = (
+            len(evaluated_mesh.vertices),
+            len(evaluated_mesh.edges),
+            len(evaluated_mesh.polygons),
+        )
+    except (AttributeError, ReferenceError, RuntimeError):
+        evaluated_counts = obj.mode
+    return _id_key(obj.data), modifier_signature, mode_visibility, evaluated_counts
+
+
+def _dependency_keys(obj: bpy.types.Object):
+    """Collect Blender IDs whose updates may change this object's evaluated surface."""
+    return _modifier_state(obj)[1]
+
+
+def _last_operator_id():
+    """Return ``(bl_idname, marker)`` of the newest registered operator.
+
+    The marker identifies the history entry, so a later script, bmesh, or
+    unregistered edit reports the same marker as the operator before it.
+    """
+    window_manager = getattr(bpy.context, "window_manager", None)
+    operators = getattr(window_manager, "operators", None)
+    try:
+        if not operators:
+            return "", 0
+        operator = operators[-1]
+        return operator.bl_idname, operator.as_pointer()
+    except (AttributeError, IndexError, ReferenceError):
+        return "", 0
+
+
+def _modal_operator_ids():
+    """Return the running modal operators; Blender 4.2+ lists them per window."""
+    window_manager = getattr(bpy.context, "window_manager", None)
+    return tuple(
+        operator.bl_idname
+        for window in getattr(window_manager, "windows", ())
+        for operator in getattr(window, "modal_operators", ())
+    )
 
 
 def _updated_id_key(update):
@@ -299,6 +915,57 @@ def _updated_id_key(update):
         return update_id, None
 
 
+def _is_annotation_storage_update(update, update_id, update_key, self_updates, matches):
+    """Return whether ``update`` is only the depsgraph echo of an annotation flush.
+
+    ``matches`` memoizes the signature comparison per Mesh within one pass.
+    """
+    mesh = update_id
+    if update_key not in self_updates:
+        if update.is_updated_transform or not isinstance(update_id, bpy.types.Object):
+            return False
+        mesh = getattr(update_id, "data", None)
+        if not isinstance(mesh, bpy.types.Mesh):
+            return False
+    try:
+        mesh_key = _id_key(mesh)
+        if mesh_key not in self_updates:
+            return False
+        matched = matches.get(mesh_key)
+        if matched is None:
+            matched = matches[mesh_key] = (
+                mesh_geometry_signature(mesh) == self_updates[mesh_key]
+            )
+        return matched
+    except (AttributeError, ReferenceError, RuntimeError):
+        return False
+
+
+def _updated_mesh(update_id):
+    """Return the Mesh an update rewrote, directly or through its Object."""
+    mesh = getattr(update_id, "data", update_id)
+    return mesh if isinstance(mesh, bpy.types.Mesh) else None
+
+
+def _discard_updated_mesh_states(depsgraph, self_updates):
+    """Forget the state chunks and proofs of every Mesh the step rewrote.
+
+    Only the depsgraph echoes of annotation flushes keep theirs.
+    """
+    self_update_matches = {}
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        update_id, update_key = _updated_id_key(update)
+        if self_updates and _is_annotation_storage_update(
+            update, update_id, update_key, self_updates, self_update_matches
+        ):
+            continue
+        mesh = _updated_mesh(update_id)
+        if mesh is not None:
+            discard_annotation_state_chunks(mesh)
+
+
 def _linear_metric_signature(matrix):
     linear = matrix.to_3x3()
     metric = linear.transposed() @ linear
@@ -321,9 +988,27 @@ def _paint_mode_is_geometry_neutral(obj: bpy.types.Object) -> bool:
 
 
 @persistent
+@profiled("depsgraph_update_post")
 def annotation_depsgraph_update_post(_scene, depsgraph):
-    active_obj = getattr(bpy.context, "object", None)
+    _note_user_input()
+    self_updates = consume_annotation_self_updates()
+    if not has_annotated_objects():
+        _modifier_states.clear()
+        return
     edit_mesh_objects = _edit_mesh_objects()
+    if not _overlay_batch_cache and not any(
+        is_annotated_object(obj) for obj in edit_mesh_objects
+    ):
+        # Nothing is drawn or reconciled; drop signatures that could go stale.
+        # Operators still trust state chunks and shared proofs, so rewritten
+        # meshes discard theirs here too.
+        _modifier_states.clear()
+        _discard_updated_mesh_states(depsgraph, self_updates)
+        _queue_selection_prewarm(bpy.context)
+        return
+    _queue_selection_prewarm(bpy.context)
+    _discard_stale_modifier_states(depsgraph)
+    active_obj = getattr(bpy.context, "object", None)
     active_cache = (
         _overlay_batch_cache.get(_id_key(active_obj))
         if active_obj and active_obj.type == "MESH"
@@ -335,18 +1020,61 @@ def annotation_depsgraph_update_post(_scene, depsgraph):
         and active_cache is not None
         and _paint_mode_is_geometry_neutral(active_obj)
     )
+    mode_transition = bool(
+        active_cache is not None and active_obj.mode != active_cache["source_mode"]
+    )
     modifier_state_matches = None
     relevant_updates = []
     annotation_storage_updated = False
+    edit_update_kinds = {}
+    last_operator = None
+    modal_operators = ()
+    self_update_matches = {}
     for update in depsgraph.updates:
         if not (update.is_updated_geometry or update.is_updated_transform):
             continue
         update_id, update_key = _updated_id_key(update)
+        if self_updates and _is_annotation_storage_update(
+            update, update_id, update_key, self_updates, self_update_matches
+        ):
+            # Operators publish their own change sets; the overlay patches the
+            # affected layers instead of discarding geometry for a string write.
+            continue
         if update.is_updated_geometry:
+            update_kind = "TOPOLOGY"
             for edit_obj in edit_mesh_objects:
-                if update_id == edit_obj or update_id == edit_obj.data:
+                if not (update_id == edit_obj or update_id == edit_obj.data):
+                    continue
+                edit_key = _id_key(edit_obj)
+                update_kind = edit_update_kinds.get(edit_key)
+                if update_kind is None:
+                    if last_operator is None:
+                        last_operator = _last_operator_id()
+                        modal_operators = _modal_operator_ids()
+                    update_kind = classify_edit_mesh_update(
+                        edit_obj.data, *last_operator, modal_operators
+                    )
+                    edit_update_kinds[edit_key] = update_kind
+                # Pending reconciliation keeps waiting for the edit to settle.
+                if update_kind == "TOPOLOGY" or bmesh_mapping_is_dirty(edit_obj.data):
                     mark_bmesh_mapping_dirty(edit_obj.data)
                     annotation_storage_updated = True
+            if update_kind == "TOPOLOGY":
+                updated_mesh = _updated_mesh(update_id)
+                if updated_mesh is not None:
+                    # Also advances the Mesh's geometry generation.
+                    discard_annotation_state_chunks(updated_mesh)
+            elif update_kind == "SELECTION" and not update.is_updated_transform:
+                # Selection cannot move the evaluated surface or its owners.
+                continue
+        if (
+            mode_transition
+            and not update.is_updated_transform
+            and (update_id == active_obj or update_id == active_obj.data)
+        ):
+            # Entering or leaving a mode rewrites the same mesh; the next draw
+            # compares evaluated surface signatures before reusing the cache.
+            continue
         if preserve_paint_cache:
             if update_id == active_obj.data:
                 # Paint data updates mark Mesh transform/geometry even though
@@ -372,10 +1100,18 @@ def annotation_depsgraph_update_post(_scene, depsgraph):
         _schedule_topology_sync()
     if not relevant_updates:
         return
-    for cache_key, cached in _overlay_batch_cache.items():
+    updates_by_entry = defaultdict(list)
+    for update in relevant_updates:
+        for cache_key in _overlay_dependents.get(update[0], ()):
+            updates_by_entry[cache_key].append(update)
+    for cache_key, candidate_updates in updates_by_entry.items():
+        cached = _overlay_batch_cache.get(cache_key)
+        if cached is None:
+            continue
+        # The index may still list keys from an entry's previous build.
         matched_updates = [
             update
-            for update in relevant_updates
+            for update in candidate_updates
             if update[0] in cached["dependency_keys"]
         ]
         if not matched_updates:
@@ -434,51 +1170,189 @@ def get_viewport_size():
     return 1920.0, 1080.0
 
 
-def _source_filters_signature(source_filters):
-    return tuple(
-        (element_type, tuple(sorted(indices)))
-        for element_type, indices in sorted(source_filters.items())
-    )
+def _mix_index(value):
+    """Spread one element index over 64 bits for order-independent set digests."""
+    value = (int(value) + 0x9E3779B97F4A7C15) & _DIGEST_MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _DIGEST_MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _DIGEST_MASK
+    return value ^ (value >> 31)
+
+
+def _index_set_digest(indices):
+    return len(indices), sum(map(_mix_index, indices)) & _DIGEST_MASK
+
+
+def _patch_index_set_digest(digest, added=(), removed=()):
+    count, total = digest
+    for index in added:
+        count += 1
+        total += _mix_index(index)
+    for index in removed:
+        count -= 1
+        total -= _mix_index(index)
+    return count, total & _DIGEST_MASK
 
 
-def _local_overlay_geometry(obj, bm, settings, source_filters):
+def _geometry_record_weight(element_type, record):
+    if element_type == FACE:
+        return 1 + sum(len(triangle) for triangle in record[1])
+    if element_type == EDGE:
+        return 4
+    return 2
+
+
+def _extend_overlay_geometry(obj, bm, settings, cached, missing):
+    # Geometry mapping loads on first use; see _DEFERRED_SUBMODULES.
+    from .evaluated_geometry import evaluated_overlay_geometry
+
+    extracted = evaluated_overlay_geometry(obj, bm, settings, missing)
+    for element_type, indices in missing.items():
+        _merge_overlay_records(cached, element_type, indices, extracted[element_type])
+
+
+def _merge_overlay_records(cached, element_type, indices, records):
+    grouped = cached["geometry"][element_type]
+    covered = cached["covered"][element_type]
+    if element_type == VERTEX:
+        # Vertex records are resolved competitively among the requested
+        # sources, so a changed filter replaces the whole group.
+        cached["vector_weight"] -= 2 * sum(len(group) for group in grouped.values())
+        grouped.clear()
+        covered.clear()
+        digest = _index_set_digest(indices)
+    else:
+        digest = _patch_index_set_digest(
+            cached["digests"][element_type],
+            added=(index for index in indices if index not in covered),
+        )
+    for record in records:
+        if element_type != VERTEX and record[0] in covered:
+            continue
+        grouped.setdefault(record[0], []).append(record)
+        cached["vector_weight"] += _geometry_record_weight(element_type, record)
+    covered.update(indices)
+    cached["digests"][element_type] = digest
+
+
+def _prune_overlay_geometry(cached, source_filters):
+    """Drop records for sources that are no longer drawn."""
+    for element_type in ELEMENT_TYPES:
+        needed = source_filters.get(element_type, ())
+        grouped = cached["geometry"][element_type]
+        for source_index in [index for index in grouped if index not in needed]:
+            cached["vector_weight"] -= sum(
+                _geometry_record_weight(element_type, record)
+                for record in grouped.pop(source_index)
+            )
+        cached["covered"][element_type].intersection_update(needed)
+        cached["digests"][element_type] = _index_set_digest(
+            cached["covered"][element_type]
+        )
+
+
+def _overlay_geometry_entry(obj):
+    """Return the geometry cache entry for the current evaluated surface."""
     cache_key = _id_key(obj)
-    signature = (
-        _id_key(obj.data),
-        obj.mode,
-        _source_filters_signature(source_filters),
-    )
+    signature = _evaluated_surface_signature(obj)
     cached = _overlay_geometry_cache.get(cache_key)
-    if cached is not None and cached["signature"] == signature:
-        _overlay_geometry_cache.move_to_end(cache_key)
-        return cached["geometry"]
-    geometry = evaluated_overlay_geometry(obj, bm, settings, source_filters)
-    vector_weight = (
-        sum(
-            1 + sum(len(triangle) for triangle in triangles)
-            for _source_index, triangles, _normal in geometry[FACE]
-        )
-        + len(geometry[EDGE]) * 4
-        + len(geometry[VERTEX]) * 2
+    if cached is None or cached["signature"] != signature:
+        cached = {
+            "signature": signature,
+            "geometry": {element_type: {} for element_type in ELEMENT_TYPES},
+            "covered": {element_type: set() for element_type in ELEMENT_TYPES},
+            "digests": {element_type: (0, 0) for element_type in ELEMENT_TYPES},
+            "face_edges": None,
+            "vector_weight": 0,
+            "extract_seconds": 0.0,
+        }
+        _overlay_geometry_cache[cache_key] = cached
+    return cached
+
+
+def _face_edge_table(cached, obj, bm=None):
+    """Return the source edge indices of every source face, built once per entry."""
+    if cached["face_edges"] is None:
+        if bm is not None:
+            ensure_lookup_tables(bm, FACE)
+            cached["face_edges"] = tuple(
+                tuple(edge.index for edge in face.edges) for face in bm.faces
+            )
+        else:
+            mesh = obj.data
+            loops = mesh.loops
+            cached["face_edges"] = tuple(
+                tuple(loops[loop_index].edge_index for loop_index in polygon.loop_indices)
+                for polygon in mesh.polygons
+            )
+    return cached["face_edges"]
+
+
+def _face_outline_edges(face_indices, face_edges):
+    """Return edges used by exactly one face of the set: its outline and borders."""
+    counts = Counter(
+        edge_index
+        for face_index in face_indices
+        if 0 <= face_index < len(face_edges)
+        for edge_index in face_edges[face_index]
     )
-    if vector_weight > _OVERLAY_GEOMETRY_VECTOR_LIMIT:
+    return {edge_index for edge_index, count in counts.items() if count == 1}
+
+
+def _local_overlay_geometry(obj, bm, settings, source_filters, filter_digests=None):
+    """Return per-source geometry records, extracting only uncovered sources.
+
+    Records stay grouped by source index so a later annotation change can look
+    up the geometry of one element without scanning the whole extraction.
+    """
+    cached = _overlay_geometry_entry(obj)
+    missing = _missing_overlay_sources(cached, source_filters, filter_digests)
+    _overlay_geometry_cache.note(not missing)
+    if missing:
+        started = time.perf_counter()
+        _extend_overlay_geometry(obj, bm, settings, cached, missing)
+        cached["extract_seconds"] += time.perf_counter() - started
+    _store_overlay_geometry(obj, cached, source_filters)
+    return cached["geometry"]
+
+
+def _missing_overlay_sources(cached, source_filters, filter_digests=None):
+    filter_digests = filter_digests or {}
+    missing = {}
+    for element_type, indices in source_filters.items():
+        digest = filter_digests.get(element_type) or _index_set_digest(indices)
+        if digest == cached["digests"][element_type]:
+            continue
+        if element_type == VERTEX:
+            missing[element_type] = set(indices)
+            continue
+        covered = cached["covered"][element_type]
+        uncovered = {index for index in indices if index not in covered}
+        if uncovered:
+            missing[element_type] = uncovered
+    return missing
+
+
+def _store_overlay_geometry(obj, cached, source_filters):
+    """Account ``cached`` in the geometry cache, pruning it to fit the budget."""
+    cache_key = _id_key(obj)
+    budget = _overlay_geometry_cache.budget_bytes
+    if budget and _geometry_bytes(cached) > budget:
+        _prune_overlay_geometry(cached, source_filters)
+    if budget and _geometry_bytes(cached) > budget:
         _overlay_geometry_cache.pop(cache_key, None)
-        return geometry
-    _overlay_geometry_cache[cache_key] = {
-        "signature": signature,
-        "geometry": geometry,
-        "vector_weight": vector_weight,
-    }
-    _overlay_geometry_cache.move_to_end(cache_key)
-    while (
-        len(_overlay_geometry_cache) > _OVERLAY_CACHE_LIMIT
-        or sum(
-            entry["vector_weight"] for entry in _overlay_geometry_cache.values()
-        )
-        > _OVERLAY_GEOMETRY_VECTOR_LIMIT
-    ):
-        _overlay_geometry_cache.popitem(last=False)
-    return geometry
+        return
+    # Linked duplicates may alias one entry; the cache counts it once.
+    _overlay_geometry_cache.store(
+        cache_key,
+        cached,
+        nbytes=_geometry_bytes(cached),
+        cost=cached["extract_seconds"],
+        owner=obj.name,
+    )
+
+
+def _geometry_bytes(cached):
+    return cached["vector_weight"] * _OVERLAY_GEOMETRY_VECTOR_BYTES
 
 
 def _local_offset_direction(normal_local, normal_matrix, inverse_linear):
@@ -495,66 +1369,471 @@ def _local_offset_direction(normal_local, normal_matrix, inverse_linear):
     return inverse_linear @ world_normal
 
 
-def build_overlay_batches(obj: bpy.types.Object, settings):
-    mesh = obj.data
-    source_is_edit = obj.mode == "EDIT"
-    if source_is_edit:
-        bm = bmesh.from_edit_mesh(mesh)
-    else:
-        bm = bmesh.new()
-        bm.from_mesh(mesh)
+def _overlay_layer_view(settings, element_type):
+    """Return visible layer ids, draw order, and a signature covering both."""
+    collection = get_layer_collection(settings, element_type)
+    visible_layers = {layer.layer_id for layer in collection if layer.is_visible}
+    if visible_layers and settings.solo_active:
+        current = active_layer(settings, element_type)
+        if current and current.layer_id in visible_layers:
+            visible_layers = {current.layer_id}
+        elif current:
+            debug_log(
+                settings,
+                f"Solo active requested but layer {current.layer_id} "
+                f"hidden for {element_type}",
+            )
+            visible_layers = set()
+    order_lookup = layer_order_map(settings, element_type)
+    signature = (
+        tuple(layer.layer_id for layer in collection),
+        frozenset(visible_layers),
+    )
+    return visible_layers, order_lookup, signature
+
+
+def _top_visible_layer(layers, visible_layers, order_lookup):
+    if len(layers) == 1:
+        candidate = layers[0]
+        return candidate if candidate in visible_layers else None
+    return max(
+        (layer_id for layer_id in layers if layer_id in visible_layers),
+        key=lambda layer_id: order_lookup.get(layer_id, -1),
+        default=None,
+    )
+
+
+def _ownership_state(generation, layer_signature, top_layers, *, suppressed=False):
+    """Describe which layer draws each element so batches can be patched."""
+    members = defaultdict(set)
+    for element_index, layer_id in top_layers.items():
+        members[layer_id].add(element_index)
+    return {
+        "generation": generation,
+        "layer_signature": layer_signature,
+        "suppressed": suppressed,
+        "top_layers": top_layers,
+        "members": dict(members),
+        "digest": _index_set_digest(top_layers),
+    }
+
+
+def _outline_layer_batch(layer_id, outline_edges, geometry, params):
+    """Draw a face layer's boundary edges as an edge-pipeline entry."""
+    entry = _layer_batch(
+        EDGE,
+        layer_id,
+        outline_edges,
+        geometry[EDGE],
+        dict(params, edge_trim=0.0),
+    )
+    if entry is not None:
+        entry["outline"] = True
+    return entry
+
+
+def _batch_parameters(obj, settings):
+    matrix = obj.matrix_world
     try:
-        for element_type in ELEMENT_TYPES:
-            ensure_lookup_tables(bm, element_type)
-        bm.normal_update()
-        shared_mesh = annotation_mesh_is_shared(obj)
-        results = {etype: [] for etype in ELEMENT_TYPES}
-        layer_states = {}
-        source_filters = {}
-        for element_type in ELEMENT_TYPES:
-            collection = get_layer_collection(settings, element_type)
-            if not collection:
-                continue
-            container = element_container(bm, element_type)
-            meta = element_spec(element_type)
-            stack_layer = container.layers.string.get(meta.stack_layer)
-            mapping = load_element_layers(settings, element_type)
-            if shared_mesh:
-                if not shared_annotation_mapping_is_current(
-                    obj, element_type, bm, mapping
-                ):
-                    debug_log(
-                        settings,
-                        f"Suppressed stale shared {element_type} annotations",
+        inverse_linear = matrix.to_3x3().inverted()
+        normal_matrix = inverse_linear.transposed()
+    except ValueError:
+        inverse_linear = None
+        normal_matrix = matrix.to_3x3()
+    return {
+        "matrix": matrix,
+        "inverse_linear": inverse_linear,
+        "normal_matrix": normal_matrix,
+        "edge_trim": settings.overlay_edge_trim,
+        "face_offset": settings.overlay_face_offset,
+        "edge_offset": settings.overlay_edge_offset,
+        "vertex_offset": settings.overlay_vertex_offset,
+        "face_display": settings.overlay_face_display,
+    }
+
+
+def _full_layer_batch(element_type, layer_id, indices, records_by_index, params):
+    """Build the draw entry for one layer from its grouped source records."""
+    matrix = params["matrix"]
+    inverse_linear = params["inverse_linear"]
+    normal_matrix = params["normal_matrix"]
+    coordinates = []
+    if element_type == FACE:
+        surface_shader = _get_surface_shader()
+        directions = []
+        face_offset = params["face_offset"]
+        for source_index in indices:
+            for _source, triangles_local, normal_local in records_by_index.get(source_index, ()):
+                if surface_shader is not None:
+                    offset_direction = _local_offset_direction(
+                        normal_local,
+                        normal_matrix,
+                        inverse_linear,
+                    )
+                    for triangle in triangles_local:
+                        coordinates.extend(triangle)
+                        directions.extend((offset_direction,) * 3)
+                else:
+                    normal = (
+                        (normal_matrix @ normal_local).normalized()
+                        if normal_local.length
+                        else Vector((0.0, 0.0, 1.0))
+                    )
+                    offset = normal * face_offset
+                    for triangle in triangles_local:
+                        coordinates.extend(
+                            matrix @ coordinate + offset
+                            for coordinate in triangle
+                        )
+        if not coordinates:
+            return None
+        shader = surface_shader or gpu.shader.from_builtin("UNIFORM_COLOR")
+        attributes = {"pos": coordinates}
+        if surface_shader is not None:
+            attributes["offsetDirection"] = directions
+        return {
+            "kind": (
+                "surface_triangles"
+                if surface_shader is not None
+                else "triangles"
+            ),
+            "batch": _upload_batch(shader, "TRIS", attributes),
+            "shader": shader,
+            "layer_id": layer_id,
+            "vertex_count": len(coordinates),
+            "coordinate_space": (
+                "LOCAL" if surface_shader is not None else "WORLD"
+            ),
+        }
+    if element_type == EDGE:
+        edge_trim = params["edge_trim"]
+        edge_offset = params["edge_offset"]
+        if edge_trim >= 0.0:
+            # The common path does not care about descendant ordering.
+            # Append directly instead of building one tiny graph per edge.
+            for source_index in indices:
+                for (
+                    _source,
+                    p0_local,
+                    p1_local,
+                    normal0_local,
+                    normal1_local,
+                ) in records_by_index.get(source_index, ()):
+                    if edge_offset:
+                        offset0 = _local_offset_direction(
+                            normal0_local,
+                            normal_matrix,
+                            inverse_linear,
+                        ) * edge_offset
+                        offset1 = _local_offset_direction(
+                            normal1_local,
+                            normal_matrix,
+                            inverse_linear,
+                        ) * edge_offset
+                    else:
+                        offset0 = offset1 = Vector((0.0, 0.0, 0.0))
+                    coordinates.extend(
+                        (
+                            p0_local + offset0,
+                            p1_local + offset1,
+                        )
+                    )
+        else:
+            for source_index in indices:
+                records = [
+                    record[1:]
+                    for record in records_by_index.get(source_index, ())
+                ]
+                for chain in ordered_edge_chains(records):
+                    segments = []
+                    for p0_local, p1_local, normal0_local, normal1_local in chain:
+                        normal0_world = normal_matrix @ normal0_local
+                        normal1_world = normal_matrix @ normal1_local
+                        if normal0_world.length == 0:
+                            normal0_world = Vector((0.0, 0.0, 1.0))
+                        if normal1_world.length == 0:
+                            normal1_world = Vector((0.0, 0.0, 1.0))
+                        normal0_world.normalize()
+                        normal1_world.normalize()
+                        segments.append(
+                            (
+                                matrix @ p0_local + normal0_world * edge_offset,
+                                matrix @ p1_local + normal1_world * edge_offset,
+                            )
+                        )
+                    segments = trim_edge_chain(segments, -edge_trim)
+                    coordinates.extend(
+                        coordinate
+                        for segment in segments
+                        for coordinate in segment
+                    )
+        if not coordinates:
+            return None
+        shader = gpu.shader.from_builtin("POLYLINE_UNIFORM_COLOR")
+        return {
+            "kind": "edge_segments",
+            "batch": _upload_batch(shader, "LINES", {"pos": coordinates}),
+            "shader": shader,
+            "segment_count": len(coordinates) // 2,
+            "layer_id": layer_id,
+            "vertex_count": len(coordinates),
+            "coordinate_space": (
+                "LOCAL" if edge_trim >= 0.0 else "WORLD"
+            ),
+        }
+    surface_shader = _get_surface_shader()
+    directions = []
+    vertex_offset = params["vertex_offset"]
+    for source_index in indices:
+        for _source, coordinate_local, normal_local in records_by_index.get(source_index, ()):
+            if surface_shader is not None:
+                coordinates.append(coordinate_local)
+                directions.append(
+                    _local_offset_direction(
+                        normal_local,
+                        normal_matrix,
+                        inverse_linear,
                     )
-                    continue
-            elif stack_layer is not None:
-                mapping, _merge_result = merge_stack_layer_if_needed(
-                    mapping,
-                    mesh,
-                    bm,
-                    stack_layer,
-                    element_type,
-                    defer=True,
                 )
-            visible_layers = {layer.layer_id: layer for layer in collection if layer.is_visible}
-            if not visible_layers:
+            else:
+                normal = (
+                    (normal_matrix @ normal_local).normalized()
+                    if normal_local.length
+                    else Vector((0.0, 0.0, 1.0))
+                )
+                coordinates.append(matrix @ coordinate_local + normal * vertex_offset)
+    if not coordinates:
+        return None
+    shader = surface_shader or gpu.shader.from_builtin("POINT_UNIFORM_COLOR")
+    attributes = {"pos": coordinates}
+    if surface_shader is not None:
+        attributes["offsetDirection"] = directions
+    return {
+        "kind": (
+            "surface_points"
+            if surface_shader is not None
+            else "points"
+        ),
+        "batch": _upload_batch(shader, "POINTS", attributes),
+        "shader": shader,
+        "layer_id": layer_id,
+        "vertex_count": len(coordinates),
+        "coordinate_space": (
+            "LOCAL" if surface_shader is not None else "WORLD"
+        ),
+    }
+
+
+def _layer_batch(element_type, layer_id, indices, records_by_index, params):
+    """Build a layer entry and, for dense layers, its coarse LOD tier."""
+    entry = _full_layer_batch(element_type, layer_id, indices, records_by_index, params)
+    if entry is not None and entry["vertex_count"] >= _LOD_MIN_VERTICES:
+        lod = _lod_layer_batch(element_type, indices, records_by_index, params, entry)
+        if lod is not None:
+            entry["lod"] = lod
+    return entry
+
+
+def _lod_layer_batch(element_type, indices, records_by_index, params, entry):
+    """Build a cheaper stand-in drawn while the layer is far away and moving.
+
+    Faces become border fans per source face, vertices keep one point per
+    cell of a grid sized for the screen footprint, and edges keep one thin
+    line per descendant chain.
+    """
+    from .evaluated_geometry import coarse_patch_triangles
+
+    matrix = params["matrix"]
+    inverse_linear = params["inverse_linear"]
+    normal_matrix = params["normal_matrix"]
+    coordinates = []
+    directions = []
+    surface = entry["coordinate_space"] == "LOCAL"
+    if element_type == FACE:
+        for source_index in indices:
+            records = records_by_index.get(source_index, ())
+            if not records:
                 continue
-            if settings.solo_active:
-                current = active_layer(settings, element_type)
-                if current and current.layer_id in visible_layers:
-                    visible_layers = {current.layer_id: current}
-                elif current:
-                    debug_log(
-                        settings,
-                        f"Solo active requested but layer {current.layer_id} "
-                        f"hidden for {element_type}",
+            normal_local = sum(
+                (record[2] for record in records), Vector((0.0, 0.0, 0.0))
+            )
+            patch = [triangle for record in records for triangle in record[1]]
+            triangles = coarse_patch_triangles(patch, normal=normal_local) or patch
+            if surface:
+                offset_direction = _local_offset_direction(
+                    normal_local, normal_matrix, inverse_linear
+                )
+                for triangle in triangles:
+                    coordinates.extend(triangle)
+                    directions.extend((offset_direction,) * 3)
+            else:
+                normal = (
+                    (normal_matrix @ normal_local).normalized()
+                    if normal_local.length
+                    else Vector((0.0, 0.0, 1.0))
+                )
+                offset = normal * params["face_offset"]
+                for triangle in triangles:
+                    coordinates.extend(
+                        matrix @ coordinate + offset for coordinate in triangle
+                    )
+        primitive = "TRIS"
+    elif element_type == EDGE:
+        edge_offset = params["edge_offset"]
+        for source_index in indices:
+            records = [record[1:] for record in records_by_index.get(source_index, ())]
+            for chain in ordered_edge_chains(records):
+                p0_local, _p1, normal0_local, _n1 = chain[0]
+                _p0, p1_local, _n0, normal1_local = chain[-1]
+                offset0 = _local_offset_direction(
+                    normal0_local, normal_matrix, inverse_linear
+                ) * edge_offset
+                offset1 = _local_offset_direction(
+                    normal1_local, normal_matrix, inverse_linear
+                ) * edge_offset
+                if surface:
+                    coordinates.extend((p0_local + offset0, p1_local + offset1))
+                else:
+                    coordinates.extend(
+                        (
+                            matrix @ (p0_local + offset0),
+                            matrix @ (p1_local + offset1),
+                        )
                     )
-                    visible_layers = {}
-            if not visible_layers:
+        primitive = "LINES"
+    else:
+        target = int(entry["vertex_count"] / (_LOD_DENSITY * _LOD_POINT_PIXELS))
+        for _source, coordinate_local, normal_local in _thinned_point_records(
+            indices, records_by_index, max(1, target)
+        ):
+            if surface:
+                coordinates.append(coordinate_local)
+                directions.append(
+                    _local_offset_direction(normal_local, normal_matrix, inverse_linear)
+                )
+            else:
+                normal = (
+                    (normal_matrix @ normal_local).normalized()
+                    if normal_local.length
+                    else Vector((0.0, 0.0, 1.0))
+                )
+                coordinates.append(
+                    matrix @ coordinate_local + normal * params["vertex_offset"]
+                )
+        primitive = "POINTS"
+    if not coordinates:
+        return None
+    if element_type == EDGE:
+        # Thin lines skip the polyline geometry shader entirely.
+        shader = gpu.shader.from_builtin("UNIFORM_COLOR")
+        kind = "edge_lines"
+    else:
+        if len(coordinates) * 4 > entry["vertex_count"] * 3:
+            return None
+        shader = entry["shader"]
+        kind = entry["kind"]
+    attributes = {"pos": coordinates}
+    if directions and kind in {"surface_triangles", "surface_points"}:
+        attributes["offsetDirection"] = directions
+    return {
+        "kind": kind,
+        "batch": _upload_batch(shader, primitive, attributes),
+        "shader": shader,
+        "layer_id": entry["layer_id"],
+        "vertex_count": len(coordinates),
+        "coordinate_space": entry["coordinate_space"],
+    }
+
+
+def _thinned_point_records(indices, records_by_index, target):
+    """Keep the first vertex record in each cell of a grid of about ``target`` cells.
+
+    The cell size spreads ``target`` cells over half the surface area of the
+    records' bounding box, which approximates the area of a closed surface.
+    """
+    records = [
+        record
+        for source_index in indices
+        for record in records_by_index.get(source_index, ())
+    ]
+    if len(records) <= target:
+        return records
+    lows = [min(record[1][axis] for record in records) for axis in range(3)]
+    extents = [
+        max(record[1][axis] for record in records) - lows[axis] for axis in range(3)
+    ]
+    area = (
+        extents[0] * extents[1] + extents[1] * extents[2] + extents[2] * extents[0]
+    )
+    if area <= 0.0:
+        return records[:: -(-len(records) // target)]
+    cell = (area / target) ** 0.5
+    kept = {}
+    for record in records:
+        coordinate = record[1]
+        kept.setdefault(
+            tuple(int((coordinate[axis] - lows[axis]) // cell) for axis in range(3)),
+            record,
+        )
+    return list(kept.values())
+
+
+def _overlay_ownership(obj, settings, bm):
+    """Resolve each type's top visible layer per element and the drawn sources."""
+    shared_mesh = annotation_mesh_is_shared(obj)
+    ownership = {}
+    source_filters = {}
+    for element_type in ELEMENT_TYPES:
+        generation = annotation_generation(settings, element_type)
+        collection = get_layer_collection(settings, element_type)
+        if not collection:
+            ownership[element_type] = _ownership_state(
+                generation,
+                _overlay_layer_view(settings, element_type)[2],
+                {},
+            )
+            continue
+        container = element_container(bm, element_type)
+        meta = element_spec(element_type)
+        stack_layer = container.layers.string.get(meta.stack_layer)
+        with trace_stage("load", obj.name, element_type) as stage:
+            mapping = load_element_layers(settings, element_type)
+            stage.count = len(mapping)
+        if shared_mesh:
+            if not shared_annotation_mapping_is_current(
+                obj, element_type, bm, mapping
+            ):
+                debug_log(
+                    settings,
+                    f"Suppressed stale shared {element_type} annotations",
+                )
+                ownership[element_type] = _ownership_state(
+                    generation, None, {}, suppressed=True
+                )
                 continue
-            order_lookup = layer_order_map(settings, element_type)
-            top_layers = {}
+        elif stack_layer is not None:
+            started = time.perf_counter()
+            mapping, merge_result = merge_stack_layer_if_needed(
+                mapping,
+                obj.data,
+                bm,
+                stack_layer,
+                element_type,
+                defer=True,
+            )
+            if merge_result.inspected:
+                record_stage(
+                    "reconcile",
+                    time.perf_counter() - started,
+                    len(container),
+                    obj.name,
+                    element_type,
+                )
+        visible_layers, order_lookup, layer_signature = _overlay_layer_view(
+            settings, element_type
+        )
+        top_layers = {}
+        if visible_layers:
             for index_key, mapped_layers in mapping.items():
                 try:
                     element_index = int(index_key)
@@ -562,259 +1841,412 @@ def build_overlay_batches(obj: bpy.types.Object, settings):
                     continue
                 if not (0 <= element_index < len(container)):
                     continue
-                layers = mapped_layers
-                if len(layers) == 1:
-                    candidate = layers[0]
-                    top_layer = candidate if candidate in visible_layers else None
-                else:
-                    target = (
-                        layer_id
-                        for layer_id in layers
-                        if layer_id in visible_layers
-                    )
-                    top_layer = max(
-                        target,
-                        key=lambda layer_id: order_lookup.get(layer_id, -1),
-                        default=None,
-                    )
+                top_layer = _top_visible_layer(
+                    mapped_layers, visible_layers, order_lookup
+                )
                 if top_layer is not None:
                     top_layers[element_index] = top_layer
-            if top_layers:
-                layer_states[element_type] = (container, visible_layers, top_layers)
-                source_filters[element_type] = set(top_layers)
+        state = _ownership_state(generation, layer_signature, top_layers)
+        ownership[element_type] = state
+        if top_layers:
+            source_filters[element_type] = top_layers.keys()
+    return ownership, source_filters
+
+
+def _overlay_geometry_filters(obj, bm, params, ownership, source_filters):
+    """Redirect outlined faces to their boundary edges in ``source_filters``.
+
+    Returns the per-type filter digests and the outline edges of each face
+    layer; both are empty of faces when faces draw filled.
+    """
+    filter_digests = {
+        element_type: ownership[element_type]["digest"]
+        for element_type in source_filters
+    }
+    outlines = {}
+    if params["face_display"] == "OUTLINE" and FACE in source_filters:
+        # Outlines are drawn with the edge pipeline from boundary edges.
+        face_edges = _face_edge_table(_overlay_geometry_entry(obj), obj, bm)
+        outlines = {
+            layer_id: _face_outline_edges(indices, face_edges)
+            for layer_id, indices in ownership[FACE]["members"].items()
+        }
+        del source_filters[FACE]
+        outline_edges = set().union(*outlines.values())
+        if outline_edges:
+            source_filters[EDGE] = outline_edges.union(source_filters.get(EDGE, ()))
+            filter_digests.pop(EDGE, None)
+        filter_digests.pop(FACE, None)
+    return filter_digests, outlines
+
+
+def build_overlay_batches(obj: bpy.types.Object, settings):
+    mesh = obj.data
+    source_is_edit = obj.mode == "EDIT"
+    if source_is_edit:
+        bm = bmesh.from_edit_mesh(mesh)
+    else:
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+    try:
+        for element_type in ELEMENT_TYPES:
+            ensure_lookup_tables(bm, element_type)
+        bm.normal_update()
+        results = _OverlayBatches({etype: [] for etype in ELEMENT_TYPES})
+        ownership, source_filters = _overlay_ownership(obj, settings, bm)
+        results.ownership = ownership
 
-        if not layer_states:
+        if not source_filters:
             return results
 
-        geometry = _local_overlay_geometry(obj, bm, settings, source_filters)
-        matrix = obj.matrix_world
-        try:
-            inverse_linear = matrix.to_3x3().inverted()
-            normal_matrix = inverse_linear.transposed()
-        except ValueError:
-            inverse_linear = None
-            normal_matrix = matrix.to_3x3()
-        edge_trim = settings.overlay_edge_trim
-        face_offset = settings.overlay_face_offset
-        edge_offset = settings.overlay_edge_offset
-        vertex_offset = settings.overlay_vertex_offset
-        for element_type, (container, visible_layers, top_layers) in layer_states.items():
-            buckets = defaultdict(list)
-            if element_type == FACE:
-                surface_shader = _get_surface_shader()
-                direction_buckets = defaultdict(list)
-                for source_index, triangles_local, normal_local in geometry[element_type]:
-                    if not (0 <= source_index < len(container)):
-                        continue
-                    top_layer = top_layers.get(source_index)
-                    if top_layer is None:
-                        continue
-                    if surface_shader is not None:
-                        offset_direction = _local_offset_direction(
-                            normal_local,
-                            normal_matrix,
-                            inverse_linear,
-                        )
-                        for triangle in triangles_local:
-                            buckets[top_layer].extend(triangle)
-                            direction_buckets[top_layer].extend((offset_direction,) * 3)
-                    else:
-                        normal = (
-                            (normal_matrix @ normal_local).normalized()
-                            if normal_local.length
-                            else Vector((0.0, 0.0, 1.0))
-                        )
-                        offset = normal * face_offset
-                        for triangle in triangles_local:
-                            buckets[top_layer].extend(
-                                matrix @ coordinate + offset
-                                for coordinate in triangle
-                            )
-                shader = surface_shader or gpu.shader.from_builtin("UNIFORM_COLOR")
-                for layer_id, coordinates in buckets.items():
-                    if not coordinates:
-                        continue
-                    attributes = {"pos": coordinates}
-                    if surface_shader is not None:
-                        attributes["offsetDirection"] = direction_buckets[layer_id]
-                    batch = batch_for_shader(shader, "TRIS", attributes)
-                    results[element_type].append(
-                        {
-                            "kind": (
-                                "surface_triangles"
-                                if surface_shader is not None
-                                else "triangles"
-                            ),
-                            "batch": batch,
-                            "shader": shader,
-                            "layer_id": layer_id,
-                            "vertex_count": len(coordinates),
-                            "coordinate_space": (
-                                "LOCAL" if surface_shader is not None else "WORLD"
-                            ),
-                        }
+        params = _batch_parameters(obj, settings)
+        drawn_types = tuple(source_filters)
+        filter_digests, outlines = _overlay_geometry_filters(
+            obj, bm, params, ownership, source_filters
+        )
+        geometry = _local_overlay_geometry(
+            obj,
+            bm,
+            settings,
+            source_filters,
+            filter_digests,
+        )
+        started = time.perf_counter()
+        upload_seconds, upload_count = _upload_totals
+        bucketed = 0
+        for element_type in drawn_types:
+            for layer_id, indices in ownership[element_type]["members"].items():
+                bucketed += len(indices)
+                if element_type == FACE and params["face_display"] == "OUTLINE":
+                    entry = _outline_layer_batch(
+                        layer_id, outlines[layer_id], geometry, params
                     )
-            elif element_type == EDGE:
-                if edge_trim >= 0.0:
-                    # The common path does not care about descendant ordering.
-                    # Append directly instead of building one tiny graph per edge.
-                    for (
-                        source_index,
-                        p0_local,
-                        p1_local,
-                        normal0_local,
-                        normal1_local,
-                    ) in geometry[element_type]:
-                        if not (0 <= source_index < len(container)):
-                            continue
-                        top_layer = top_layers.get(source_index)
-                        if top_layer is None:
-                            continue
-                        if edge_offset:
-                            offset0 = _local_offset_direction(
-                                normal0_local,
-                                normal_matrix,
-                                inverse_linear,
-                            ) * edge_offset
-                            offset1 = _local_offset_direction(
-                                normal1_local,
-                                normal_matrix,
-                                inverse_linear,
-                            ) * edge_offset
-                        else:
-                            offset0 = offset1 = Vector((0.0, 0.0, 0.0))
-                        buckets[top_layer].extend(
-                            (
-                                p0_local + offset0,
-                                p1_local + offset1,
-                            )
-                        )
                 else:
-                    edge_groups = defaultdict(list)
-                    for (
-                        source_index,
-                        p0_local,
-                        p1_local,
-                        normal0_local,
-                        normal1_local,
-                    ) in geometry[element_type]:
-                        if not (0 <= source_index < len(container)):
-                            continue
-                        if source_index not in top_layers:
-                            continue
-                        edge_groups[source_index].append(
-                            (p0_local, p1_local, normal0_local, normal1_local)
-                        )
-
-                    for source_index, records in edge_groups.items():
-                        top_layer = top_layers[source_index]
-                        for chain in ordered_edge_chains(records):
-                            segments = []
-                            for p0_local, p1_local, normal0_local, normal1_local in chain:
-                                normal0_world = normal_matrix @ normal0_local
-                                normal1_world = normal_matrix @ normal1_local
-                                if normal0_world.length == 0:
-                                    normal0_world = Vector((0.0, 0.0, 1.0))
-                                if normal1_world.length == 0:
-                                    normal1_world = Vector((0.0, 0.0, 1.0))
-                                normal0_world.normalize()
-                                normal1_world.normalize()
-                                segments.append(
-                                    (
-                                        matrix @ p0_local + normal0_world * edge_offset,
-                                        matrix @ p1_local + normal1_world * edge_offset,
-                                    )
-                                )
-                            segments = trim_edge_chain(segments, -edge_trim)
-                            buckets[top_layer].extend(
-                                coordinate
-                                for segment in segments
-                                for coordinate in segment
-                            )
-                shader = gpu.shader.from_builtin("POLYLINE_UNIFORM_COLOR")
-                for layer_id, coordinates in buckets.items():
-                    if not coordinates:
-                        continue
-                    batch = batch_for_shader(shader, "LINES", {"pos": coordinates})
-                    results[element_type].append(
-                        {
-                            "kind": "edge_segments",
-                            "batch": batch,
-                            "shader": shader,
-                            "segment_count": len(coordinates) // 2,
-                            "layer_id": layer_id,
-                            "vertex_count": len(coordinates),
-                            "coordinate_space": (
-                                "LOCAL" if edge_trim >= 0.0 else "WORLD"
-                            ),
-                        }
-                    )
-            else:
-                surface_shader = _get_surface_shader()
-                direction_buckets = defaultdict(list)
-                for source_index, coordinate_local, normal_local in geometry[element_type]:
-                    if not (0 <= source_index < len(container)):
-                        continue
-                    top_layer = top_layers.get(source_index)
-                    if top_layer is None:
-                        continue
-                    if surface_shader is not None:
-                        buckets[top_layer].append(coordinate_local)
-                        direction_buckets[top_layer].append(
-                            _local_offset_direction(
-                                normal_local,
-                                normal_matrix,
-                                inverse_linear,
-                            )
-                        )
-                    else:
-                        normal = (
-                            (normal_matrix @ normal_local).normalized()
-                            if normal_local.length
-                            else Vector((0.0, 0.0, 1.0))
-                        )
-                        coordinate = matrix @ coordinate_local + normal * vertex_offset
-                        buckets[top_layer].append(coordinate)
-                shader = surface_shader or gpu.shader.from_builtin("POINT_UNIFORM_COLOR")
-                for layer_id, coordinates in buckets.items():
-                    if not coordinates:
-                        continue
-                    attributes = {"pos": coordinates}
-                    if surface_shader is not None:
-                        attributes["offsetDirection"] = direction_buckets[layer_id]
-                    batch = batch_for_shader(shader, "POINTS", attributes)
-                    results[element_type].append(
-                        {
-                            "kind": (
-                                "surface_points"
-                                if surface_shader is not None
-                                else "points"
-                            ),
-                            "batch": batch,
-                            "shader": shader,
-                            "layer_id": layer_id,
-                            "vertex_count": len(coordinates),
-                            "coordinate_space": (
-                                "LOCAL" if surface_shader is not None else "WORLD"
-                            ),
-                        }
+                    entry = _layer_batch(
+                        element_type, layer_id, indices, geometry[element_type], params
                     )
+                if entry is not None:
+                    results[element_type].append(entry)
+        upload_seconds = _upload_totals[0] - upload_seconds
+        record_stage(
+            "bucket",
+            time.perf_counter() - started - upload_seconds,
+            bucketed,
+            obj.name,
+        )
+        record_stage(
+            "upload", upload_seconds, _upload_totals[1] - upload_count, obj.name
+        )
         return results
     finally:
         if not source_is_edit:
             bm.free()
 
 
-def cached_overlay_batches(obj: bpy.types.Object, settings):
+def _upload_batch(shader, primitive, attributes):
+    started = time.perf_counter()
+    batch = batch_for_shader(shader, primitive, attributes)
+    _upload_totals[0] += time.perf_counter() - started
+    _upload_totals[1] += 1
+    count_operation("batches")
+    return batch
+
+
+def _element_count(obj, bm, element_type):
+    if bm is not None:
+        return len(element_container(bm, element_type))
+    mesh = obj.data
+    if element_type == FACE:
+        return len(mesh.polygons)
+    if element_type == EDGE:
+        return len(mesh.edges)
+    return len(mesh.vertices)
+
+
+def _stale_overlay_types(settings, cached):
+    generations = cached.get("generations")
+    if generations is None:
+        return ()
+    return tuple(
+        element_type
+        for element_type, generation in generations.items()
+        if generation != annotation_generation(settings, element_type)
+    )
+
+
+def _patch_overlay_batches(obj, settings, cached, stale_types):
+    """Apply committed annotation change sets to cached layer batches.
+
+    Only layers that gained or lost elements are rebuilt. Returns False when
+    the change journal, layer visibility, or cached geometry cannot support
+    a patch, in which case the caller performs a full rebuild.
+    """
+    batches = cached["batches"]
+    ownership = batches.ownership
+    geometry_entry = _overlay_geometry_cache.get(_id_key(obj))
+    if (
+        geometry_entry is None
+        or geometry_entry["signature"] != cached.get("surface_signature")
+        or any(
+            entry is not cached and entry["batches"] is batches
+            for entry in _overlay_batch_cache.values()
+        )
+    ):
+        return False
+    source_is_edit = obj.mode == "EDIT"
+    edit_bm = bmesh.from_edit_mesh(obj.data) if source_is_edit else None
+    plans = []
+    for element_type in stale_types:
+        state = ownership[element_type]
+        if state["suppressed"]:
+            return False
+        generation = annotation_generation(settings, element_type)
+        changes = annotation_changes_since(
+            settings, element_type, cached["generations"][element_type]
+        )
+        if changes is None:
+            return False
+        visible_layers, order_lookup, layer_signature = _overlay_layer_view(
+            settings, element_type
+        )
+        if layer_signature != state["layer_signature"]:
+            return False
+        if edit_bm is not None:
+            ensure_lookup_tables(edit_bm, element_type)
+        element_count = _element_count(obj, edit_bm, element_type)
+        retargets = {}
+        for element_index, (_previous, current) in changes.items():
+            if not (0 <= element_index < element_count):
+                continue
+            top_layer = (
+                _top_visible_layer(current, visible_layers, order_lookup)
+                if current
+                else None
+            )
+            if top_layer != state["top_layers"].get(element_index):
+                retargets[element_index] = top_layer
+        plans.append((element_type, state, generation, retargets))
+
+    params = _batch_parameters(obj, settings)
+    outline_faces = params["face_display"] == "OUTLINE"
+    outlines = {}
+    affected_layers = {}
+    missing = {}
+    for element_type, state, _generation, retargets in plans:
+        top_layers = state["top_layers"]
+        members = state["members"]
+        affected = set()
+        added = []
+        removed = []
+        for element_index, layer_id in retargets.items():
+            previous_layer = top_layers.pop(element_index, None)
+            if previous_layer is not None:
+                members[previous_layer].discard(element_index)
+                affected.add(previous_layer)
+                removed.append(element_index)
+            if layer_id is not None:
+                top_layers[element_index] = layer_id
+                members.setdefault(layer_id, set()).add(element_index)
+                affected.add(layer_id)
+                added.append(element_index)
+        state["digest"] = _patch_index_set_digest(state["digest"], added, removed)
+        if element_type == VERTEX:
+            if top_layers and state["digest"] != geometry_entry["digests"][element_type]:
+                # Vertex records are resolved competitively, so a different
+                # filter can move records between otherwise unchanged layers.
+                missing[element_type] = set(top_layers)
+                affected.update(members)
+        elif element_type == FACE and outline_faces:
+            face_edges = _face_edge_table(geometry_entry, obj, edit_bm)
+            covered = geometry_entry["covered"][EDGE]
+            for layer_id in affected:
+                outline_edges = _face_outline_edges(members.get(layer_id, ()), face_edges)
+                outlines[layer_id] = outline_edges
+                uncovered = {index for index in outline_edges if index not in covered}
+                if uncovered:
+                    missing.setdefault(EDGE, set()).update(uncovered)
+        else:
+            covered = geometry_entry["covered"][element_type]
+            uncovered = {
+                element_index
+                for layer_id in affected
+                for element_index in members.get(layer_id, ())
+                if element_index not in covered
+            }
+            if uncovered:
+                missing.setdefault(element_type, set()).update(uncovered)
+        affected_layers[element_type] = affected
+    if missing:
+        bm = edit_bm
+        if bm is None:
+            bm = bmesh.new()
+            bm.from_mesh(obj.data)
+        try:
+            for element_type in ELEMENT_TYPES:
+                ensure_lookup_tables(bm, element_type)
+            bm.normal_update()
+            started = time.perf_counter()
+            _extend_overlay_geometry(obj, bm, settings, geometry_entry, missing)
+            geometry_entry["extract_seconds"] += time.perf_counter() - started
+        finally:
+            if edit_bm is None:
+                bm.free()
+        geometry_key = _id_key(obj)
+        _overlay_geometry_cache.resize(
+            geometry_key,
+            _geometry_bytes(geometry_entry),
+            geometry_entry["extract_seconds"],
+        )
+        _overlay_geometry_cache.evict(protect=geometry_key)
+
+    for element_type, state, generation, _retargets in plans:
+        members = state["members"]
+        affected = affected_layers[element_type]
+        if affected:
+            entries = [
+                entry
+                for entry in batches[element_type]
+                if entry.get("layer_id") not in affected
+            ]
+            records_by_index = geometry_entry["geometry"][element_type]
+            for layer_id in affected:
+                indices = members.get(layer_id)
+                if not indices:
+                    members.pop(layer_id, None)
+                    continue
+                if element_type == FACE and outline_faces:
+                    entry = _outline_layer_batch(
+                        layer_id, outlines[layer_id], geometry_entry["geometry"], params
+                    )
+                else:
+                    entry = _layer_batch(
+                        element_type, layer_id, indices, records_by_index, params
+                    )
+                if entry is not None:
+                    entries.append(entry)
+            batches[element_type][:] = entries
+        state["generation"] = generation
+        cached["generations"][element_type] = generation
+    cached.update(_batch_statistics(batches))
+    return True
+
+
+def _batch_statistics(batches):
+    if not isinstance(batches, dict):
+        return {
+            "batch_vertex_count": 0,
+            "has_world_space_batches": True,
+            "has_local_batches": False,
+        }
+    entries = [entry for type_entries in batches.values() for entry in type_entries]
+    return {
+        "batch_vertex_count": sum(
+            int(entry.get("vertex_count", 0))
+            + int(entry.get("lod", {}).get("vertex_count", 0))
+            for entry in entries
+        ),
+        "has_world_space_batches": any(
+            entry.get("coordinate_space", "WORLD") == "WORLD" for entry in entries
+        ),
+        "has_local_batches": any(
+            entry.get("coordinate_space") == "LOCAL" for entry in entries
+        ),
+    }
+
+
+def _instance_share_key(obj: bpy.types.Object, surface_signature, dependency_keys):
+    """Return a key for evaluated geometry that linked duplicates may share.
+
+    Modifiers that reference other IDs can depend on relative transforms, so
+    only self-contained stacks are shared. Vertex group names are per object.
+    """
+    if len(dependency_keys) > 2:
+        return None
+    return surface_signature, tuple(group.name for group in obj.vertex_groups)
+
+
+def _annotation_content_key(settings):
+    """Hash everything besides colors that decides what the batches contain."""
+    digest = hashlib.blake2b(digest_size=16)
+    for element_type in ELEMENT_TYPES:
+        spec = element_spec(element_type)
+        for value in (
+            element_layers_digest(settings, element_type),
+            getattr(settings, spec.state_property, ""),
+            repr(_overlay_layer_view(settings, element_type)[2]),
+        ):
+            digest.update(value.encode("utf-8"))
+            digest.update(b"\x00")
+    digest.update(
+        repr(
+            (
+                round(float(settings.overlay_edge_trim), 9),
+                round(float(settings.overlay_face_offset), 9),
+                round(float(settings.overlay_edge_offset), 9),
+                round(float(settings.overlay_vertex_offset), 9),
+                settings.overlay_face_display,
+            )
+        ).encode("ascii")
+    )
+    return digest.digest()
+
+
+def _shared_overlay_entry(cache_key, content_key):
+    """Find local-space batches another instance built from identical content."""
+    if content_key is None:
+        return None
+    for other_key, entry in _overlay_batch_cache.items():
+        if (
+            other_key != cache_key
+            and entry.get("content_key") == content_key
+            and not entry["dirty"]
+            and not entry["has_world_space_batches"]
+        ):
+            return entry
+    return None
+
+
+def _seed_shared_overlay_geometry(cache_key, share_key):
+    """Alias a sibling's geometry records when this instance has none yet."""
+    own = _overlay_geometry_cache.get(cache_key)
+    if share_key is None or (own is not None and own["signature"] == share_key[0]):
+        return
+    for other_key, entry in _overlay_batch_cache.items():
+        if other_key == cache_key or entry.get("share_key") != share_key or entry["dirty"]:
+            continue
+        geometry_entry = _overlay_geometry_cache.get(other_key)
+        if geometry_entry is not None and geometry_entry["signature"] == share_key[0]:
+            _overlay_geometry_cache[cache_key] = geometry_entry
+            return
+
+
+def _batch_bytes(cached):
+    return cached["batch_vertex_count"] * _OVERLAY_BATCH_VERTEX_BYTES
+
+
+def cached_overlay_batches(obj: bpy.types.Object, settings, *, allow_build=True):
+    """Return current batches for ``obj``, building or patching them if needed.
+
+    With ``allow_build`` false a required rebuild is deferred to a later
+    redraw; the previous batches of the same mesh are returned meanwhile.
+    """
     cache_key = _id_key(obj)
     mesh_uid = _id_key(obj.data)
     source_mode = obj.mode
     cached = _overlay_batch_cache.get(cache_key)
-    cache_matches = bool(
-        cached
-        and cached["mesh_uid"] == mesh_uid
-        and cached["source_mode"] == source_mode
-    )
+    cache_matches = bool(cached and cached["mesh_uid"] == mesh_uid)
+    modifier_signature = None
+    if cache_matches and cached["source_mode"] != source_mode:
+        # Tabbing between modes usually keeps the evaluated surface; reuse the
+        # batches unless the new mode runs a different set of modifiers.
+        modifier_signature = _modifier_state_signature(obj)
+        cache_matches = (
+            not cached["dirty"]
+            and cached.get("surface_signature")
+            == _evaluated_surface_signature(obj, modifier_signature)
+        )
+        if cache_matches:
+            cached["source_mode"] = source_mode
     if cache_matches:
         if (
             cached.get("has_local_batches", False)
@@ -824,104 +2256,227 @@ def cached_overlay_batches(obj: bpy.types.Object, settings):
             cached["dirty"] = True
         _overlay_batch_cache.move_to_end(cache_key)
         if not cached["dirty"]:
-            return cached["batches"]
-        interactive_modes = {"EDIT", "SCULPT", "WEIGHT_PAINT", "VERTEX_PAINT"}
-        if source_mode in interactive_modes:
-            refresh_interval = max(
-                1.0 / 30.0,
-                min(1.0, cached["build_duration"] * 4.0),
-            )
-            elapsed = time.perf_counter() - cached["built_at"]
-            if elapsed < refresh_interval:
-                _schedule_overlay_refresh(refresh_interval - elapsed)
+            stale_types = _stale_overlay_types(settings, cached)
+            if not stale_types:
+                _overlay_batch_cache.note(True)
                 return cached["batches"]
-    modifier_signature = _modifier_state_signature(obj)
-    build_started = time.perf_counter()
-    batches = build_overlay_batches(obj, settings)
-    build_duration = time.perf_counter() - build_started
-    batch_vertex_count = (
-        sum(
-            int(entry.get("vertex_count", 0))
-            for entries in batches.values()
-            for entry in entries
-        )
-        if isinstance(batches, dict)
-        else 0
+            if _patch_overlay_batches(obj, settings, cached, stale_types):
+                _overlay_batch_cache.resize(cache_key, _batch_bytes(cached))
+                _overlay_batch_cache.note(True)
+                return cached["batches"]
+        else:
+            interactive_modes = {"EDIT", "SCULPT", "WEIGHT_PAINT", "VERTEX_PAINT"}
+            if source_mode in interactive_modes:
+                refresh_interval = max(
+                    1.0 / 30.0,
+                    min(1.0, cached["build_duration"] * 4.0),
+                )
+                elapsed = time.perf_counter() - cached["built_at"]
+                if elapsed < refresh_interval:
+                    _schedule_overlay_refresh(refresh_interval - elapsed)
+                    return cached["batches"]
+    if not allow_build:
+        _schedule_overlay_refresh(1.0 / 60.0)
+        return cached["batches"] if cached and cached["mesh_uid"] == mesh_uid else None
+    if modifier_signature is None:
+        modifier_signature = _modifier_state_signature(obj)
+    surface_signature = _evaluated_surface_signature(obj, modifier_signature)
+    _overlay_batch_cache.note(False)
+    _touch_overlay_recency(cache_key)
+    dependency_keys = _dependency_keys(obj)
+    share_key = (
+        _instance_share_key(obj, surface_signature, dependency_keys)
+        if annotation_mesh_is_shared(obj)
+        else None
     )
-    has_world_space_batches = (
-        any(
-            entry.get("coordinate_space", "WORLD") == "WORLD"
-            for entries in batches.values()
-            for entry in entries
-        )
-        if isinstance(batches, dict)
-        else True
+    content_key = (
+        (share_key, _annotation_content_key(settings))
+        if share_key is not None
+        else None
     )
-    has_local_batches = (
-        any(
-            entry.get("coordinate_space") == "LOCAL"
-            for entries in batches.values()
-            for entry in entries
+    shared = _shared_overlay_entry(cache_key, content_key)
+    if shared is not None:
+        # Linked duplicates draw the same local-space batches with their own
+        # matrix_world, so only the per-instance bookkeeping is new.
+        batches = shared["batches"]
+        build_duration = shared["build_duration"]
+        generations = {
+            element_type: annotation_generation(settings, element_type)
+            for element_type in ELEMENT_TYPES
+        }
+    else:
+        _seed_shared_overlay_geometry(cache_key, share_key)
+        build_started = time.perf_counter()
+        batches = build_overlay_batches(obj, settings)
+        build_duration = time.perf_counter() - build_started
+        record_stage(
+            "build",
+            build_duration,
+            sum(len(entries) for entries in batches.values()),
+            obj.name,
+            source_mode,
         )
-        if isinstance(batches, dict)
-        else False
-    )
-    _overlay_batch_cache[cache_key] = {
+        ownership = getattr(batches, "ownership", None)
+        generations = (
+            {
+                element_type: state["generation"]
+                for element_type, state in ownership.items()
+            }
+            if ownership is not None
+            else None
+        )
+    cached = {
         "mesh_uid": mesh_uid,
         "source_mode": source_mode,
         "modifier_signature": modifier_signature,
-        "dependency_keys": _dependency_keys(obj),
+        "surface_signature": surface_signature,
+        "share_key": share_key,
+        "content_key": content_key,
+        "generations": generations,
+        "dependency_keys": dependency_keys,
         "batches": batches,
         "built_at": time.perf_counter(),
         "build_duration": build_duration,
-        "batch_vertex_count": batch_vertex_count,
-        "has_world_space_batches": has_world_space_batches,
-        "has_local_batches": has_local_batches,
+        **_batch_statistics(batches),
         "linear_metric_signature": _linear_metric_signature(obj.matrix_world),
         "dirty": False,
     }
-    _overlay_batch_cache.move_to_end(cache_key)
-    while (
-        len(_overlay_batch_cache) > _OVERLAY_CACHE_LIMIT
-        or len(_overlay_batch_cache) > 1
-        and sum(
-            entry["batch_vertex_count"]
-            for entry in _overlay_batch_cache.values()
-        )
-        > _OVERLAY_BATCH_VERTEX_LIMIT
-    ):
-        _overlay_batch_cache.popitem(last=False)
+    # Linked duplicates share one batch set; it is sized and evicted once,
+    # and slow builds outlive cheap ones of the same size.
+    _overlay_batch_cache.store(
+        cache_key,
+        cached,
+        nbytes=_batch_bytes(cached),
+        cost=build_duration,
+        owner=obj.name,
+        identity=id(batches),
+    )
+    _index_overlay_dependents(cache_key, dependency_keys)
     return batches
 
 
-def draw_overlay():
-    context = bpy.context
-    obj = context.object
-    if not obj or obj.type != "MESH":
-        return
-    settings = obj.mesh_annotations
-    if not settings.enable_overlay:
+def _index_overlay_dependents(cache_key, dependency_keys):
+    """Map each dependency ID to the cache entries its updates invalidate.
+
+    Removed entries are skipped when read; the index is rebuilt from the live
+    entries once it grows past a fixed number of IDs.
+    """
+    for dependency_key in dependency_keys:
+        _overlay_dependents[dependency_key].add(cache_key)
+    if len(_overlay_dependents) <= _OVERLAY_DEPENDENT_LIMIT:
         return
+    _overlay_dependents.clear()
+    for live_key, cached in _overlay_batch_cache.items():
+        for dependency_key in cached["dependency_keys"]:
+            _overlay_dependents[dependency_key].add(live_key)
+
+
+def _overlay_objects(context):
+    """Return the meshes whose annotations this redraw should consider."""
+    if not has_annotated_objects():
+        return []
+    active = getattr(context, "object", None)
+    objects = []
+    if is_annotated_object(active) and active.mesh_annotations.enable_overlay:
+        objects.append(active)
+    preferences = addon_preferences()
+    if not getattr(preferences, "overlay_all_objects", False):
+        return objects
+    view_layer = getattr(context, "view_layer", None)
+    if view_layer is None:
+        return objects
+    space = getattr(context, "space_data", None)
+    viewport = space if getattr(space, "type", None) == "VIEW_3D" else None
+    for obj in annotated_objects():
+        if obj == active or not obj.mesh_annotations.enable_overlay:
+            continue
+        try:
+            if obj.visible_get(view_layer=view_layer, viewport=viewport):
+                objects.append(obj)
+        except (ReferenceError, RuntimeError, TypeError):
+            continue
+    return objects
+
+
+def _screen_coverage(obj, view_projection_matrix):
+    """Return the clamped NDC area of the object's bounds, or 0.0 when culled."""
+    if view_projection_matrix is None:
+        return 1.0
+    matrix = view_projection_matrix @ obj.matrix_world
+    corners = [matrix @ Vector((*corner, 1.0)) for corner in obj.bound_box]
+    for axis in range(3):
+        if all(corner[axis] < -corner[3] for corner in corners):
+            return 0.0
+        if all(corner[axis] > corner[3] for corner in corners):
+            return 0.0
+    if any(corner[3] <= 0.0 for corner in corners):
+        # The camera is inside or behind part of the bounds.
+        return 4.0
+    xs = [max(-1.0, min(1.0, corner[0] / corner[3])) for corner in corners]
+    ys = [max(-1.0, min(1.0, corner[1] / corner[3])) for corner in corners]
+    return (max(xs) - min(xs)) * (max(ys) - min(ys))
+
+
+def _touch_overlay_recency(cache_key):
+    _overlay_recency[cache_key] = time.perf_counter()
+    _overlay_recency.move_to_end(cache_key)
+    while len(_overlay_recency) > _OVERLAY_INSTANCE_LIMIT:
+        _overlay_recency.popitem(last=False)
+
+
+def _use_lod_tier(batches, coverage, viewport_size, view_idle):
+    """Prefer coarse tiers only for dense, over-budget objects while the view moves."""
+    if view_idle:
+        return False
+    preferences = addon_preferences()
+    budget = getattr(preferences, "overlay_lod_budget", 300_000)
+    if budget <= 0:
+        return False
+    vertex_count = sum(
+        int(entry.get("vertex_count", 0))
+        for entries in batches.values()
+        for entry in entries
+    )
+    if vertex_count <= budget:
+        return False
+    pixels = max(1.0, min(4.0, coverage) / 4.0 * viewport_size[0] * viewport_size[1])
+    return vertex_count / pixels > _LOD_DENSITY
+
+
+def _view_is_idle(context, view_projection_matrix):
+    """Track each region's view matrix; idle once it has been still for a moment."""
+    region = getattr(context, "region", None)
+    region_key = region.as_pointer() if region is not None else 0
+    signature = (
+        tuple(round(float(value), 6) for row in view_projection_matrix for value in row)
+        if view_projection_matrix is not None
+        else None
+    )
+    now = time.perf_counter()
+    state = _overlay_view_states.get(region_key)
+    if state is None or state[0] != signature:
+        _overlay_view_states[region_key] = (signature, now)
+        _overlay_view_states.move_to_end(region_key)
+        while len(_overlay_view_states) > _OVERLAY_CACHE_LIMIT:
+            _overlay_view_states.popitem(last=False)
+        return False
+    return now - state[1] >= _LOD_IDLE_SECONDS
+
+
+def _draw_object_batches(
+    obj, settings, batches, viewport_size, view_projection_matrix, use_lod=False
+):
     line_width = max(1.0, settings.overlay_line_width)
     point_size = max(1.0, settings.overlay_point_size)
     alpha_mult = max(0.0, min(1.0, settings.overlay_alpha_multiplier))
     face_offset = settings.overlay_face_offset
     vertex_offset = settings.overlay_vertex_offset
     show_backfaces = settings.overlay_show_backfaces
-    batches = cached_overlay_batches(obj, settings)
-    if not any(batches[etype] for etype in ELEMENT_TYPES):
-        debug_log(settings, "Draw overlay: nothing to draw")
-        return
     depth_mode = "ALWAYS" if show_backfaces else "LESS_EQUAL"
     gpu.state.blend_set("ALPHA")
     gpu.state.depth_mask_set(False)
     gpu.state.depth_test_set(depth_mode)
     try:
-        viewport_size = get_viewport_size()
-        region_data = getattr(context, "region_data", None)
-        view_projection_matrix = (
-            region_data.perspective_matrix if region_data is not None else None
-        )
         object_matrix = obj.matrix_world
         model_view_projection_matrix = (
             view_projection_matrix @ object_matrix
@@ -937,6 +2492,8 @@ def draw_overlay():
                 for layer in get_layer_collection(settings, element_type)
             }
             for entry in entries:
+                if use_lod:
+                    entry = entry.get("lod") or entry
                 kind = entry.get("kind")
                 base_color = layer_colors.get(
                     entry.get("layer_id"),
@@ -985,6 +2542,19 @@ def draw_overlay():
                     shader.uniform_float("color", color)
                     batch.draw(shader)
                     gpu.state.point_size_set(1.0)
+                elif kind == "edge_lines":
+                    shader = entry["shader"]
+                    uses_local_coordinates = entry.get("coordinate_space") == "LOCAL"
+                    if uses_local_coordinates:
+                        gpu.matrix.push()
+                        gpu.matrix.multiply_matrix(object_matrix)
+                    try:
+                        shader.bind()
+                        shader.uniform_float("color", color)
+                        entry["batch"].draw(shader)
+                    finally:
+                        if uses_local_coordinates:
+                            gpu.matrix.pop()
                 elif kind == "edge_segments":
                     polyline_shader = entry["shader"]
                     uses_local_coordinates = entry.get("coordinate_space") == "LOCAL"
@@ -1006,6 +2576,82 @@ def draw_overlay():
         gpu.state.blend_set("NONE")
 
 
+@profiled("draw_overlay")
+def draw_overlay():
+    context = bpy.context
+    objects = _overlay_objects(context)
+    if not objects:
+        return
+    active = getattr(context, "object", None)
+    region_data = getattr(context, "region_data", None)
+    view_projection_matrix = (
+        region_data.perspective_matrix if region_data is not None else None
+    )
+    if active is not None and active == objects[0]:
+        _touch_overlay_recency(_id_key(active))
+    candidates = []
+    for obj in objects:
+        coverage = _screen_coverage(obj, view_projection_matrix)
+        if coverage <= 0.0:
+            continue
+        candidates.append(
+            (
+                obj != active,
+                -coverage,
+                -_overlay_recency.get(_id_key(obj), 0.0),
+                obj,
+            )
+        )
+    if not candidates:
+        return
+    candidates.sort(key=lambda candidate: candidate[:3])
+    # Keep every drawn instance resident instead of thrashing the LRU caches.
+    drawn = [_id_key(candidate[3]) for candidate in candidates]
+    with _overlay_batch_cache.pinning(drawn), _overlay_geometry_cache.pinning(drawn):
+        _draw_overlay_candidates(context, candidates, view_projection_matrix)
+
+
+def _draw_overlay_candidates(context, candidates, view_projection_matrix):
+    preferences = addon_preferences()
+    build_budget = getattr(preferences, "overlay_build_budget", 8.0) / 1000.0
+    spent = 0.0
+    viewport_size = get_viewport_size()
+    view_idle = _view_is_idle(context, view_projection_matrix)
+    if not view_idle:
+        _note_user_input()
+    for is_inactive, negative_coverage, _recency, obj in candidates:
+        settings = obj.mesh_annotations
+        # The active object always builds; the rest share the frame budget in
+        # priority order and fall back to their previous batches.
+        started = time.perf_counter()
+        batches = cached_overlay_batches(
+            obj,
+            settings,
+            allow_build=not is_inactive or spent < build_budget,
+        )
+        spent += time.perf_counter() - started
+        if batches is None:
+            continue
+        if not any(batches[etype] for etype in ELEMENT_TYPES):
+            debug_log(settings, "Draw overlay: nothing to draw")
+            continue
+        use_lod = _use_lod_tier(batches, -negative_coverage, viewport_size, view_idle)
+        if use_lod:
+            # Restore full resolution once the view settles.
+            _schedule_overlay_refresh(_LOD_IDLE_SECONDS)
+        # GPU work is asynchronous; this measures command submission only.
+        with trace_stage("draw", obj.name, "LOD" if use_lod else "FULL") as stage:
+            _draw_object_batches(
+                obj,
+                settings,
+                batches,
+                viewport_size,
+                view_projection_matrix,
+                use_lod=use_lod,
+            )
+            stage.count = sum(len(batches[etype]) for etype in ELEMENT_TYPES)
+
+
 def register_draw_handler():
     global _draw_handle
     if _draw_handle is None:
@@ -1054,6 +2700,9 @@ def register():
     _surface_shader_failed = False
     _cancel_timer(_overlay_refresh_timer)
     _cancel_timer(_topology_sync_timer)
+    _cancel_timer(_precompile_surface_shader)
+    _cancel_prewarm()
+    forget_annotated_objects()
     _overlay_refresh_timer_pending = False
     _topology_sync_timer_pending = False
     _remove_callback_instances(
@@ -1063,6 +2712,10 @@ def register():
     bpy.app.handlers.depsgraph_update_post.append(annotation_depsgraph_update_post)
     _remove_callback_instances(bpy.app.handlers.load_pre, annotation_load_pre)
     bpy.app.handlers.load_pre.append(annotation_load_pre)
+    _remove_callback_instances(bpy.app.handlers.load_post, annotation_load_post)
+    bpy.app.handlers.load_post.append(annotation_load_post)
+    configure_trace_log()
+    configure_cache_budgets()
     for handlers in (bpy.app.handlers.undo_pre, bpy.app.handlers.redo_pre):
         _remove_callback_instances(handlers, annotation_history_pre)
         handlers.append(annotation_history_pre)
@@ -1070,6 +2723,10 @@ def register():
         _remove_callback_instances(handlers, annotation_history_post)
         handlers.append(annotation_history_post)
     register_draw_handler()
+    if not bpy.app.background:
+        bpy.app.timers.register(
+            _precompile_surface_shader, first_interval=_SHADER_PRECOMPILE_DELAY
+        )
 
 
 def unregister():
@@ -1081,6 +2738,7 @@ def unregister():
         annotation_depsgraph_update_post,
     )
     _remove_callback_instances(bpy.app.handlers.load_pre, annotation_load_pre)
+    _remove_callback_instances(bpy.app.handlers.load_post, annotation_load_post)
     for handlers in (bpy.app.handlers.undo_pre, bpy.app.handlers.redo_pre):
         _remove_callback_instances(handlers, annotation_history_pre)
     for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
@@ -1088,6 +2746,9 @@ def unregister():
     invalidate_overlay_state()
     _cancel_timer(_overlay_refresh_timer)
     _cancel_timer(_topology_sync_timer)
+    _cancel_timer(_precompile_surface_shader)
+    _cancel_prewarm()
+    forget_annotated_objects()
     _overlay_refresh_timer_pending = False
     _topology_sync_timer_pending = False
     _surface_shader = None
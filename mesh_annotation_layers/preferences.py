@@ -10,6 +10,7 @@ from .i18n import (
     redraw_ui,
     tr,
 )
+from .overlay import configure_cache_budgets, configure_trace_log, tag_view3d_redraw
 
 
 class MeshAnnotationPreferences(bpy.types.AddonPreferences):
@@ -23,6 +24,89 @@ class MeshAnnotationPreferences(bpy.types.AddonPreferences):
         items=language_items,
         update=lambda _self, context: redraw_ui(context),
     )
+    overlay_all_objects: bpy.props.BoolProperty(
+        name="Draw All Annotated Objects",
+        description=(
+            "Draw annotation overlays for every visible annotated mesh, "
+            "not only the active object"
+        ),
+        default=False,
+        update=lambda _self, context: tag_view3d_redraw(
+            context, invalidate_cache=False
+        ),
+    )
+    overlay_build_budget: bpy.props.FloatProperty(
+        name="Overlay Build Budget",
+        description=(
+            "Milliseconds per redraw spent building overlays for inactive "
+            "objects; the rest are built on later redraws"
+        ),
+        min=1.0,
+        max=200.0,
+        default=8.0,
+    )
+    overlay_lod_budget: bpy.props.IntProperty(
+        name="Full-Detail Vertex Budget",
+        description=(
+            "Above this many overlay vertices per object, dense layers switch to "
+            "coarse tiers while the view moves; 0 always draws full detail"
+        ),
+        min=0,
+        default=300_000,
+        update=lambda _self, context: tag_view3d_redraw(
+            context, invalidate_cache=False
+        ),
+    )
+
+    overlay_batch_budget: bpy.props.IntProperty(
+        name="Overlay Batch Memory",
+        description=(
+            "Megabytes of drawable overlay batches kept for objects that are "
+            "not being drawn; batches that were slow to build are kept longest"
+        ),
+        min=1,
+        soft_max=4096,
+        default=16,
+        update=lambda self, _context: configure_cache_budgets(self),
+    )
+    overlay_geometry_budget: bpy.props.IntProperty(
+        name="Overlay Geometry Memory",
+        description=(
+            "Megabytes of extracted evaluated geometry kept so annotation "
+            "changes can rebuild overlays without re-reading the mesh"
+        ),
+        min=1,
+        soft_max=4096,
+        default=40,
+        update=lambda self, _context: configure_cache_budgets(self),
+    )
+    annotation_cache_budget: bpy.props.IntProperty(
+        name="Annotation Cache Memory",
+        description="Megabytes of decoded annotation mappings kept in memory",
+        min=1,
+        soft_max=4096,
+        default=20,
+        update=lambda self, _context: configure_cache_budgets(self),
+    )
+
+    trace_log_path: bpy.props.StringProperty(
+        name="Slow Stage Log",
+        description=(
+            "Append overlay stages slower than the threshold to this rotating "
+            "log file; leave empty to disable"
+        ),
+        subtype="FILE_PATH",
+        default="",
+        update=lambda self, _context: configure_trace_log(self),
+    )
+    trace_slow_threshold: bpy.props.FloatProperty(
+        name="Slow Stage Threshold",
+        description="Milliseconds above which an overlay stage is logged",
+        min=0.0,
+        max=10_000.0,
+        default=50.0,
+        update=lambda self, _context: configure_trace_log(self),
+    )
 
     def draw(self, _context):
         layout = self.layout
@@ -36,6 +120,30 @@ class MeshAnnotationPreferences(bpy.types.AddonPreferences):
             layout.label(
                 text=tr("Automatic language: {language}", language=tr(automatic_key))
             )
+        layout.separator()
+        layout.prop(
+            self,
+            "overlay_all_objects",
+            text=tr("Draw All Annotated Objects"),
+        )
+        row = layout.row()
+        row.enabled = self.overlay_all_objects
+        row.prop(self, "overlay_build_budget", text=tr("Build Budget (ms)"))
+        layout.prop(
+            self,
+            "overlay_lod_budget",
+            text=tr("Full-Detail Vertex Budget"),
+        )
+        layout.separator()
+        column = layout.column(align=True)
+        column.prop(self, "overlay_batch_budget", text=tr("Overlay Batches (MB)"))
+        column.prop(self, "overlay_geometry_budget", text=tr("Overlay Geometry (MB)"))
+        column.prop(self, "annotation_cache_budget", text=tr("Annotations (MB)"))
+        layout.separator()
+        layout.prop(self, "trace_log_path", text=tr("Slow Stage Log"))
+        row = layout.row()
+        row.enabled = bool(self.trace_log_path)
+        row.prop(self, "trace_slow_threshold", text=tr("Threshold (ms)"))
 
 
 CLASSES = (MeshAnnotationPreferences,)
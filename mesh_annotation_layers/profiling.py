@@ -0,0 +1,337 @@
+"""Ring-buffer timings of the overlay pipeline and an optional slow-stage log.
+
+Operation counters complement the timings: inside :func:`counting_operations`
+the pipeline reports how much work it did, so tests can assert complexity
+instead of wall-clock time. Profile captures run ``cProfile`` around the next
+calls of the functions decorated with :func:`profiled`. The module only uses
+the standard library so the same counters are available to scripts running
+outside Blender.
+"""
+
+import cProfile
+import io
+import logging
+import logging.handlers
+import pstats
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from functools import wraps
+
+STAGES = (
+    "load",
+    "reconcile",
+    "source_mapping",
+    "extract",
+    "bucket",
+    "upload",
+    "build",
+    "draw",
+)
+
+_TRACE_LIMIT = 512
+_SLOW_LOG_BYTES = 1_048_576
+_SLOW_LOG_BACKUPS = 3
+_trace = deque(maxlen=_TRACE_LIMIT)
+_slow_log = {"path": "", "threshold_ms": 0.0, "handler": None}
+OPERATIONS = (
+    "bmesh_elements",
+    "payload_encodes",
+    "payload_decodes",
+    "json_bytes",
+    "evaluated_elements",
+    "batches",
+)
+_operation_counts = Counter()
+_operation_state = {"depth": 0}
+# Modules that keep always-on counters of their own report them through a
+# snapshot callable; blocks record the difference.
+_operation_sources = {}
+_PROFILE_SUMMARY_LINES = 40
+_profile_capture = {
+    "profiler": None,
+    "path": "",
+    "requested": 0,
+    "captured": 0,
+    "depth": 0,
+    "calls": Counter(),
+    "describe": None,
+    "result": None,
+}
+_logger = logging.getLogger(f"{__name__}.slow_stages")
+_logger.propagate = False
+_logger.setLevel(logging.INFO)
+
+
+class _Stage:
+    """Time a ``with`` block as one stage; set ``count`` before it exits."""
+
+    __slots__ = ("name", "owner", "detail", "count", "started")
+
+    def __init__(self, name, owner, detail):
+        self.name = name
+        self.owner = owner
+        self.detail = detail
+        self.count = 0
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc_info):
+        record_stage(
+            self.name,
+            time.perf_counter() - self.started,
+            self.count,
+            self.owner,
+            self.detail,
+        )
+        return False
+
+
+def trace_stage(name: str, owner: str = "", detail: str = ""):
+    return _Stage(name, owner, detail)
+
+
+def record_stage(name: str, seconds: float, count=0, owner="", detail=""):
+    """Append one stage timing; stages above the log threshold are also logged."""
+    milliseconds = seconds * 1000.0
+    _trace.append((time.time(), name, owner, detail, milliseconds, int(count)))
+    if _slow_log["handler"] is not None and milliseconds >= _slow_log["threshold_ms"]:
+        _logger.info(
+            "%s\t%s\t%s\t%.3f ms\t%d elements",
+            name,
+            owner,
+            detail,
+            milliseconds,
+            count,
+        )
+
+
+def trace_events(stage: str | None = None) -> list[dict]:
+    """Return buffered timings, oldest first, optionally for one stage."""
+    return [
+        {
+            "time": recorded_at,
+            "stage": name,
+            "object": owner,
+            "detail": detail,
+            "milliseconds": milliseconds,
+            "count": count,
+        }
+        for recorded_at, name, owner, detail, milliseconds, count in _trace
+        if stage is None or name == stage
+    ]
+
+
+def stage_summary() -> dict[str, dict]:
+    """Aggregate buffered timings per stage in pipeline order."""
+    summary = {}
+    for _recorded_at, name, _owner, detail, milliseconds, count in _trace:
+        entry = summary.get(name)
+        if entry is None:
+            entry = summary[name] = {
+                "calls": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "last_ms": 0.0,
+                "last_count": 0,
+                "last_detail": "",
+            }
+        entry["calls"] += 1
+        entry["total_ms"] += milliseconds
+        entry["max_ms"] = max(entry["max_ms"], milliseconds)
+        entry["last_ms"] = milliseconds
+        entry["last_count"] = count
+        entry["last_detail"] = detail
+    order = {name: index for index, name in enumerate(STAGES)}
+    return dict(
+        sorted(summary.items(), key=lambda item: order.get(item[0], len(order)))
+    )
+
+
+def clear_trace():
+    _trace.clear()
+
+
+def configure_slow_log(path: str, threshold_ms: float):
+    """Append stages slower than ``threshold_ms`` to a rotating log at ``path``.
+
+    An empty path or a non-positive threshold disables the log. Returns
+    whether logging is active.
+    """
+    threshold_ms = float(threshold_ms)
+    active = bool(path) and threshold_ms > 0.0
+    if path == _slow_log["path"] and (_slow_log["handler"] is not None) == active:
+        _slow_log["threshold_ms"] = threshold_ms
+        return active
+    handler = _slow_log["handler"]
+    if handler is not None:
+        _logger.removeHandler(handler)
+        handler.close()
+    _slow_log.update(path=path, threshold_ms=threshold_ms, handler=None)
+    if not active:
+        return False
+    try:
+        handler = logging.handlers.RotatingFileHandler(
+            path,
+            maxBytes=_SLOW_LOG_BYTES,
+            backupCount=_SLOW_LOG_BACKUPS,
+            encoding="utf-8",
+            delay=True,
+        )
+    except OSError:
+        return False
+    handler.setFormatter(logging.Formatter("%(asctime)s\t%(message)s"))
+    _logger.addHandler(handler)
+    _slow_log["handler"] = handler
+    return True
+
+
+def count_operation(name: str, amount=1):
+    """Add ``amount`` to an operation counter while a counting block is open."""
+    if _operation_state["depth"]:
+        _operation_counts[name] += amount
+
+
+def register_operation_source(name: str, snapshot):
+    """Merge ``snapshot()`` deltas into counting blocks; re-registering replaces."""
+    _operation_sources[name] = snapshot
+
+
+def _source_totals():
+    totals = Counter()
+    for snapshot in _operation_sources.values():
+        totals.update(snapshot())
+    return totals
+
+
+@contextmanager
+def counting_operations():
+    """Count pipeline work inside the block and yield the counts.
+
+    The yielded Counter is keyed by :data:`OPERATIONS` and is complete once the
+    outermost block exits; nested blocks share it.
+    """
+    outermost = not _operation_state["depth"]
+    if outermost:
+        _operation_counts.clear()
+        started = _source_totals()
+    _operation_state["depth"] += 1
+    try:
+        yield _operation_counts
+    finally:
+        _operation_state["depth"] -= 1
+        if outermost:
+            finished = _source_totals()
+            finished.subtract(started)
+            _operation_counts.update(+finished)
+
+
+def start_profile_capture(path: str, calls: int, describe=None) -> bool:
+    """Profile the next ``calls`` hooked calls, then write ``path`` + .prof/.txt.
+
+    ``describe`` returns header lines for the summary; it runs when the
+    capture finishes. Returns false while another capture is running.
+    """
+    if _profile_capture["profiler"] is not None:
+        return False
+    _profile_capture.update(
+        profiler=cProfile.Profile(),
+        path=path,
+        requested=max(1, int(calls)),
+        captured=0,
+        depth=0,
+        describe=describe,
+        result=None,
+    )
+    _profile_capture["calls"].clear()
+    return True
+
+
+def profile_capture_status() -> dict | None:
+    """Return the running capture's progress, or ``None``."""
+    if _profile_capture["profiler"] is None:
+        return None
+    return {
+        "path": _profile_capture["path"],
+        "captured": _profile_capture["captured"],
+        "requested": _profile_capture["requested"],
+    }
+
+
+def last_profile_capture() -> dict | None:
+    """Return ``{"paths": ...}`` or ``{"error": ...}`` for the last capture."""
+    return _profile_capture["result"]
+
+
+def finish_profile_capture() -> dict | None:
+    """Stop the running capture early or on its last call and write its files."""
+    profiler = _profile_capture["profiler"]
+    if profiler is None:
+        return None
+    profiler.disable()
+    _profile_capture["profiler"] = None
+    prof_path = f"{_profile_capture['path']}.prof"
+    summary_path = f"{_profile_capture['path']}.txt"
+    try:
+        profiler.dump_stats(prof_path)
+        with open(summary_path, "w", encoding="utf-8") as summary_file:
+            summary_file.write(_profile_summary(profiler))
+    except OSError as exc:
+        _profile_capture["result"] = {"error": str(exc)}
+    else:
+        _profile_capture["result"] = {"paths": (prof_path, summary_path)}
+    return _profile_capture["result"]
+
+
+def _profile_summary(profiler) -> str:
+    describe = _profile_capture["describe"]
+    try:
+        header = list(describe()) if describe is not None else []
+    except Exception as exc:  # A broken header must not lose the profile.
+        header = [f"Metadata unavailable: {exc!r}"]
+    lines = [f"Captured {time.strftime('%Y-%m-%d %H:%M:%S')}", *header, ""]
+    lines.append(f"Hooked calls: {_profile_capture['captured']}")
+    for name, count in _profile_capture["calls"].most_common():
+        lines.append(f"  {name}: {count}")
+    lines.append("")
+    stream = io.StringIO()
+    statistics = pstats.Stats(profiler, stream=stream)
+    statistics.sort_stats("cumulative").print_stats(_PROFILE_SUMMARY_LINES)
+    statistics.sort_stats("tottime").print_stats(_PROFILE_SUMMARY_LINES)
+    return "\n".join(lines) + stream.getvalue()
+
+
+def profiled(name: str):
+    """Decorate a hot entry point so profile captures include its calls.
+
+    Only outermost calls count toward a capture; nested hooked calls run
+    inside the same profiler.
+    """
+
+    def decorator(function):
+        @wraps(function)
+        def hooked(*args, **kwargs):
+            profiler = _profile_capture["profiler"]
+            if profiler is None:
+                return function(*args, **kwargs)
+            outermost = not _profile_capture["depth"]
+            if outermost:
+                _profile_capture["calls"][name] += 1
+                profiler.enable()
+            _profile_capture["depth"] += 1
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _profile_capture["depth"] -= 1
+                if outermost and _profile_capture["profiler"] is profiler:
+                    profiler.disable()
+                    _profile_capture["captured"] += 1
+                    if _profile_capture["captured"] >= _profile_capture["requested"]:
+                        finish_profile_capture()
+
+        return hooked
+
+    return decorator
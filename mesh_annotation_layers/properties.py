@@ -3,6 +3,7 @@
 import bpy
 
 from .constants import EDGE, FACE, VERTEX
+from .model import discard_element_layers_entry
 from .overlay import tag_surface_offset_redraw, tag_view3d_redraw
 
 
@@ -96,6 +97,21 @@ class MeshAnnotationSettings(bpy.types.PropertyGroup):
             context, invalidate_geometry=False
         ),
     )
+    overlay_face_display: bpy.props.EnumProperty(
+        name="Face Display",
+        items=(
+            ("FILL", "Fill", "Fill every annotated face"),
+            (
+                "OUTLINE",
+                "Outline",
+                "Draw only the boundary of each face layer with the edge style",
+            ),
+        ),
+        default="FILL",
+        update=lambda self, context: tag_view3d_redraw(
+            context, invalidate_geometry=False
+        ),
+    )
     overlay_face_offset: bpy.props.FloatProperty(
         name="Face Offset",
         description="Offset face overlays along the surface normal to avoid z-fighting",
@@ -156,9 +172,24 @@ class MeshAnnotationSettings(bpy.types.PropertyGroup):
     next_edge_layer_id: bpy.props.IntProperty(default=1)
     next_vertex_layer_id: bpy.props.IntProperty(default=1)
 
-    face_layers_data: bpy.props.StringProperty(default="{}")
-    edge_layers_data: bpy.props.StringProperty(default="{}")
-    vertex_layers_data: bpy.props.StringProperty(default="{}")
+    face_layers_data: bpy.props.StringProperty(
+        default="{}",
+        update=lambda self, context: discard_element_layers_entry(self, FACE),
+    )
+    edge_layers_data: bpy.props.StringProperty(
+        default="{}",
+        update=lambda self, context: discard_element_layers_entry(self, EDGE),
+    )
+    vertex_layers_data: bpy.props.StringProperty(
+        default="{}",
+        update=lambda self, context: discard_element_layers_entry(self, VERTEX),
+    )
+
+    # Content digests written together with the JSON above.  Decode caches
+    # compare these few bytes instead of fetching the full string from RNA.
+    face_layers_hash: bpy.props.StringProperty(default="", options={'HIDDEN'})
+    edge_layers_hash: bpy.props.StringProperty(default="", options={'HIDDEN'})
+    vertex_layers_hash: bpy.props.StringProperty(default="", options={'HIDDEN'})
 
     # A digest of the last proven JSON/BMesh/topology state.  It prevents an
     # Object-local index mapping from being trusted after its Mesh is shared
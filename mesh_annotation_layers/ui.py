@@ -1,8 +1,11 @@
 """Viewport menus, layer list, and sidebar panels."""
 
+import os
+
 import bpy
 
 from .constants import EDGE, ELEMENT_TYPES, FACE, VERTEX, element_spec
+from .caches import cache_statistics, memory_by_owner
 from .i18n import tr
 from .model import (
     active_layer,
@@ -11,6 +14,7 @@ from .model import (
     get_layer_collection,
     infer_element_type_from_mode,
 )
+from .profiling import last_profile_capture, profile_capture_status, stage_summary
 
 
 def draw_existing_layer_menu(layout, obj, element_type: str, use_loop: bool):
@@ -447,6 +451,7 @@ class VIEW3D_PT_mesh_annotation_display(bpy.types.Panel):
 
         content.separator()
         content.label(text=tr('Faces'), icon="FACESEL")
+        content.prop(settings, "overlay_face_display", text=tr('Display Mode'))
         content.prop(settings, "overlay_face_offset", text=tr('Surface Offset'))
 
         content.separator()
@@ -464,6 +469,123 @@ class VIEW3D_PT_mesh_annotation_display(bpy.types.Panel):
         layout.prop(settings, "debug_output", text=tr('Debug Output'))
 
 
+def draw_cache_statistics(layout):
+    cache_labels = {
+        "annotations": tr('Annotations'),
+        "decoded_annotations": tr('Decoded Mappings'),
+        "bmesh_sync_states": tr('Stack Sync States'),
+        "state_chunks": tr('State Chunks'),
+        "shared_proofs": tr('Shared Mesh Proofs'),
+        "overlay_batches": tr('Overlay Batches'),
+        "overlay_geometry": tr('Overlay Geometry'),
+    }
+    megabyte = 1024 * 1024
+    layout.separator()
+    grid = layout.grid_flow(row_major=True, columns=3, even_columns=False)
+    grid.label(text=tr('Cache'))
+    grid.label(text=tr('Hit Rate'))
+    grid.label(text=tr('Memory (MB)'))
+    for name, statistics in cache_statistics().items():
+        grid.label(text=cache_labels.get(name, name))
+        grid.label(text=f"{statistics['hit_rate'] * 100.0:.0f}%")
+        memory = f"{statistics['bytes'] / megabyte:.1f}"
+        if statistics["budget_bytes"]:
+            memory = f"{memory} / {statistics['budget_bytes'] / megabyte:.0f}"
+        grid.label(text=memory)
+    owners = memory_by_owner(5)
+    if owners:
+        layout.label(text=tr('Cached Memory by Object'))
+        column = layout.column(align=True)
+        for owner, nbytes in owners:
+            row = column.row()
+            row.label(text=owner, icon="OBJECT_DATA")
+            row.label(text=f"{nbytes / megabyte:.1f} MB")
+
+
+def draw_profile_capture(layout):
+    layout.separator()
+    status = profile_capture_status()
+    if status is not None:
+        layout.label(
+            text=tr(
+                'Capturing profile: {captured} / {requested} calls',
+                captured=status["captured"],
+                requested=status["requested"],
+            ),
+            icon="REC",
+        )
+        layout.operator(
+            "mesh.annotation_capture_profile",
+            text=tr('Stop and Save Profile'),
+            icon="CHECKMARK",
+        )
+        return
+    layout.operator(
+        "mesh.annotation_capture_profile",
+        text=tr('Capture Profile'),
+        icon="REC",
+    )
+    result = last_profile_capture()
+    if result is None:
+        return
+    if "error" in result:
+        layout.label(
+            text=tr('Profile failed: {error}', error=result["error"]), icon="ERROR"
+        )
+    else:
+        name = os.path.basename(result["paths"][0])
+        layout.label(text=tr('Last profile: {name}', name=name), icon="FILE")
+
+
+class VIEW3D_PT_mesh_annotation_performance(bpy.types.Panel):
+    bl_label = tr('Performance')
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = tr('Mesh Annotation')
+    bl_parent_id = "VIEW3D_PT_mesh_annotation"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        return obj and obj.type == "MESH"
+
+    def draw(self, _context):
+        layout = self.layout
+        stage_labels = {
+            "load": tr('Mapping Load'),
+            "reconcile": tr('Stack Reconciliation'),
+            "source_mapping": tr('Source Mapping'),
+            "extract": tr('Extraction'),
+            "bucket": tr('Bucketing'),
+            "upload": tr('GPU Upload'),
+            "build": tr('Total Build'),
+            "draw": tr('Draw'),
+        }
+        summary = stage_summary()
+        if not summary:
+            layout.label(text=tr('No timings recorded yet'), icon="INFO")
+        else:
+            grid = layout.grid_flow(row_major=True, columns=3, even_columns=False)
+            grid.label(text=tr('Stage'))
+            grid.label(text=tr('Last / Max (ms)'))
+            grid.label(text=tr('Elements'))
+            for stage, entry in summary.items():
+                label = stage_labels.get(stage, stage)
+                if entry["last_detail"]:
+                    label = f"{label} ({entry['last_detail']})"
+                grid.label(text=label)
+                grid.label(text=f"{entry['last_ms']:.2f} / {entry['max_ms']:.2f}")
+                grid.label(text=str(entry["last_count"]))
+            layout.operator(
+                "mesh.annotation_clear_timings",
+                text=tr('Clear Timings'),
+                icon="TRASH",
+            )
+        draw_cache_statistics(layout)
+        draw_profile_capture(layout)
+
+
 def draw_context_menu(self, context):
     obj = context.object
     if not obj or obj.type != "MESH" or context.mode != "EDIT_MESH":
@@ -484,6 +606,7 @@ CLASSES = (
     VIEW3D_MT_mesh_annotation_context,
     VIEW3D_PT_mesh_annotation,
     VIEW3D_PT_mesh_annotation_display,
+    VIEW3D_PT_mesh_annotation_performance,
 )
 
 
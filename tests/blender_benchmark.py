@@ -0,0 +1,315 @@
+"""Scaling benchmarks for the annotation pipeline.
+
+Run with:
+blender --background --factory-startup --python tests/blender_benchmark.py \
+    --python-exit-code 1 -- --sizes 10000,100000,1000000 --output bench.json
+
+Pass ``--baseline tests/benchmark_baseline.json`` to compare against stored
+results, or ``--write-baseline`` to replace that file with this run.
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import bmesh
+import bpy
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import mesh_annotation_layers as addon
+from mesh_annotation_layers import evaluated_geometry, model, overlay, profiling
+from mesh_annotation_layers.constants import EDGE, FACE, VERTEX, element_spec
+
+DEFAULT_BASELINE = ROOT / "tests" / "benchmark_baseline.json"
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+# Modifier stacks as (type, settings) pairs; Boolean forces NEAREST mapping.
+STACKS = {
+    "NONE": (),
+    "SUBSURF_1": (("SUBSURF", {"levels": 1}),),
+    "SUBSURF_2": (("SUBSURF", {"levels": 2}),),
+    "SUBSURF_3": (("SUBSURF", {"levels": 3}),),
+    "MIRROR_SUBSURF": (("MIRROR", {}), ("SUBSURF", {"levels": 1})),
+    "BOOLEAN": (("BOOLEAN", {"operation": "DIFFERENCE"}),),
+}
+STACK_GROWTH = {
+    "NONE": 1,
+    "SUBSURF_1": 4,
+    "SUBSURF_2": 16,
+    "SUBSURF_3": 64,
+    "MIRROR_SUBSURF": 8,
+    "BOOLEAN": 1,
+}
+ASSIGNED_SHARE = 0.1
+
+
+def parse_arguments():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="comma-separated source face counts",
+    )
+    parser.add_argument(
+        "--stacks",
+        default=",".join(STACKS),
+        help="comma-separated modifier stacks: " + ", ".join(STACKS),
+    )
+    parser.add_argument(
+        "--max-evaluated-faces",
+        type=int,
+        default=16_000_000,
+        help="skip cases whose evaluated mesh would exceed this many faces",
+    )
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    parser.add_argument("--baseline", type=Path, help="compare against this JSON")
+    parser.add_argument(
+        "--write-baseline",
+        action="store_true",
+        help=f"store this run as {DEFAULT_BASELINE.relative_to(ROOT)}",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown before a timing counts as a regression",
+    )
+    parser.add_argument(
+        "--min-ms",
+        type=float,
+        default=2.0,
+        help="absolute slack in milliseconds added to every comparison",
+    )
+    return parser.parse_args(argv)
+
+
+@contextmanager
+def stubbed_gpu_uploads():
+    """Prepare batch data without a GPU context in background sessions."""
+    if not bpy.app.background:
+        yield
+        return
+    original_shader_builder = overlay.gpu.shader.from_builtin
+    original_batch_builder = overlay.batch_for_shader
+    try:
+        overlay.gpu.shader.from_builtin = lambda _name: object()
+        overlay.batch_for_shader = lambda *_args, **_kwargs: object()
+        yield
+    finally:
+        overlay.gpu.shader.from_builtin = original_shader_builder
+        overlay.batch_for_shader = original_batch_builder
+
+
+def create_case_object(face_count, stack_name):
+    segments = max(2, round(math.sqrt(face_count)))
+    mesh = bpy.data.meshes.new(f"Benchmark{stack_name}Mesh")
+    source = bmesh.new()
+    bmesh.ops.create_grid(source, x_segments=segments, y_segments=segments, size=2.0)
+    source.to_mesh(mesh)
+    source.free()
+    obj = bpy.data.objects.new(f"Benchmark{stack_name}", mesh)
+    bpy.context.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+    cutter = None
+    for modifier_type, options in STACKS[stack_name]:
+        modifier = obj.modifiers.new(modifier_type.title(), modifier_type)
+        for name, value in options.items():
+            setattr(modifier, name, value)
+        if modifier_type == "BOOLEAN":
+            bpy.ops.mesh.primitive_cube_add(size=0.8, location=(0.3, 0.3, 0.0))
+            cutter = bpy.context.object
+            cutter.hide_set(True)
+            modifier.object = cutter
+            bpy.context.view_layer.objects.active = obj
+    return obj, cutter
+
+
+def timed(timings, name, callback):
+    started = time.perf_counter()
+    result = callback()
+    timings[name] = round((time.perf_counter() - started) * 1000.0, 3)
+    return result
+
+
+def run_case(face_count, stack_name):
+    obj, cutter = create_case_object(face_count, stack_name)
+    settings = obj.mesh_annotations
+    mesh = obj.data
+    timings = {}
+    try:
+        layers = {}
+        selections = {}
+        for element_type, container in (
+            (FACE, mesh.polygons),
+            (EDGE, mesh.edges),
+            (VERTEX, mesh.vertices),
+        ):
+            layers[element_type] = model.create_layer(settings, element_type)
+            step = max(1, round(1.0 / ASSIGNED_SHARE))
+            selections[element_type] = range(0, len(container), step)
+        timings["assign"] = 0.0
+        for element_type, indices in selections.items():
+            started = time.perf_counter()
+            assert model.assign_elements_to_layer(
+                obj, element_type, layers[element_type].layer_id, indices
+            )
+            timings["assign"] += (time.perf_counter() - started) * 1000.0
+        timings["assign"] = round(timings["assign"], 3)
+
+        model.invalidate_element_layers_cache()
+        mappings = timed(
+            timings,
+            "load",
+            lambda: {
+                element_type: model.load_element_layers(settings, element_type)
+                for element_type in selections
+            },
+        )
+
+        bm = bmesh.new()
+        try:
+            bm.from_mesh(mesh)
+            model.ensure_lookup_tables(bm, FACE)
+            stack_layer = bm.faces.layers.string.get(element_spec(FACE).stack_layer)
+            timed(
+                timings,
+                "reconcile",
+                lambda: model.merge_stack_layer_if_needed(
+                    mappings[FACE], mesh, bm, stack_layer, FACE, force=True
+                ),
+            )
+            model.discard_annotation_state_chunks(mesh)
+            timed(
+                timings,
+                "fingerprint",
+                lambda: model.annotation_state_fingerprint(bm, FACE, mappings[FACE]),
+            )
+            source_filters = {
+                element_type: {int(key) for key in mapping}
+                for element_type, mapping in mappings.items()
+            }
+            profiling.clear_trace()
+            timed(
+                timings,
+                "source_mapping_and_extract",
+                lambda: evaluated_geometry.evaluated_overlay_geometry(
+                    obj, bm, settings, source_filters
+                ),
+            )
+        finally:
+            bm.free()
+        stages = profiling.stage_summary()
+        mapping_stage = stages.get("source_mapping", {})
+        timings["source_mapping"] = round(mapping_stage.get("total_ms", 0.0), 3)
+        timings["extract"] = round(stages.get("extract", {}).get("total_ms", 0.0), 3)
+
+        overlay.invalidate_overlay_state()
+        profiling.clear_trace()
+        with stubbed_gpu_uploads():
+            timed(
+                timings,
+                "batch_preparation",
+                lambda: overlay.build_overlay_batches(obj, settings),
+            )
+        timings["bucket"] = round(
+            profiling.stage_summary().get("bucket", {}).get("total_ms", 0.0), 3
+        )
+
+        timed(
+            timings,
+            "clear",
+            lambda: model.clear_elements_from_layer(
+                obj, FACE, layers[FACE].layer_id, only_selected=False, mode="ALL"
+            ),
+        )
+        evaluated = obj.evaluated_get(bpy.context.evaluated_depsgraph_get()).data
+        return {
+            "faces": len(mesh.polygons),
+            "evaluated_faces": len(evaluated.polygons),
+            "mapping_mode": mapping_stage.get("last_detail", ""),
+            "timings_ms": timings,
+        }
+    finally:
+        overlay.invalidate_overlay_state()
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if cutter is not None:
+            bpy.data.objects.remove(cutter, do_unlink=True)
+
+
+def compare_with_baseline(results, baseline, tolerance, min_ms):
+    """Return ``(case, timing, baseline_ms, measured_ms)`` for each regression."""
+    regressions = []
+    for case_key, case in results["cases"].items():
+        reference = baseline.get("cases", {}).get(case_key)
+        if not reference or "timings_ms" not in case:
+            continue
+        for name, measured in case["timings_ms"].items():
+            expected = reference.get("timings_ms", {}).get(name)
+            if expected is None:
+                continue
+            if measured > expected * (1.0 + tolerance) + min_ms:
+                regressions.append((case_key, name, expected, measured))
+    return regressions
+
+
+def main():
+    arguments = parse_arguments()
+    sizes = [int(size) for size in arguments.sizes.split(",") if size]
+    stacks = [stack for stack in arguments.stacks.split(",") if stack]
+    unknown = set(stacks) - set(STACKS)
+    if unknown:
+        raise SystemExit(f"Unknown stacks: {', '.join(sorted(unknown))}")
+
+    addon.register()
+    try:
+        results = {
+            "blender": bpy.app.version_string,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cases": {},
+        }
+        for face_count in sizes:
+            for stack_name in stacks:
+                case_key = f"{stack_name}@{face_count}"
+                if face_count * STACK_GROWTH[stack_name] > arguments.max_evaluated_faces:
+                    results["cases"][case_key] = {"skipped": "evaluated mesh too large"}
+                    print(f"{case_key}: skipped")
+                    continue
+                case = run_case(face_count, stack_name)
+                results["cases"][case_key] = case
+                print(f"{case_key}: {json.dumps(case['timings_ms'])}")
+    finally:
+        addon.unregister()
+
+    encoded = json.dumps(results, indent=2, sort_keys=True)
+    if arguments.output:
+        arguments.output.write_text(encoded + "\n", encoding="utf-8")
+    if arguments.write_baseline:
+        DEFAULT_BASELINE.write_text(encoded + "\n", encoding="utf-8")
+
+    baseline_path = arguments.baseline
+    if baseline_path is None and not arguments.write_baseline and DEFAULT_BASELINE.exists():
+        baseline_path = DEFAULT_BASELINE
+    if baseline_path is None:
+        return
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = compare_with_baseline(
+        results, baseline, arguments.tolerance, arguments.min_ms
+    )
+    for case_key, name, expected, measured in regressions:
+        print(f"REGRESSION {case_key} {name}: {expected:.2f} ms -> {measured:.2f} ms")
+    if regressions:
+        raise SystemExit(1)
+    print("BLENDER_BENCHMARK_OK", len(results["cases"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Import and registration cost of the add-on in fresh Blender processes.
+
+Run with:
+blender --background --factory-startup --python tests/blender_import_benchmark.py \
+    --python-exit-code 1 -- --repeat 5 --output import_bench.json
+
+Every repeat starts a new background Blender, so module execution is measured
+cold (bytecode caches stay warm). The run fails when registration loads one
+of the deferred submodules, or with ``--baseline`` when a timing regresses.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from pathlib import Path
+
+import bpy
+
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = "mesh_annotation_layers"
+MARKER = "IMPORT_BENCHMARK "
+CHILD_SOURCE = f"""
+import json
+import sys
+import time
+
+sys.path.insert(0, {str(ROOT)!r})
+started = time.perf_counter()
+import {PACKAGE} as addon
+imported = time.perf_counter()
+addon.register()
+registered = time.perf_counter()
+loaded = sorted(
+    name.rpartition(".")[2]
+    for name in sys.modules
+    if name.startswith("{PACKAGE}.")
+)
+addon.unregister()
+print({MARKER!r} + json.dumps({{
+    "import_ms": (imported - started) * 1000.0,
+    "register_ms": (registered - imported) * 1000.0,
+    "loaded": loaded,
+    "deferred": list(addon._DEFERRED_SUBMODULES),
+}}))
+"""
+
+
+def parse_arguments():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    parser.add_argument("--baseline", type=Path, help="compare against this JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-ms", type=float, default=2.0)
+    return parser.parse_args(argv)
+
+
+def measure_once():
+    completed = subprocess.run(
+        [
+            bpy.app.binary_path,
+            "--background",
+            "--factory-startup",
+            "--python-exit-code",
+            "1",
+            "--python-expr",
+            CHILD_SOURCE,
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith(MARKER):
+            return json.loads(line[len(MARKER) :])
+    raise SystemExit(
+        f"Child Blender failed ({completed.returncode}):\n{completed.stderr}"
+    )
+
+
+def main():
+    arguments = parse_arguments()
+    runs = [measure_once() for _attempt in range(max(1, arguments.repeat))]
+    results = {
+        "blender": bpy.app.version_string,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timings_ms": {
+            name: round(min(run[name] for run in runs), 3)
+            for name in ("import_ms", "register_ms")
+        },
+        "loaded": runs[0]["loaded"],
+    }
+    print(json.dumps(results["timings_ms"]))
+    print("Loaded submodules:", ", ".join(results["loaded"]))
+    if arguments.output:
+        arguments.output.write_text(
+            json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+
+    failures = [
+        f"deferred submodule {name} loaded at registration"
+        for name in runs[0]["deferred"]
+        if name in results["loaded"]
+    ]
+    if arguments.baseline:
+        baseline = json.loads(arguments.baseline.read_text(encoding="utf-8"))
+        for name, measured in results["timings_ms"].items():
+            expected = baseline.get("timings_ms", {}).get(name)
+            if expected is not None and measured > expected * (
+                1.0 + arguments.tolerance
+            ) + arguments.min_ms:
+                failures.append(f"{name}: {expected:.2f} ms -> {measured:.2f} ms")
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        raise SystemExit(1)
+    print("IMPORT_BENCHMARK_OK", len(runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ from types import SimpleNamespace
 
 import bmesh
 import bpy
+from mathutils import Matrix, Vector
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -20,7 +21,17 @@ sys.path.insert(0, str(ROOT))
 GRID_SEGMENTS = int(os.environ.get("MAL_GRID_SEGMENTS", "28"))
 
 import mesh_annotation_layers as addon
-from mesh_annotation_layers import evaluated_geometry, i18n, model, operators, overlay, ui
+from mesh_annotation_layers import (
+    caches,
+    codec,
+    evaluated_geometry,
+    i18n,
+    model,
+    operators,
+    overlay,
+    profiling,
+    ui,
+)
 from mesh_annotation_layers.constants import EDGE, FACE, VERTEX, element_spec
 
 
@@ -37,6 +48,9 @@ class UILayoutProbe:
     def column(self, **_kwargs):
         return self
 
+    def grid_flow(self, **_kwargs):
+        return self
+
     def box(self):
         return self
 
@@ -99,6 +113,13 @@ def test_extension_namespace_package_name():
         )
         namespaced_addon.register()
         assert hasattr(bpy.types.Object, "mesh_annotations")
+        for name in namespaced_addon._DEFERRED_SUBMODULES:
+            assert f"{package_name}.{name}" not in sys.modules, name
+        assert not bpy.app.timers.is_registered(
+            namespaced_addon.overlay._precompile_surface_shader
+        )
+        assert namespaced_addon.loops.collect_edge_loop_edges
+        assert f"{package_name}.loops" in sys.modules
         namespaced_addon.unregister()
         assert not hasattr(bpy.types.Object, "mesh_annotations")
     finally:
@@ -227,19 +248,19 @@ def bmesh_stack_payloads(mesh, element_type):
 
 def test_binary_stack_contract():
     boundary_ids = [1, 127, 128, 16_384, 2_147_483_647]
-    payload = model.encode_layers(boundary_ids)
-    assert model.decode_layer_bytes(payload) == boundary_ids
+    payload = codec.encode_layers(boundary_ids)
+    assert codec.decode_layer_bytes(payload) == boundary_ids
     assert len(payload) <= 255
     for damaged in (payload[:-1], payload[:-5] + b"xxxxx"):
         try:
-            model.decode_layer_bytes(damaged)
-        except model.StackEncodingError:
+            codec.decode_layer_bytes(damaged)
+        except codec.StackEncodingError:
             pass
         else:
             raise AssertionError("damaged stack was accepted")
 
     dense_ids = [*range(1, 185), 16_384]
-    dense_payload = model.encode_layers(dense_ids)
+    dense_payload = codec.encode_layers(dense_ids)
     assert len(dense_payload) == 255
     mesh = bpy.data.meshes.new("BinaryStackRoundTrip")
     bm = bmesh.new()
@@ -256,7 +277,7 @@ def test_binary_stack_contract():
         restored_layer = roundtrip.verts.layers.string.get("binary_stack")
         restored = bytes(roundtrip.verts[0][restored_layer])
         assert len(restored) == len(dense_payload)
-        assert model.decode_layer_bytes(restored) == dense_ids
+        assert codec.decode_layer_bytes(restored) == dense_ids
     finally:
         roundtrip.free()
         bpy.data.meshes.remove(mesh)
@@ -272,7 +293,7 @@ def test_binary_stack_contract():
                 VERTEX,
                 {"0": oversized},
             )
-        except model.StackCapacityError:
+        except codec.StackCapacityError:
             pass
         else:
             raise AssertionError("over-capacity stack was accepted")
@@ -288,7 +309,7 @@ def test_binary_stack_contract():
         bm.verts.ensure_lookup_table()
         legacy_layer = bm.verts.layers.string.new("legacy_stack")
         known_ids = list(range(1, 151))
-        legacy_prefix = model._legacy_prefix(known_ids)
+        legacy_prefix = codec.legacy_prefix(known_ids)
         legacy_bytes = ",".join(
             str(layer_id) for layer_id in legacy_prefix
         ).encode("ascii")
@@ -328,6 +349,91 @@ def test_binary_stack_contract():
         bm.free()
 
 
+def test_stack_payloads_are_interned():
+    codec.clear_stack_memo()
+    obj = create_grid_object()
+    obj.name = "InternedStacks"
+    settings = obj.mesh_annotations
+    for layer_id in (1, 2):
+        layer = settings.face_layers.add()
+        layer.layer_id = layer_id
+        layer.element_type = FACE
+        layer.name = f"Interned Face {layer_id}"
+    settings.next_face_layer_id = 3
+    face_count = len(obj.data.polygons)
+    assert model.assign_elements_to_layer(obj, FACE, 1, range(face_count))
+    assert model.assign_elements_to_layer(obj, FACE, 2, range(0, face_count, 2))
+    statistics = codec.stack_memo_statistics()
+    assert statistics["encode_entries"] <= 4
+    assert statistics["encode_hits"] > face_count
+
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(obj.data)
+        stack_layer = bm.faces.layers.string.get(element_spec(FACE).stack_layer)
+        mapping = {}
+        assert model.merge_stack_layer_into_mapping(
+            mapping, bm, stack_layer, FACE
+        ) == (True, True)
+        assert mapping == model.load_element_layers(settings, FACE)
+        # Interned stacks must never alias the lists callers go on to edit.
+        mapping["0"].append(99)
+        assert codec.decode_layer_bytes(bytes(bm.faces[0][stack_layer])) != mapping["0"]
+    finally:
+        bm.free()
+    statistics = codec.stack_memo_statistics()
+    assert statistics["decode_entries"] <= 2
+    assert statistics["decode_hit_rate"] > 0.9
+
+
+def test_state_fingerprint_rehashes_changed_chunks():
+    obj = create_grid_object()
+    obj.name = "ChunkedStateFingerprint"
+    settings = obj.mesh_annotations
+    layer = settings.face_layers.add()
+    layer.layer_id = 1
+    layer.element_type = FACE
+    layer.name = "Chunked Face"
+    settings.next_face_layer_id = 2
+    original_chunk_size = model._STATE_CHUNK_SIZE
+    original_chunk_digest = model._state_chunk_digest
+    hashed_chunks = []
+
+    def counting_chunk_digest(bm, element_type, container, stack_layer, indices):
+        hashed_chunks.append(tuple(indices))
+        return original_chunk_digest(bm, element_type, container, stack_layer, indices)
+
+    model._STATE_CHUNK_SIZE = 16
+    model._state_chunk_digest = counting_chunk_digest
+    try:
+        model.discard_annotation_state_chunks(obj.data)
+        assert model.assign_elements_to_layer(obj, FACE, 1, range(40))
+        assert len(hashed_chunks) >= 3
+        hashed_chunks.clear()
+        assert model.assign_elements_to_layer(obj, FACE, 1, [100, 101])
+        assert hashed_chunks == [(100, 101)]
+        bm = bmesh.new()
+        try:
+            bm.from_mesh(obj.data)
+            mapping = model.load_element_layers(settings, FACE)
+            assert settings.face_annotation_state == model.annotation_state_fingerprint(
+                bm, FACE, mapping
+            )
+            legacy_token = model._legacy_state_fingerprint(bm, FACE, mapping)
+        finally:
+            bm.free()
+    finally:
+        model._STATE_CHUNK_SIZE = original_chunk_size
+        model._state_chunk_digest = original_chunk_digest
+        model.discard_annotation_state_chunks(obj.data)
+
+    # Tokens written by earlier releases still prove a shared Mesh.
+    settings.face_annotation_state = legacy_token
+    linked = bpy.data.objects.new("ChunkedStateLinked", obj.data)
+    bpy.context.collection.objects.link(linked)
+    assert model.shared_annotation_mapping_statuses(obj)[FACE]
+
+
 def test_sparse_stack_initialization_and_rebuild():
     bm = bmesh.new()
     try:
@@ -339,20 +445,20 @@ def test_sparse_stack_initialization_and_rebuild():
             bm, VERTEX, mapping
         )
         assert created
-        assert model.decode_layer_bytes(bytes(bm.verts[10][stack_layer])) == [1]
+        assert codec.decode_layer_bytes(bytes(bm.verts[10][stack_layer])) == [1]
         assert all(
             not bytes(vert[stack_layer])
             for vert in bm.verts
             if vert.index != 10
         )
 
-        bm.verts[20][stack_layer] = model.encode_layers([2])
+        bm.verts[20][stack_layer] = codec.encode_layers([2])
         rebuilt_layer, created = model.ensure_annotation_stack(
             bm, VERTEX, mapping, rebuild=True
         )
         assert not created
         stack_layer = rebuilt_layer
-        assert model.decode_layer_bytes(bytes(bm.verts[10][stack_layer])) == [1]
+        assert codec.decode_layer_bytes(bytes(bm.verts[10][stack_layer])) == [1]
         assert not bytes(bm.verts[20][stack_layer])
     finally:
         bm.free()
@@ -376,7 +482,7 @@ def test_capacity_failure_is_atomic():
     before_stack = bmesh_stack_payloads(obj.data, VERTEX)
     try:
         model.assign_elements_to_layer(obj, VERTEX, 220, [0])
-    except model.StackCapacityError:
+    except codec.StackCapacityError:
         pass
     else:
         raise AssertionError("over-capacity assignment was accepted")
@@ -395,10 +501,10 @@ def test_capacity_failure_is_atomic():
     if stack_layer is None:
         stack_layer = bm.verts.layers.string.new(element_spec(VERTEX).stack_layer)
     legacy = ",".join(
-        str(layer_id) for layer_id in model._legacy_prefix(original_mapping["0"])
+        str(layer_id) for layer_id in codec.legacy_prefix(original_mapping["0"])
     ).encode("ascii")
     bm.verts[0][stack_layer] = legacy
-    bm.verts[1][stack_layer] = model.encode_layers([1])
+    bm.verts[1][stack_layer] = codec.encode_layers([1])
     for vert in bm.verts:
         vert.select = vert.index == 1
     bm.to_mesh(obj.data)
@@ -410,7 +516,7 @@ def test_capacity_failure_is_atomic():
         model.clear_elements_from_layer(
             obj, VERTEX, 1, only_selected=True, mode="ALL"
         )
-    except model.StackCapacityError:
+    except codec.StackCapacityError:
         pass
     else:
         raise AssertionError("cross-element capacity failure was accepted")
@@ -424,7 +530,7 @@ def test_capacity_failure_is_atomic():
     bm.from_mesh(obj.data)
     bm.verts.ensure_lookup_table()
     stack_layer = bm.verts.layers.string.get(element_spec(VERTEX).stack_layer)
-    bm.verts[1][stack_layer] = model.encode_layers([2])
+    bm.verts[1][stack_layer] = codec.encode_layers([2])
     bm.to_mesh(obj.data)
     bm.free()
     model.invalidate_element_layers_cache()
@@ -434,7 +540,7 @@ def test_capacity_failure_is_atomic():
         try:
             model.ensure_lookup_tables(bm, VERTEX)
             model.reconciled_mapping_for_explicit_read(obj, VERTEX, bm)
-        except model.StackCapacityError:
+        except codec.StackCapacityError:
             pass
         else:
             raise AssertionError("incomplete unsavable merge was accepted")
@@ -611,8 +717,8 @@ def test_shared_mesh_isolation_and_recovery():
         assert bpy.context.mode == "EDIT_MESH"
         assert model.load_element_layers(linked_settings, FACE) == {"11": [1]}
         rebuilt = bmesh_stack_payloads(linked.data, FACE)
-        assert model.decode_layer_bytes(rebuilt[11]) == [1]
-        assert model.decode_layer_bytes(rebuilt[10]) == []
+        assert codec.decode_layer_bytes(rebuilt[11]) == [1]
+        assert codec.decode_layer_bytes(rebuilt[10]) == []
         assert bpy.ops.mesh.annotation_assign_active(element_type=FACE) == {"FINISHED"}
         assert model.load_element_layers(linked_settings, FACE)["12"] == [1]
         assert model.load_element_layers(base.mesh_annotations, FACE) == {"10": [1]}
@@ -705,7 +811,7 @@ def test_discard_recovery_only_clears_unverified_element_types():
             "1": [edge_layer.layer_id]
         }
         edge_payloads = bmesh_stack_payloads(base.data, EDGE)
-        assert model.decode_layer_bytes(edge_payloads[1]) == [edge_layer.layer_id]
+        assert codec.decode_layer_bytes(edge_payloads[1]) == [edge_layer.layer_id]
     finally:
         bpy.data.objects.remove(linked, do_unlink=True)
         bpy.data.objects.remove(base, do_unlink=True)
@@ -790,7 +896,7 @@ def test_shared_proof_rejects_untracked_inherited_stack_payloads():
 
         assert (len(bm.verts), len(bm.edges), len(bm.faces)) == (6, 6, 2)
         stack_layer = bm.faces.layers.string.get(element_spec(FACE).stack_layer)
-        assert [model.decode_layer_bytes(bytes(face[stack_layer])) for face in bm.faces] == [
+        assert [codec.decode_layer_bytes(bytes(face[stack_layer])) for face in bm.faces] == [
             [layer.layer_id],
             [layer.layer_id],
         ]
@@ -815,6 +921,104 @@ def test_shared_proof_rejects_untracked_inherited_stack_payloads():
         bpy.data.objects.remove(base, do_unlink=True)
 
 
+def test_shared_proofs_are_cached_until_mesh_or_data_changes():
+    base = create_grid_object()
+    base.name = "CachedSharedProofBase"
+    layer = model.create_layer(base.mesh_annotations, FACE)
+    assert model.assign_elements_to_layer(base, FACE, layer.layer_id, [0, 1])
+    linked = bpy.data.objects.new("CachedSharedProofLinked", base.data)
+    bpy.context.collection.objects.link(linked)
+    original_matches = model._complete_stack_matches_mapping
+    scans = []
+
+    def counting_matches(bm, element_type, mapping):
+        scans.append(element_type)
+        return original_matches(bm, element_type, mapping)
+
+    model._complete_stack_matches_mapping = counting_matches
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(base.data)
+        model.ensure_lookup_tables(bm, FACE)
+        assert model.shared_annotation_mapping_is_current(base, FACE, bm)
+        assert model.shared_annotation_mapping_is_current(base, FACE, bm)
+        assert scans == [FACE]
+
+        model.discard_annotation_state_chunks(base.data)
+        assert model.shared_annotation_mapping_is_current(base, FACE, bm)
+        assert len(scans) == 2
+
+        base.mesh_annotations.face_layers_data = '{"0":[%d]}' % layer.layer_id
+        assert not model.shared_annotation_mapping_is_current(base, FACE, bm)
+        assert len(scans) == 3
+    finally:
+        model._complete_stack_matches_mapping = original_matches
+        bm.free()
+        bpy.data.objects.remove(linked, do_unlink=True)
+        bpy.data.objects.remove(base, do_unlink=True)
+
+
+def test_mesh_geometry_generations_stay_bounded():
+    model.invalidate_element_layers_cache()
+    limit = model._BMESH_SYNC_CACHE_LIMIT
+    first = SimpleNamespace(session_uid=-1)
+    model._SHARED_PROOFS[first.session_uid] = {}
+    model.note_mesh_geometry_update(first)
+    for offset in range(limit):
+        model.note_mesh_geometry_update(SimpleNamespace(session_uid=-2 - offset))
+    assert len(model._MESH_GEOMETRY_GENERATIONS) == limit
+    # The oldest Mesh reads generation 0 again, so its proofs are dropped.
+    assert first.session_uid not in model._MESH_GEOMETRY_GENERATIONS
+    assert first.session_uid not in model._SHARED_PROOFS
+    model.invalidate_element_layers_cache()
+
+
+def test_renumbered_shared_mesh_is_reproved():
+    base = create_grid_object()
+    base.name = "RenumberedSharedProofBase"
+    layer = model.create_layer(base.mesh_annotations, FACE)
+    assert model.assign_elements_to_layer(base, FACE, layer.layer_id, [0, 1])
+    linked = bpy.data.objects.new("RenumberedSharedProofLinked", base.data)
+    bpy.context.collection.objects.link(linked)
+
+    def proof_is_current():
+        bm = bmesh.new()
+        try:
+            bm.from_mesh(base.data)
+            model.ensure_lookup_tables(bm, FACE)
+            return model.shared_annotation_mapping_is_current(base, FACE, bm)
+        finally:
+            bm.free()
+
+    try:
+        assert proof_is_current()
+        # Reversing the face order keeps every element count.
+        bm = bmesh.new()
+        bm.from_mesh(base.data)
+        bm.faces.sort(key=lambda face: -face.index)
+        bm.to_mesh(base.data)
+        bm.free()
+        overlay.invalidate_overlay_cache()
+        overlay.annotation_depsgraph_update_post(
+            None,
+            SimpleNamespace(
+                updates=[
+                    SimpleNamespace(
+                        is_updated_geometry=True,
+                        is_updated_transform=False,
+                        id=base.data,
+                    )
+                ]
+            ),
+        )
+        assert not model._ANNOTATION_SELF_UPDATES
+        assert (base.data.session_uid, FACE) not in model._STATE_CHUNKS
+        assert not proof_is_current()
+    finally:
+        bpy.data.objects.remove(linked, do_unlink=True)
+        bpy.data.objects.remove(base, do_unlink=True)
+
+
 def test_shared_proof_rejects_invalid_or_lossy_json():
     base = create_two_triangle_object("InvalidSharedJsonBase")
     linked = bpy.data.objects.new("InvalidSharedJsonLinked", base.data)
@@ -856,7 +1060,7 @@ def test_immediate_equal_count_write_forces_reconciliation():
         bm = bmesh.from_edit_mesh(obj.data)
         bm.faces.ensure_lookup_table()
         stack_layer = bm.faces.layers.string.get(element_spec(FACE).stack_layer)
-        assert model.decode_layer_bytes(bytes(bm.faces[0][stack_layer])) == [
+        assert codec.decode_layer_bytes(bytes(bm.faces[0][stack_layer])) == [
             second.layer_id
         ]
         assert not bytes(bm.faces[1][stack_layer])
@@ -1059,6 +1263,76 @@ def test_cache_reuse(obj):
         overlay.build_overlay_batches = original_builder
 
 
+def test_stage_timings_feed_panel_and_slow_log(obj):
+    import tempfile
+
+    profiling.clear_trace()
+    overlay.invalidate_overlay_state()
+    with overlay_gpu_stub():
+        batches = overlay.cached_overlay_batches(obj, obj.mesh_annotations)
+    summary = profiling.stage_summary()
+    for stage in ("load", "bucket", "upload", "build"):
+        assert stage in summary, stage
+    assert summary["upload"]["last_count"] >= sum(
+        len(batches[element_type]) for element_type in (FACE, EDGE, VERTEX)
+    )
+    assert all(event["object"] == obj.name for event in profiling.trace_events("build"))
+
+    panel_layout = UILayoutProbe()
+    ui.VIEW3D_PT_mesh_annotation_performance.draw(
+        SimpleNamespace(layout=panel_layout), bpy.context
+    )
+    assert any(
+        entry[1] == "mesh.annotation_clear_timings" for entry in panel_layout.entries
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = os.path.join(directory, "slow_stages.log")
+        try:
+            assert profiling.configure_slow_log(log_path, 5.0)
+            profiling.record_stage("extract", 0.001, 10, obj.name)
+            profiling.record_stage("extract", 0.010, 20, obj.name, "NEAREST")
+        finally:
+            profiling.configure_slow_log("", 0.0)
+        with open(log_path, encoding="utf-8") as log_file:
+            lines = log_file.read().splitlines()
+    assert len(lines) == 1 and "NEAREST" in lines[0]
+    profiling.clear_trace()
+    assert not profiling.stage_summary()
+
+
+def test_profile_capture_writes_profile_and_summary(obj):
+    import tempfile
+
+    bpy.context.view_layer.objects.active = obj
+    with tempfile.TemporaryDirectory() as directory:
+        stem = os.path.join(directory, "capture")
+        assert profiling.start_profile_capture(
+            stem, 3, operators._profile_description
+        )
+        assert not profiling.start_profile_capture(stem, 1)
+        assert bpy.ops.mesh.annotation_toggle_overlay() == {"FINISHED"}
+        overlay.annotation_depsgraph_update_post(None, SimpleNamespace(updates=[]))
+        assert profiling.profile_capture_status()["captured"] == 2
+        assert bpy.ops.mesh.annotation_toggle_overlay() == {"FINISHED"}
+        assert profiling.profile_capture_status() is None
+        prof_path, summary_path = profiling.last_profile_capture()["paths"]
+        assert os.path.getsize(prof_path) > 0
+        with open(summary_path, encoding="utf-8") as summary_file:
+            summary = summary_file.read()
+    assert "mesh.annotation_toggle_overlay: 2" in summary
+    assert "depsgraph_update_post: 1" in summary
+    assert f"Object {obj.name}" in summary and "Modifiers:" in summary
+
+    panel_layout = UILayoutProbe()
+    ui.VIEW3D_PT_mesh_annotation_performance.draw(
+        SimpleNamespace(layout=panel_layout), bpy.context
+    )
+    assert any(
+        entry[1] == "mesh.annotation_capture_profile" for entry in panel_layout.entries
+    )
+
+
 def test_clean_cache_skips_modifier_signature(obj):
     overlay.invalidate_overlay_state()
     with overlay_gpu_stub():
@@ -1074,6 +1348,57 @@ def test_clean_cache_skips_modifier_signature(obj):
         overlay._modifier_state_signature = original_signature
 
 
+def test_modifier_signatures_refresh_only_after_owner_updates():
+    obj = create_grid_object()
+    obj.name = "IncrementalModifierSignature"
+    subdivision = obj.modifiers.new("SignatureSubdivision", "SUBSURF")
+    original_values = overlay._modifier_values
+    reads = []
+
+    def counting_values(modifier, dependency_keys):
+        reads.append(modifier.name)
+        return original_values(modifier, dependency_keys)
+
+    overlay._modifier_values = counting_values
+    try:
+        overlay.invalidate_overlay_state()
+        signature = overlay._modifier_state_signature(obj)
+        assert overlay._modifier_state_signature(obj) == signature
+        assert obj.session_uid in overlay._dependency_keys(obj)
+        assert reads == ["SignatureSubdivision"]
+
+        edit_updates = SimpleNamespace(
+            updates=[
+                SimpleNamespace(
+                    is_updated_geometry=True, is_updated_transform=False, id=obj
+                ),
+                SimpleNamespace(
+                    is_updated_geometry=True, is_updated_transform=False, id=obj.data
+                ),
+            ]
+        )
+        # Updates of the mesh data alone keep the cached signature.
+        overlay._discard_stale_modifier_states(
+            SimpleNamespace(updates=edit_updates.updates[1:])
+        )
+        assert overlay._modifier_state_signature(obj) == signature
+        assert len(reads) == 1
+
+        # A keyed modifier value can change in the same step as a mesh edit.
+        subdivision.levels += 1
+        overlay._discard_stale_modifier_states(edit_updates)
+        assert overlay._modifier_state_signature(obj) != signature
+        assert len(reads) == 2
+
+        obj.modifiers.new("SignatureTriangulate", "TRIANGULATE")
+        overlay._modifier_state_signature(obj)
+        assert reads[2:] == ["SignatureSubdivision", "SignatureTriangulate"]
+    finally:
+        overlay._modifier_values = original_values
+        overlay.invalidate_overlay_state()
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
 def test_layer_counts_parse_once(obj):
     settings = obj.mesh_annotations
     original_data = settings.face_layers_data
@@ -1094,6 +1419,44 @@ def test_layer_counts_parse_once(obj):
         model.invalidate_element_layers_cache()
 
 
+def test_layer_hashes_validate_and_share_decodes():
+    base = create_grid_object()
+    base.name = "LayerHashBase"
+    settings = base.mesh_annotations
+    layer = settings.face_layers.add()
+    layer.layer_id = 1
+    layer.element_type = FACE
+    layer.name = "Hashed Face"
+    settings.next_face_layer_id = 2
+    assert model.assign_elements_to_layer(base, FACE, 1, [0, 1, 2])
+    assert settings.face_layers_hash == model._element_layers_digest(
+        settings.face_layers_data
+    )
+    assert model.element_layers_digest(settings, FACE) == settings.face_layers_hash
+
+    copy = create_grid_object()
+    copy.name = "LayerHashCopy"
+    copy_settings = copy.mesh_annotations
+    original_loads = model.json.loads
+    calls = []
+    try:
+        model.invalidate_element_layers_cache()
+        model.json.loads = lambda value: calls.append(value) or original_loads(value)
+        # Files saved before the hash existed keep using the data comparison.
+        copy_settings.face_layers_data = settings.face_layers_data
+        mapping = model.load_element_layers(settings, FACE)
+        assert model.load_element_layers(copy_settings, FACE) is mapping
+        assert len(calls) == 1
+
+        settings.face_layers_data = json.dumps({"3": [1]})
+        assert model.load_element_layers(settings, FACE) == {"3": [1]}
+        assert model.element_layers_digest(settings, FACE) != settings.face_layers_hash
+        assert model.load_element_layers(copy_settings, FACE) is mapping
+    finally:
+        model.json.loads = original_loads
+        model.invalidate_element_layers_cache()
+
+
 def test_face_only_generic_mapping_is_demand_driven():
     obj = create_grid_object()
     obj.name = "DemandDrivenMapping"
@@ -1158,6 +1521,41 @@ def test_depsgraph_invalidation_is_scoped(obj):
         bpy.data.meshes.remove(unrelated_mesh)
 
 
+def test_depsgraph_updates_follow_dependency_index(obj):
+    bpy.context.view_layer.objects.active = obj
+    if obj.mode != "OBJECT":
+        bpy.ops.object.mode_set(mode="OBJECT")
+    overlay.invalidate_overlay_state()
+    with overlay_gpu_stub():
+        overlay.cached_overlay_batches(obj, obj.mesh_annotations)
+    cache_key = obj.session_uid
+    assert cache_key in overlay._overlay_dependents[obj.data.session_uid]
+    mesh_update = SimpleNamespace(
+        is_updated_geometry=True,
+        is_updated_transform=False,
+        id=obj.data,
+    )
+
+    # A dropped entry leaves an index record that updates must skip.
+    cached = overlay._overlay_batch_cache.pop(cache_key)
+    overlay.annotation_depsgraph_update_post(
+        None, SimpleNamespace(updates=[mesh_update])
+    )
+    assert not cached["dirty"]
+
+    # Without cached overlays or annotated edit meshes the handler returns
+    # early, but still advances the generation of every rewritten Mesh.
+    overlay.invalidate_overlay_state()
+    assert not overlay._overlay_dependents
+    overlay._modifier_state_signature(obj)
+    generation = model._MESH_GEOMETRY_GENERATIONS.get(obj.data.session_uid, 0)
+    overlay.annotation_depsgraph_update_post(
+        None, SimpleNamespace(updates=[mesh_update])
+    )
+    assert not overlay._modifier_states
+    assert model._MESH_GEOMETRY_GENERATIONS[obj.data.session_uid] != generation
+
+
 def test_local_surface_batches_survive_style_and_transform_updates():
     obj = create_grid_object()
     obj.name = "LocalSurfaceCache"
@@ -1192,6 +1590,434 @@ def test_local_surface_batches_survive_style_and_transform_updates():
     bpy.data.objects.remove(obj, do_unlink=True)
 
 
+def test_assignment_patches_overlay_batches():
+    obj = create_grid_object()
+    obj.name = "PatchedOverlay"
+    bpy.context.view_layer.objects.active = obj
+    settings = obj.mesh_annotations
+    first_layer = model.create_layer(settings, FACE)
+    second_layer = model.create_layer(settings, FACE)
+    assert model.assign_elements_to_layer(obj, FACE, first_layer.layer_id, [10])
+    assert model.assign_elements_to_layer(obj, FACE, second_layer.layer_id, [20])
+    overlay.invalidate_overlay_state()
+    original_builder = overlay.build_overlay_batches
+    try:
+        with overlay_gpu_stub():
+            batches = overlay.cached_overlay_batches(obj, settings)
+            first_counts = {
+                entry["layer_id"]: entry["vertex_count"] for entry in batches[FACE]
+            }
+            untouched = next(
+                entry
+                for entry in batches[FACE]
+                if entry["layer_id"] == second_layer.layer_id
+            )
+            geometry_bytes = overlay._overlay_geometry_cache.total_bytes
+            overlay.build_overlay_batches = lambda *_args: (_ for _ in ()).throw(
+                AssertionError("assignment deltas should patch cached batches")
+            )
+            assert model.assign_elements_to_layer(
+                obj, FACE, first_layer.layer_id, [11, 12]
+            )
+            patched = overlay.cached_overlay_batches(obj, settings)
+            assert patched is batches
+            # Geometry extended by the patch is accounted in the cache.
+            assert overlay._overlay_geometry_cache.total_bytes > geometry_bytes
+            patched_counts = {
+                entry["layer_id"]: entry["vertex_count"] for entry in patched[FACE]
+            }
+            assert patched_counts[first_layer.layer_id] == (
+                first_counts[first_layer.layer_id] * 3
+            )
+            assert any(entry is untouched for entry in patched[FACE])
+
+            for polygon in obj.data.polygons:
+                polygon.select = polygon.index in {10, 11, 12}
+            model.clear_elements_from_layer(
+                obj, FACE, first_layer.layer_id, only_selected=True
+            )
+            cleared = overlay.cached_overlay_batches(obj, settings)
+            assert [entry["layer_id"] for entry in cleared[FACE]] == [
+                second_layer.layer_id
+            ]
+            overlay.build_overlay_batches = original_builder
+            rebuilt = original_builder(obj, settings)
+            assert [entry["vertex_count"] for entry in rebuilt[FACE]] == [
+                entry["vertex_count"] for entry in cleared[FACE]
+            ]
+    finally:
+        overlay.build_overlay_batches = original_builder
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def test_self_update_markers_only_skip_the_flush_geometry():
+    obj = create_grid_object()
+    obj.name = "SelfUpdateMarker"
+    bpy.context.view_layer.objects.active = obj
+    settings = obj.mesh_annotations
+    layer = model.create_layer(settings, FACE)
+    assert model.assign_elements_to_layer(obj, FACE, layer.layer_id, [10])
+    overlay.invalidate_overlay_state()
+    mesh_update = SimpleNamespace(
+        is_updated_geometry=True,
+        is_updated_transform=False,
+        id=obj.data,
+    )
+    try:
+        with overlay_gpu_stub():
+            overlay.cached_overlay_batches(obj, settings)
+        cached = overlay._overlay_batch_cache[obj.session_uid]
+        assert model.assign_elements_to_layer(obj, FACE, layer.layer_id, [11])
+        overlay.annotation_depsgraph_update_post(
+            None, SimpleNamespace(updates=[mesh_update])
+        )
+        assert not cached["dirty"]
+        assert not model._ANNOTATION_SELF_UPDATES
+
+        # A geometry edit coalesced with the flush is not mistaken for it.
+        assert model.assign_elements_to_layer(obj, FACE, layer.layer_id, [12])
+        obj.data.vertices[0].co.z += 0.25
+        overlay.annotation_depsgraph_update_post(
+            None, SimpleNamespace(updates=[mesh_update])
+        )
+        assert cached["dirty"]
+    finally:
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def test_operation_counts_scale_with_touched_elements():
+    obj = create_grid_object()
+    obj.name = "CountedOperations"
+    bpy.context.view_layer.objects.active = obj
+    settings = obj.mesh_annotations
+    layer = model.create_layer(settings, FACE)
+    face_count = len(obj.data.polygons)
+    data_property = element_spec(FACE).data_property
+    assert model.assign_elements_to_layer(obj, FACE, layer.layer_id, [0])
+    overlay.invalidate_overlay_state()
+    try:
+        measured = {}
+        for first_index, touched in ((1, 4), (100, 64)):
+            with profiling.counting_operations() as counts:
+                assert model.assign_elements_to_layer(
+                    obj,
+                    FACE,
+                    layer.layer_id,
+                    range(first_index, first_index + touched),
+                )
+            measured[touched] = dict(counts)
+            mapped = len(model.load_element_layers(settings, FACE))
+            # One reconciliation pass over the stack; everything else is
+            # bounded by the touched and mapped elements.
+            assert counts["bmesh_elements"] <= face_count + 4 * (touched + mapped)
+            assert counts["payload_encodes"] <= 2 * (touched + mapped)
+            assert counts["payload_decodes"] <= mapped
+            assert counts["json_bytes"] <= 2 * len(getattr(settings, data_property))
+            assert counts["evaluated_elements"] == 0
+        growth = measured[64]["bmesh_elements"] - measured[4]["bmesh_elements"]
+        assert growth <= 4 * (64 + 64)
+
+        with overlay_gpu_stub():
+            with profiling.counting_operations() as counts:
+                batches = overlay.cached_overlay_batches(obj, settings)
+            assert counts["evaluated_elements"] > 0
+            assert counts["batches"] >= len(batches[FACE])
+            with profiling.counting_operations() as counts:
+                assert overlay.cached_overlay_batches(obj, settings) is batches
+            assert counts["evaluated_elements"] == 0
+            assert counts["batches"] == 0
+            assert counts["bmesh_elements"] == 0
+    finally:
+        overlay.invalidate_overlay_state()
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def test_cache_budgets_track_memory_and_hit_rates():
+    obj = create_grid_object()
+    obj.name = "BudgetedCaches"
+    settings = obj.mesh_annotations
+    layer = model.create_layer(settings, FACE)
+    assert model.assign_elements_to_layer(obj, FACE, layer.layer_id, range(40))
+    overlay.invalidate_overlay_state()
+    before = caches.cache_statistics()["overlay_batches"]
+    try:
+        with overlay_gpu_stub():
+            batches = overlay.cached_overlay_batches(obj, settings)
+            assert overlay.cached_overlay_batches(obj, settings) is batches
+        statistics = caches.cache_statistics()
+        assert statistics["overlay_batches"]["misses"] == before["misses"] + 1
+        assert statistics["overlay_batches"]["hits"] == before["hits"] + 1
+        for name in ("overlay_batches", "overlay_geometry", "decoded_annotations"):
+            assert statistics[name]["bytes"] > 0, name
+        assert obj.name in dict(caches.memory_by_owner())
+
+        panel_layout = UILayoutProbe()
+        ui.VIEW3D_PT_mesh_annotation_performance.draw(
+            SimpleNamespace(layout=panel_layout), bpy.context
+        )
+        labels = [entry[2].get("text") for entry in panel_layout.entries]
+        assert i18n.tr("Overlay Batches") in labels
+
+        overlay.configure_cache_budgets(
+            SimpleNamespace(
+                overlay_batch_budget=1,
+                overlay_geometry_budget=1,
+                annotation_cache_budget=1,
+            )
+        )
+        assert caches.cache_statistics()["overlay_batches"]["budget_bytes"] == 1024 * 1024
+    finally:
+        overlay.configure_cache_budgets()
+        overlay.invalidate_overlay_state()
+        bpy.data.objects.remove(obj, do_unlink=True)
+    assert caches.cache_statistics()["overlay_batches"]["bytes"] == 0
+
+
+def test_mode_switch_reuses_matching_evaluated_surface():
+    obj = create_grid_object()
+    obj.name = "ModeSwitchOverlay"
+    bpy.context.view_layer.objects.active = obj
+    settings = obj.mesh_annotations
+    layer = model.create_layer(settings, FACE)
+    assert model.assign_elements_to_layer(obj, FACE, layer.layer_id, [10])
+    overlay.invalidate_overlay_state()
+    original_builder = overlay.build_overlay_batches
+    builds = []
+
+    def counting_builder(*args):
+        builds.append(args)
+        return original_builder(*args)
+
+    mode_update = SimpleNamespace(
+        is_updated_geometry=True,
+        is_updated_transform=False,
+        id=obj.data,
+    )
+    try:
+        overlay.build_overlay_batches = counting_builder
+        with overlay_gpu_stub():
+            batches = overlay.cached_overlay_batches(obj, settings)
+            bpy.ops.object.mode_set(mode="EDIT")
+            overlay.annotation_depsgraph_update_post(
+                None, SimpleNamespace(updates=[mode_update])
+            )
+            assert overlay.cached_overlay_batches(obj, settings) is batches
+            bpy.ops.object.mode_set(mode="OBJECT")
+            assert len(builds) == 1
+
+            subdivision = obj.modifiers.new("ObjectOnlySubdivision", "SUBSURF")
+            subdivision.show_in_editmode = False
+            overlay.invalidate_overlay_cache(obj)
+            batches = overlay.cached_overlay_batches(obj, settings)
+            bpy.ops.object.mode_set(mode="EDIT")
+            overlay.annotation_depsgraph_update_post(
+                None, SimpleNamespace(updates=[mode_update])
+            )
+            assert overlay.cached_overlay_batches(obj, settings) is not batches
+            assert len(builds) == 3
+    finally:
+        overlay.build_overlay_batches = original_builder
+        if obj.mode != "OBJECT":
+            bpy.ops.object.mode_set(mode="OBJECT")
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def test_linked_duplicates_share_local_batches():
+    base = create_grid_object()
+    base.name = "SharedBatchBase"
+    layer = model.create_layer(base.mesh_annotations, FACE)
+    assert model.assign_elements_to_layer(base, FACE, layer.layer_id, [10])
+    duplicate = base.copy()
+    bpy.context.collection.objects.link(duplicate)
+    overlay.invalidate_overlay_state()
+    original_builder = overlay.build_overlay_batches
+    original_shader = overlay._surface_shader
+    builds = []
+
+    def counting_builder(*args):
+        builds.append(args[0].name)
+        return original_builder(*args)
+
+    try:
+        overlay.build_overlay_batches = counting_builder
+        overlay._surface_shader = object()
+        with overlay_gpu_stub():
+            batches = overlay.cached_overlay_batches(base, base.mesh_annotations)
+            assert batches[FACE]
+            shared = overlay.cached_overlay_batches(
+                duplicate, duplicate.mesh_annotations
+            )
+            assert shared is batches
+            assert builds == [base.name]
+
+            duplicate.mesh_annotations.face_layers[0].is_visible = False
+            overlay.invalidate_overlay_cache(duplicate)
+            hidden = overlay.cached_overlay_batches(
+                duplicate, duplicate.mesh_annotations
+            )
+            assert hidden is not batches
+            assert not hidden[FACE]
+            assert builds == [base.name, duplicate.name]
+    finally:
+        overlay.build_overlay_batches = original_builder
+        overlay._surface_shader = original_shader
+        bpy.data.objects.remove(duplicate, do_unlink=True)
+        bpy.data.objects.remove(base, do_unlink=True)
+
+
+def test_multi_object_overlay_scheduling():
+    first = create_grid_object()
+    first.name = "ScheduledOverlayFirst"
+    second = create_grid_object()
+    second.name = "ScheduledOverlaySecond"
+    plain = create_grid_object()
+    plain.name = "ScheduledOverlayPlain"
+    for obj in (first, second):
+        layer = model.create_layer(obj.mesh_annotations, FACE)
+        assert model.assign_elements_to_layer(obj, FACE, layer.layer_id, [10])
+    bpy.context.view_layer.update()
+    original_preferences = overlay.addon_preferences
+    try:
+        overlay.addon_preferences = lambda: SimpleNamespace(
+            overlay_all_objects=True,
+            overlay_build_budget=0.0,
+        )
+        fake_context = SimpleNamespace(
+            object=first,
+            visible_objects=[plain, second, first],
+        )
+        assert overlay._overlay_objects(fake_context) == [first, second]
+        overlay.addon_preferences = lambda: None
+        assert overlay._overlay_objects(fake_context) == [first]
+
+        view_projection = Matrix.Identity(4)
+        assert overlay._screen_coverage(second, view_projection) > 0.0
+        second.location.x = 10.0
+        bpy.context.view_layer.update()
+        assert overlay._screen_coverage(second, view_projection) == 0.0
+        second.location.x = 0.0
+        bpy.context.view_layer.update()
+
+        overlay.invalidate_overlay_state()
+        with overlay_gpu_stub():
+            deferred = overlay.cached_overlay_batches(
+                second, second.mesh_annotations, allow_build=False
+            )
+            assert deferred is None
+            built = overlay.cached_overlay_batches(second, second.mesh_annotations)
+            assert built[FACE]
+            assert (
+                overlay.cached_overlay_batches(
+                    second, second.mesh_annotations, allow_build=False
+                )
+                is built
+            )
+    finally:
+        overlay.addon_preferences = original_preferences
+        for obj in (first, second, plain):
+            bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def test_dense_layers_build_coarse_lod_tiers():
+    obj = create_grid_object()
+    obj.name = "LodOverlay"
+    bpy.context.view_layer.objects.active = obj
+    settings = obj.mesh_annotations
+    face_layer = model.create_layer(settings, FACE)
+    edge_layer = model.create_layer(settings, EDGE)
+    vertex_layer = model.create_layer(settings, VERTEX)
+    assert model.assign_elements_to_layer(
+        obj, FACE, face_layer.layer_id, list(range(40))
+    )
+    assert model.assign_elements_to_layer(
+        obj, EDGE, edge_layer.layer_id, list(range(40))
+    )
+    assert model.assign_elements_to_layer(
+        obj, VERTEX, vertex_layer.layer_id, list(range(len(obj.data.vertices)))
+    )
+    subdivision = obj.modifiers.new("LodSubdivision", "SUBSURF")
+    subdivision.levels = 3
+    original_threshold = overlay._LOD_MIN_VERTICES
+    original_preferences = overlay.addon_preferences
+    try:
+        overlay._LOD_MIN_VERTICES = 1
+        overlay.invalidate_overlay_state()
+        with overlay_gpu_stub():
+            batches = overlay.build_overlay_batches(obj, settings)
+        face_entry = batches[FACE][0]
+        edge_entry = batches[EDGE][0]
+        vertex_entry = batches[VERTEX][0]
+        assert face_entry["lod"]["vertex_count"] * 4 <= face_entry["vertex_count"]
+        assert edge_entry["lod"]["kind"] == "edge_lines"
+        assert edge_entry["lod"]["vertex_count"] == 80
+        assert 0 < vertex_entry["lod"]["vertex_count"] * 4 <= vertex_entry["vertex_count"]
+
+        # Coarse fans over a curved patch never dip below its subdivided positions.
+        dome = [
+            Vector((x * 0.25, y * 0.25, 1.0 - (x * x + y * y) * 0.05))
+            for y in range(-2, 3)
+            for x in range(-2, 3)
+        ]
+        patch = []
+        for row in range(4):
+            for column in range(4):
+                corner = row * 5 + column
+                patch.append((dome[corner], dome[corner + 1], dome[corner + 6]))
+                patch.append((dome[corner], dome[corner + 6], dome[corner + 5]))
+        up = Vector((0.0, 0.0, 1.0))
+        coarse = evaluated_geometry.coarse_patch_triangles(patch, normal=up)
+        assert len(coarse) < len(patch)
+        assert evaluated_geometry.coarse_patch_lift(dome, coarse, up) <= 1e-6
+
+        overlay.addon_preferences = lambda: SimpleNamespace(overlay_lod_budget=1)
+        assert overlay._use_lod_tier(batches, 0.01, (100.0, 100.0), False)
+        assert not overlay._use_lod_tier(batches, 0.01, (100.0, 100.0), True)
+        assert not overlay._use_lod_tier(batches, 4.0, (8000.0, 8000.0), False)
+        overlay.addon_preferences = lambda: SimpleNamespace(overlay_lod_budget=0)
+        assert not overlay._use_lod_tier(batches, 0.01, (100.0, 100.0), False)
+    finally:
+        overlay._LOD_MIN_VERTICES = original_threshold
+        overlay.addon_preferences = original_preferences
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def test_face_outline_mode_draws_layer_boundaries():
+    obj = create_grid_object()
+    obj.name = "OutlineOverlay"
+    bpy.context.view_layer.objects.active = obj
+    settings = obj.mesh_annotations
+    layer = model.create_layer(settings, FACE)
+    first_edges = set(obj.data.polygons[0].edge_keys)
+    neighbour = next(
+        polygon.index
+        for polygon in obj.data.polygons[1:]
+        if len(first_edges & set(polygon.edge_keys)) == 1
+    )
+    assert model.assign_elements_to_layer(obj, FACE, layer.layer_id, [0])
+    settings.overlay_face_display = "OUTLINE"
+    overlay.invalidate_overlay_state()
+    original_builder = overlay.build_overlay_batches
+    try:
+        with overlay_gpu_stub():
+            batches = overlay.cached_overlay_batches(obj, settings)
+            (entry,) = batches[FACE]
+            assert entry["kind"] == "edge_segments"
+            assert entry["outline"]
+            assert entry["segment_count"] == 4
+
+            overlay.build_overlay_batches = lambda *_args: (_ for _ in ()).throw(
+                AssertionError("outline assignments should patch cached batches")
+            )
+            assert model.assign_elements_to_layer(
+                obj, FACE, layer.layer_id, [neighbour]
+            )
+            (entry,) = overlay.cached_overlay_batches(obj, settings)[FACE]
+            assert entry["segment_count"] == 6
+    finally:
+        overlay.build_overlay_batches = original_builder
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
 def test_overlay_color_is_selection_independent(obj):
     bpy.context.view_layer.objects.active = obj
     bpy.ops.object.mode_set(mode="EDIT")
@@ -1233,7 +2059,7 @@ def test_history_resyncs_bmesh_ownership(obj):
                 bm, FACE
             )
             bm.faces[10][stack_layer] = b""
-            bm.faces[11][stack_layer] = model.encode_layers([layer_id])
+            bm.faces[11][stack_layer] = codec.encode_layers([layer_id])
             bmesh.update_edit_mesh(obj.data, loop_triangles=False, destructive=False)
 
             before_draw_json = settings.face_layers_data
@@ -1304,6 +2130,181 @@ def test_equal_count_topology_reconciles_after_quiet_period():
         bpy.data.objects.remove(obj, do_unlink=True)
 
 
+def test_selection_and_transform_edits_skip_reconciliation():
+    obj = create_grid_object()
+    obj.name = "ClassifiedEditUpdates"
+    settings = obj.mesh_annotations
+    layer = model.create_layer(settings, FACE)
+    assert model.assign_elements_to_layer(obj, FACE, layer.layer_id, [10])
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode="EDIT")
+    bpy.ops.mesh.select_all(action="DESELECT")
+    original_last_operator = overlay._last_operator_id
+    last_operator = ["OBJECT_OT_mode_set", 1]
+    overlay._last_operator_id = lambda: tuple(last_operator)
+    update = SimpleNamespace(
+        is_updated_geometry=True,
+        is_updated_transform=False,
+        id=obj.data,
+    )
+    try:
+        overlay.annotation_depsgraph_update_post(None, SimpleNamespace(updates=[update]))
+        for key in tuple(model._BMESH_SYNC_DIRTY_AT):
+            model._BMESH_SYNC_DIRTY_AT[key] = time.perf_counter() - 1.0
+        assert overlay._topology_sync_timer() is None
+        assert not model.bmesh_mapping_is_dirty(obj.data)
+
+        bm = bmesh.from_edit_mesh(obj.data)
+        bm.faces.ensure_lookup_table()
+        bm.faces[3].select = True
+        last_operator[:] = ["VIEW3D_OT_select", 2]
+        assert model.classify_edit_mesh_update(obj.data, *last_operator) == "SELECTION"
+        bm.faces[4].select = True
+        last_operator[1] = 3
+        overlay.annotation_depsgraph_update_post(None, SimpleNamespace(updates=[update]))
+        assert not model.bmesh_mapping_is_dirty(obj.data)
+
+        bm.verts.ensure_lookup_table()
+        bm.verts[0].co.z += 0.25
+        last_operator[:] = ["TRANSFORM_OT_translate", 4]
+        overlay.annotation_depsgraph_update_post(None, SimpleNamespace(updates=[update]))
+        assert not model.bmesh_mapping_is_dirty(obj.data)
+
+        # A modal transform is trusted before it registers itself.
+        assert model.classify_edit_mesh_update(
+            obj.data, *last_operator, ("TRANSFORM_OT_translate",)
+        ) == "COORDINATES"
+
+        # A later script edit keeps the counts but registers no operator, so
+        # the newest history entry no longer vouches for the update.
+        bm.faces.ensure_lookup_table()
+        bmesh.ops.reverse_faces(bm, faces=[bm.faces[5]])
+        assert model.classify_edit_mesh_update(obj.data, *last_operator) == "TOPOLOGY"
+
+        bmesh.ops.delete(bm, geom=[bm.faces[20]], context="FACES_ONLY")
+        last_operator[1] = 5
+        assert model.classify_edit_mesh_update(obj.data, *last_operator) == "TOPOLOGY"
+    finally:
+        overlay._last_operator_id = original_last_operator
+        bpy.ops.object.mode_set(mode="OBJECT")
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def test_topology_reconciliation_runs_in_slices():
+    obj = create_grid_object()
+    obj.name = "SlicedReconciliation"
+    settings = obj.mesh_annotations
+    layer = model.create_layer(settings, FACE)
+    assert model.assign_elements_to_layer(obj, FACE, layer.layer_id, [10, 700])
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode="EDIT")
+    original_slice = overlay._TOPOLOGY_SYNC_SLICE_ELEMENTS
+    overlay._TOPOLOGY_SYNC_SLICE_ELEMENTS = 100
+    try:
+        overlay.invalidate_overlay_state()
+        bm = bmesh.from_edit_mesh(obj.data)
+        bm.faces.ensure_lookup_table()
+        stack_layer = bm.faces.layers.string.get(element_spec(FACE).stack_layer)
+        bm.faces[700][stack_layer] = b""
+        model.mark_bmesh_mapping_dirty(obj.data)
+        for key in tuple(model._BMESH_SYNC_DIRTY_AT):
+            model._BMESH_SYNC_DIRTY_AT[key] = time.perf_counter() - 1.0
+        ticks = 1
+        assert overlay._topology_sync_timer() == 0.01
+        # The viewport keeps the last committed mapping while a job runs.
+        mapping, merge_result = model.merge_stack_layer_if_needed(
+            model.load_element_layers(settings, FACE),
+            obj.data,
+            bm,
+            stack_layer,
+            FACE,
+            defer=True,
+        )
+        assert "700" in mapping and not merge_result.inspected
+        while overlay._topology_sync_timer() is not None:
+            ticks += 1
+        assert ticks > len(bm.faces) // 100
+        assert model.load_element_layers(settings, FACE) == {"10": [layer.layer_id]}
+        assert not model._BMESH_SYNC_IN_PROGRESS
+    finally:
+        overlay._TOPOLOGY_SYNC_SLICE_ELEMENTS = original_slice
+        bpy.ops.object.mode_set(mode="OBJECT")
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def test_edit_dirtiness_tracks_changed_stacked_types():
+    obj = create_grid_object()
+    obj.name = "PerTypeDirtiness"
+    settings = obj.mesh_annotations
+    face_layer = model.create_layer(settings, FACE)
+    vertex_layer = model.create_layer(settings, VERTEX)
+    assert model.assign_elements_to_layer(obj, FACE, face_layer.layer_id, [10])
+    assert model.assign_elements_to_layer(obj, VERTEX, vertex_layer.layer_id, [3])
+    mesh_uid = int(obj.data.session_uid)
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode="EDIT")
+    try:
+        model._BMESH_SYNC_DIRTY_AT.clear()
+        bm = bmesh.from_edit_mesh(obj.data)
+        bm.faces.ensure_lookup_table()
+        bmesh.ops.delete(bm, geom=[bm.faces[20]], context="FACES_ONLY")
+        model.mark_bmesh_mapping_dirty(obj.data)
+        assert set(model._BMESH_SYNC_DIRTY_AT) == {(mesh_uid, FACE)}
+
+        # Equal counts may still hide a renumbering edit on any stacked type.
+        model.mark_bmesh_mapping_synchronized(obj.data, bm, FACE)
+        model.mark_bmesh_mapping_dirty(obj.data)
+        assert set(model._BMESH_SYNC_DIRTY_AT) == {
+            (mesh_uid, FACE),
+            (mesh_uid, VERTEX),
+        }
+        assert next(reversed(model._BMESH_SYNC_DIRTY_AT)) == (mesh_uid, VERTEX)
+    finally:
+        model._BMESH_SYNC_DIRTY_AT.clear()
+        bpy.ops.object.mode_set(mode="OBJECT")
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def test_history_retains_untouched_overlay_entries():
+    objects = []
+    for name in ("HistoryUntouched", "HistoryTouched"):
+        obj = create_grid_object()
+        obj.name = name
+        layer = model.create_layer(obj.mesh_annotations, FACE)
+        assert model.assign_elements_to_layer(obj, FACE, layer.layer_id, [4, 5])
+        objects.append(obj)
+    untouched, touched = objects
+    original_build = overlay.build_overlay_batches
+    try:
+        overlay.invalidate_overlay_state()
+        with overlay_gpu_stub():
+            untouched_batches = overlay.cached_overlay_batches(
+                untouched, untouched.mesh_annotations
+            )
+            overlay.cached_overlay_batches(touched, touched.mesh_annotations)
+        decoded_entries = len(model._DECODED_ELEMENT_LAYERS)
+        overlay.annotation_history_pre()
+        touched.data.vertices[0].co.z += 0.5
+        overlay.annotation_history_post()
+        assert overlay._id_key(untouched) in overlay._overlay_batch_cache
+        assert overlay._id_key(touched) not in overlay._overlay_batch_cache
+        assert len(model._DECODED_ELEMENT_LAYERS) == decoded_entries
+
+        def unexpected_build(_obj, _settings):
+            raise AssertionError("untouched history entry was rebuilt")
+
+        overlay.build_overlay_batches = unexpected_build
+        assert (
+            overlay.cached_overlay_batches(untouched, untouched.mesh_annotations)
+            is untouched_batches
+        )
+    finally:
+        overlay.build_overlay_batches = original_build
+        overlay.invalidate_overlay_state()
+        for obj in objects:
+            bpy.data.objects.remove(obj, do_unlink=True)
+
+
 def test_load_pre_clears_identity_keyed_state(obj):
     bpy.context.view_layer.objects.active = obj
     model.load_element_layers(obj.mesh_annotations, FACE)
@@ -1315,12 +2316,54 @@ def test_load_pre_clears_identity_keyed_state(obj):
     assert overlay._overlay_batch_cache
     overlay.annotation_load_pre()
     assert not model._ELEMENT_LAYERS_CACHE
+    assert not model._DECODED_ELEMENT_LAYERS
     assert not model._BMESH_SYNC_DIRTY_AT
     assert not model._BMESH_SYNC_STATES
     assert not overlay._overlay_batch_cache
     assert not overlay._overlay_geometry_cache
 
 
+def test_idle_prewarm_decodes_and_builds_geometry(obj):
+    bpy.context.view_layer.objects.active = obj
+    obj.select_set(True)
+    overlay.annotation_load_pre()
+    try:
+        overlay.annotation_load_post()
+        cache_key = overlay._id_key(obj)
+        assert overlay._prewarm_queue[cache_key]["stage"] == "GEOMETRY"
+        assert next(iter(overlay._prewarm_queue)) == cache_key
+
+        # Fresh input holds every queued object back.
+        overlay._note_user_input()
+        assert overlay._prewarm_timer() > 0.0
+        assert cache_key in overlay._prewarm_queue
+
+        # Three decode steps, the mesh copy, the mapping, then one-element chunks.
+        job = overlay._prewarm_queue[cache_key]
+        for _step in range(3 + 2 + 2):
+            assert overlay._continue_prewarm(obj, job, 1) >= 0
+        assert job["bm"] is not None and job["plan"] is not None
+        assert sum(job["positions"].values()) == 2
+
+        # Input after the mesh was copied drops the partial work on resume.
+        job["started_at"] = -1.0
+        overlay._last_input_at = 0.0
+        overlay._poll_operator_input()
+        overlay._last_input_at = 0.0
+        overlay._prewarm_timer()
+        assert job["started_at"] != -1.0
+
+        overlay._last_input_at = 0.0
+        while overlay._prewarm_timer() is not None:
+            overlay._last_input_at = 0.0
+        assert not overlay._prewarm_queue
+        assert model._DECODED_ELEMENT_LAYERS
+        assert cache_key in overlay._overlay_geometry_cache
+        assert cache_key not in overlay._overlay_batch_cache
+    finally:
+        overlay._cancel_prewarm()
+
+
 def test_history_handlers_registered():
     for handlers in (bpy.app.handlers.undo_pre, bpy.app.handlers.redo_pre):
         assert overlay.annotation_history_pre in handlers
@@ -1336,6 +2379,7 @@ def assert_runtime_callbacks_are_singletons():
         == 1
     )
     assert bpy.app.handlers.load_pre.count(addon.overlay.annotation_load_pre) == 1
+    assert bpy.app.handlers.load_post.count(addon.overlay.annotation_load_post) == 1
     for handlers in (bpy.app.handlers.undo_pre, bpy.app.handlers.redo_pre):
         assert handlers.count(addon.overlay.annotation_history_pre) == 1
     for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
@@ -1459,6 +2503,35 @@ def test_button_operators(obj):
     assert layer.is_visible is not visible
 
 
+def test_annotated_object_registry_gates_hot_callbacks():
+    model.forget_annotated_objects()
+    assert not model.has_annotated_objects()
+    original_edit_objects = overlay._edit_mesh_objects
+
+    def unexpected_probe():
+        raise AssertionError("unannotated files should not probe the context")
+
+    overlay._edit_mesh_objects = unexpected_probe
+    try:
+        overlay.annotation_depsgraph_update_post(None, SimpleNamespace(updates=None))
+        assert overlay._overlay_objects(bpy.context) == []
+    finally:
+        overlay._edit_mesh_objects = original_edit_objects
+
+    obj = create_grid_object()
+    obj.name = "RegistryObject"
+    try:
+        settings = obj.mesh_annotations
+        model.create_layer(settings, EDGE)
+        assert model.annotated_objects() == [obj]
+        obj.name = "RegistryObjectRenamed"
+        assert model.annotated_objects() == [obj]
+        model.remove_layer(settings, obj, EDGE, 0)
+        assert not model.has_annotated_objects()
+    finally:
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
 def test_localization_modes_and_tooltips():
     original_preferences = i18n.addon_preferences
     original_locale = i18n.blender_locale
@@ -1507,8 +2580,11 @@ def main():
     addon.register()
     try:
         test_history_handlers_registered()
+        test_annotated_object_registry_gates_hot_callbacks()
         test_localization_modes_and_tooltips()
         test_binary_stack_contract()
+        test_stack_payloads_are_interned()
+        test_state_fingerprint_rehashes_changed_chunks()
         test_sparse_stack_initialization_and_rebuild()
         test_capacity_failure_is_atomic()
         test_object_mode_rna_failure_never_flushes_mesh()
@@ -1517,6 +2593,9 @@ def main():
         test_discard_recovery_only_clears_unverified_element_types()
         test_retention_users_do_not_masquerade_as_real_mesh_users()
         test_shared_proof_rejects_untracked_inherited_stack_payloads()
+        test_shared_proofs_are_cached_until_mesh_or_data_changes()
+        test_renumbered_shared_mesh_is_reproved()
+        test_mesh_geometry_generations_stay_bounded()
         test_shared_proof_rejects_invalid_or_lossy_json()
         test_immediate_equal_count_write_forces_reconciliation()
         test_new_layer_cancellation_restores_all_cursors()
@@ -1525,15 +2604,34 @@ def main():
         test_flat_context_menu_and_sidebar_draw(obj)
         test_button_operators(obj)
         test_cache_reuse(obj)
+        test_stage_timings_feed_panel_and_slow_log(obj)
+        test_profile_capture_writes_profile_and_summary(obj)
         test_clean_cache_skips_modifier_signature(obj)
+        test_modifier_signatures_refresh_only_after_owner_updates()
         test_layer_counts_parse_once(obj)
+        test_layer_hashes_validate_and_share_decodes()
         test_face_only_generic_mapping_is_demand_driven()
         test_depsgraph_invalidation_is_scoped(obj)
+        test_depsgraph_updates_follow_dependency_index(obj)
         test_local_surface_batches_survive_style_and_transform_updates()
+        test_assignment_patches_overlay_batches()
+        test_self_update_markers_only_skip_the_flush_geometry()
+        test_operation_counts_scale_with_touched_elements()
+        test_cache_budgets_track_memory_and_hit_rates()
+        test_mode_switch_reuses_matching_evaluated_surface()
+        test_linked_duplicates_share_local_batches()
+        test_multi_object_overlay_scheduling()
+        test_dense_layers_build_coarse_lod_tiers()
+        test_face_outline_mode_draws_layer_boundaries()
         test_overlay_color_is_selection_independent(obj)
         test_history_resyncs_bmesh_ownership(obj)
         test_equal_count_topology_reconciles_after_quiet_period()
+        test_selection_and_transform_edits_skip_reconciliation()
+        test_topology_reconciliation_runs_in_slices()
+        test_edit_dirtiness_tracks_changed_stacked_types()
+        test_history_retains_untouched_overlay_entries()
         test_load_pre_clears_identity_keyed_state(obj)
+        test_idle_prewarm_decodes_and_builds_geometry(obj)
         test_registration_failure_rolls_back_completed_steps()
         test_register_rejects_and_preserves_a_foreign_same_name_property()
         test_external_draw_handle_removal_does_not_break_teardown()
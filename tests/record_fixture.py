@@ -0,0 +1,83 @@
+"""Record annotation data and evaluated edges for the Blender-free micro-benchmarks.
+
+Run with:
+blender scene.blend --background --factory-startup --python tests/record_fixture.py \
+    --python-exit-code 1 -- --object Body --output tests/fixtures/body.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import bmesh
+import bpy
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import mesh_annotation_layers as addon
+from mesh_annotation_layers import evaluated_geometry, model
+from mesh_annotation_layers.constants import EDGE, ELEMENT_TYPES, element_spec
+
+
+def parse_arguments():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--object", required=True, help="annotated mesh object name")
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument(
+        "--edge-trim",
+        type=float,
+        default=0.1,
+        help="trim fraction the micro-benchmark applies to each edge chain",
+    )
+    return parser.parse_args(argv)
+
+
+def rounded(vector):
+    return [round(value, 6) for value in vector]
+
+
+def main():
+    arguments = parse_arguments()
+    addon.register()
+    try:
+        obj = bpy.data.objects[arguments.object]
+        settings = obj.mesh_annotations
+        element_layers = {
+            element_type: getattr(settings, element_spec(element_type).data_property)
+            for element_type in ELEMENT_TYPES
+        }
+        edge_filter = {int(key) for key in model.load_element_layers(settings, EDGE)}
+        bm = bmesh.new()
+        try:
+            bm.from_mesh(obj.data)
+            geometry = evaluated_geometry.evaluated_overlay_geometry(
+                obj, bm, settings, {EDGE: edge_filter}
+            )
+        finally:
+            bm.free()
+        edge_records = [
+            [source_index, rounded(p0), rounded(p1), rounded(n0), rounded(n1)]
+            for source_index, p0, p1, n0, n1 in geometry[EDGE]
+        ]
+        fixture = {
+            "source": f"{bpy.path.basename(bpy.data.filepath)}:{obj.name}",
+            "modifiers": [modifier.type for modifier in obj.modifiers],
+            "element_layers": element_layers,
+            "edge_records": edge_records,
+            "edge_trim": arguments.edge_trim,
+        }
+    finally:
+        addon.unregister()
+    arguments.output.parent.mkdir(parents=True, exist_ok=True)
+    arguments.output.write_text(
+        json.dumps(fixture, separators=(",", ":")) + "\n", encoding="utf-8"
+    )
+    print("RECORDED_FIXTURE", arguments.output, len(edge_records))
+
+
+if __name__ == "__main__":
+    main()
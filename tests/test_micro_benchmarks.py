@@ -0,0 +1,318 @@
+"""Replay recorded annotation fixtures through the Blender-free helpers.
+
+``python tests/test_micro_benchmarks.py`` checks the replays. Add
+``--benchmark`` to time them instead, optionally against a stored baseline:
+
+python tests/test_micro_benchmarks.py --benchmark --baseline bench.json
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import sys
+import time
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = ROOT / "mesh_annotation_layers"
+FIXTURES = ROOT / "tests" / "fixtures"
+
+
+def load_standalone(name):
+    """Import a package module by path so the package entry point never runs."""
+    spec = importlib.util.spec_from_file_location(
+        f"mesh_annotation_layers_{name}", PACKAGE / f"{name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+caches = load_standalone("caches")
+codec = load_standalone("codec")
+edge_chains = load_standalone("edge_chains")
+profiling = load_standalone("profiling")
+
+
+class PlainVector(tuple):
+    """The subset of ``mathutils.Vector`` used by edge-chain trimming."""
+
+    def __sub__(self, other):
+        return PlainVector(a - b for a, b in zip(self, other))
+
+    def __add__(self, other):
+        return PlainVector(a + b for a, b in zip(self, other))
+
+    def __mul__(self, scalar):
+        return PlainVector(value * scalar for value in self)
+
+    @property
+    def length(self):
+        return math.sqrt(sum(value * value for value in self))
+
+
+def load_fixtures():
+    fixtures = {}
+    for path in sorted(FIXTURES.glob("*.json")):
+        fixture = json.loads(path.read_text(encoding="utf-8"))
+        records_by_source = {}
+        for source_index, p0, p1, n0, n1 in fixture["edge_records"]:
+            records_by_source.setdefault(source_index, []).append(
+                tuple(PlainVector(value) for value in (p0, p1, n0, n1))
+            )
+        fixture["records_by_source"] = records_by_source
+        fixtures[path.stem] = fixture
+    return fixtures
+
+
+def decoded_mappings(fixture):
+    return {
+        element_type: codec.validate_element_layers(json.loads(data_str))[0]
+        for element_type, data_str in fixture["element_layers"].items()
+        if data_str
+    }
+
+
+def replay_validate(fixture):
+    for data_str in fixture["element_layers"].values():
+        if data_str:
+            codec.validate_element_layers(json.loads(data_str))
+
+
+def replay_prepare(fixture, mappings):
+    for mapping in mappings.values():
+        codec.prepare_element_layers(mapping)
+
+
+def replay_stack_round_trip(fixture, mappings):
+    for mapping in mappings.values():
+        for layers in mapping.values():
+            codec.decode_layer_bytes(codec._encode_stack_payload(layers))
+
+
+def replay_stack_scan(fixture, mappings):
+    """Decode every element the way a stack merge scans a BMesh layer."""
+    payloads = [
+        codec.encode_layers(layers)
+        for mapping in mappings.values()
+        for layers in mapping.values()
+    ]
+    for payload in payloads:
+        codec.decode_stack_payload(payload)
+
+
+def replay_edge_chains(fixture, _mappings):
+    trim = fixture["edge_trim"]
+    for records in fixture["records_by_source"].values():
+        for chain in edge_chains.ordered_edge_chains(records):
+            edge_chains.trim_edge_chain([(p0, p1) for p0, p1, _n0, _n1 in chain], trim)
+
+
+BENCHMARKS = {
+    "validate": lambda fixture, _mappings: replay_validate(fixture),
+    "prepare": replay_prepare,
+    "stack_round_trip": replay_stack_round_trip,
+    "stack_scan": replay_stack_scan,
+    "edge_chains": replay_edge_chains,
+}
+
+
+def run_benchmarks(fixtures, repeat=5):
+    """Return the best of ``repeat`` runs per fixture and benchmark, in ms."""
+    results = {}
+    for fixture_name, fixture in fixtures.items():
+        mappings = decoded_mappings(fixture)
+        for benchmark_name, benchmark in BENCHMARKS.items():
+            best = math.inf
+            for _attempt in range(repeat):
+                codec.clear_stack_memo()
+                started = time.perf_counter()
+                benchmark(fixture, mappings)
+                best = min(best, time.perf_counter() - started)
+            results[f"{fixture_name}:{benchmark_name}"] = round(best * 1000.0, 3)
+    return results
+
+
+class MicroBenchmarkReplayTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = load_fixtures()
+
+    def test_fixtures_are_recorded(self):
+        self.assertTrue(self.fixtures)
+        for fixture in self.fixtures.values():
+            self.assertTrue(fixture["edge_records"])
+            self.assertTrue(any(fixture["element_layers"].values()))
+
+    def test_recorded_layer_data_round_trips_through_the_codec(self):
+        for name, fixture in self.fixtures.items():
+            for element_type, data_str in fixture["element_layers"].items():
+                with self.subTest(fixture=name, element_type=element_type):
+                    mapping, valid = codec.validate_element_layers(json.loads(data_str))
+                    self.assertTrue(valid)
+                    cleaned, prepared = codec.prepare_element_layers(mapping)
+                    self.assertEqual(mapping, cleaned)
+                    self.assertEqual(json.loads(data_str), json.loads(prepared))
+                    for layers in mapping.values():
+                        payload = codec.encode_layers(layers)
+                        self.assertLessEqual(len(payload), codec.STACK_MAX_BYTES)
+                        self.assertEqual(layers, codec.decode_layer_bytes(payload))
+
+    def test_uvarint_boundaries_and_damaged_payloads(self):
+        for value in (0, 1, 127, 128, 16_383, 16_384, codec.LAYER_ID_MAX):
+            encoded = codec._encode_uvarint(value)
+            self.assertEqual(
+                (value, len(encoded)), codec._decode_uvarint(encoded, 0, len(encoded))
+            )
+        with self.assertRaises(codec.StackEncodingError):
+            codec._encode_uvarint(codec.LAYER_ID_MAX + 1)
+        payload = bytearray(codec.encode_layers([3, 200, 70_000]))
+        payload[-1] ^= 0xFF
+        with self.assertRaises(codec.StackEncodingError):
+            codec.decode_layer_bytes(bytes(payload))
+        self.assertEqual(([4, 2], "LEGACY"), codec.decode_stack_payload(b"4,2"))
+
+    def test_malformed_json_entries_are_dropped_and_reported(self):
+        mapping, valid = codec.validate_element_layers(
+            {"0": [1, 1, 2], "-1": [1], "01": [2], "3": [], "4": [True], "5": ["7"]}
+        )
+        self.assertFalse(valid)
+        self.assertEqual({"0": [1, 2], "5": [7]}, mapping)
+
+    def test_codec_counts_payload_lookups_and_json_bytes(self):
+        before = codec.codec_operation_counts()
+        _cleaned, data_str = codec.prepare_element_layers({"0": [1], "1": [1, 2]})
+        codec.decode_stack_payload(codec.encode_layers([1]))
+        after = codec.codec_operation_counts()
+        self.assertEqual(3, after["payload_encodes"] - before["payload_encodes"])
+        self.assertEqual(1, after["payload_decodes"] - before["payload_decodes"])
+        self.assertEqual(len(data_str), after["json_bytes"] - before["json_bytes"])
+
+    def test_budgeted_cache_counts_shared_values_once(self):
+        cache = caches.BudgetedCache("test_shared", budget_bytes=1000)
+        shared = object()
+        cache.store("a", {"batches": shared}, nbytes=400, owner="A", identity=id(shared))
+        cache.store("b", {"batches": shared}, nbytes=400, owner="B", identity=id(shared))
+        cache["c"] = "plain"
+        cache.resize("c", 100)
+        self.assertEqual(500, cache.total_bytes)
+        self.assertEqual({"A": 400, "B": 400, "": 100}, dict(cache.owner_bytes()))
+        cache.pop("a")
+        self.assertEqual(500, cache.total_bytes)
+        del cache["b"]
+        cache.popitem()
+        self.assertEqual((0, 0), (len(cache), cache.total_bytes))
+        self.assertIsNone(cache.lookup("missing"))
+        self.assertEqual(0.0, cache.statistics()["hit_rate"])
+
+    def test_budgeted_cache_evicts_the_cheapest_bytes_first(self):
+        cache = caches.BudgetedCache("test_eviction", budget_bytes=250, entry_limit=4)
+        cache.store("slow", "slow", nbytes=100, cost=2.0)
+        cache.store("cheap", "cheap", nbytes=100, cost=0.001)
+        cache.store("newest", "newest", nbytes=100, cost=0.001)
+        self.assertEqual(["slow", "newest"], list(cache))
+        self.assertEqual(1, cache.evictions)
+        self.assertIs(cache, caches._CACHES["test_eviction"])
+        caches.set_cache_budget("test_eviction", 50)
+        # The last value is never evicted, even above the budget.
+        self.assertEqual(1, len(cache))
+        self.assertEqual(50, caches.cache_statistics()["test_eviction"]["budget_bytes"])
+
+    def test_budgeted_cache_keeps_pinned_keys_above_the_limits(self):
+        cache = caches.BudgetedCache("test_pinned", entry_limit=2)
+        with cache.pinning(["a", "b"]):
+            for key in "abc":
+                cache.store(key, key, nbytes=10)
+            self.assertEqual(["a", "b", "c"], list(cache))
+        cache.store("d", "d", nbytes=10)
+        self.assertEqual(["c", "d"], list(cache))
+        self.assertEqual(frozenset(), cache.pinned)
+
+    def test_profile_capture_counts_outermost_hooked_calls(self):
+        import tempfile
+
+        @profiling.profiled("inner")
+        def inner():
+            return sum(range(100))
+
+        @profiling.profiled("outer")
+        def outer():
+            return inner() + inner()
+
+        with tempfile.TemporaryDirectory() as directory:
+            stem = str(Path(directory) / "capture")
+            self.assertTrue(profiling.start_profile_capture(stem, 2, lambda: ["Scene"]))
+            outer()
+            self.assertEqual(1, profiling.profile_capture_status()["captured"])
+            inner()
+            self.assertIsNone(profiling.profile_capture_status())
+            prof_path, summary_path = profiling.last_profile_capture()["paths"]
+            self.assertTrue(Path(prof_path).stat().st_size)
+            summary = Path(summary_path).read_text(encoding="utf-8")
+        self.assertIn("Scene", summary)
+        self.assertIn("outer: 1", summary)
+        self.assertIn("inner: 1", summary)
+        self.assertEqual(4950, outer() // 2)
+
+    def test_recorded_edges_form_trimmed_connected_chains(self):
+        for name, fixture in self.fixtures.items():
+            trim = fixture["edge_trim"]
+            for source_index, records in fixture["records_by_source"].items():
+                with self.subTest(fixture=name, source_index=source_index):
+                    chains = edge_chains.ordered_edge_chains(records)
+                    self.assertEqual(len(records), sum(len(chain) for chain in chains))
+                    for chain in chains:
+                        for previous, following in zip(chain, chain[1:]):
+                            self.assertEqual(
+                                edge_chains.coordinate_key(previous[1]),
+                                edge_chains.coordinate_key(following[0]),
+                            )
+                        segments = [(p0, p1) for p0, p1, _n0, _n1 in chain]
+                        trimmed = edge_chains.trim_edge_chain(segments, trim)
+                        total = sum((p1 - p0).length for p0, p1 in segments)
+                        kept = sum((p1 - p0).length for p0, p1 in trimmed)
+                        self.assertAlmostEqual(total * (1.0 - 2.0 * trim), kept, places=5)
+
+    def test_every_benchmark_replays_every_fixture(self):
+        results = run_benchmarks(self.fixtures, repeat=1)
+        self.assertEqual(len(self.fixtures) * len(BENCHMARKS), len(results))
+
+
+def benchmark_main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write JSON timings here")
+    parser.add_argument("--baseline", type=Path, help="compare against this JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-ms", type=float, default=0.5)
+    arguments = parser.parse_args(argv)
+
+    results = run_benchmarks(load_fixtures(), arguments.repeat)
+    for name, milliseconds in results.items():
+        print(f"{name}: {milliseconds:.3f} ms")
+    if arguments.output:
+        arguments.output.write_text(
+            json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+    if not arguments.baseline:
+        return 0
+    baseline = json.loads(arguments.baseline.read_text(encoding="utf-8"))
+    regressions = [
+        (name, baseline[name], measured)
+        for name, measured in results.items()
+        if name in baseline
+        and measured > baseline[name] * (1.0 + arguments.tolerance) + arguments.min_ms
+    ]
+    for name, expected, measured in regressions:
+        print(f"REGRESSION {name}: {expected:.3f} ms -> {measured:.3f} ms")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv[1:]:
+        sys.exit(benchmark_main(sys.argv[1:]))
+    unittest.main()
@@ -310,6 +310,30 @@ class SourceContractsTest(unittest.TestCase):
         self.assertNotIn("bl_info", entry_source)
         self.assertNotIn('if __name__ == "__main__"', entry_source)
 
+    def test_standalone_modules_import_only_the_standard_library(self):
+        blender_modules = {"bpy", "bmesh", "gpu", "gpu_extras", "mathutils"}
+        for name in ("caches", "codec", "edge_chains", "profiling"):
+            with self.subTest(module=name):
+                imports = [
+                    node
+                    for node in ast.walk(parse(PACKAGE / f"{name}.py"))
+                    if isinstance(node, (ast.Import, ast.ImportFrom))
+                ]
+                self.assertFalse(
+                    [node for node in imports if getattr(node, "level", 0)]
+                )
+                roots = {
+                    alias.name.split(".")[0]
+                    for node in imports
+                    if isinstance(node, ast.Import)
+                    for alias in node.names
+                } | {
+                    node.module.split(".")[0]
+                    for node in imports
+                    if isinstance(node, ast.ImportFrom)
+                }
+                self.assertFalse(roots & blender_modules)
+
     def test_overlay_color_does_not_depend_on_selection(self):
         source = (PACKAGE / "overlay.py").read_text(encoding="utf-8")
         self.assertNotIn('blend_set("ADDITIVE")', source)